@@ -19,6 +19,7 @@ Kullanım:
 """
 import argparse
 import logging
+from config import Config
 from database import Database
 from utils.logger import setup_logging
 
@@ -42,6 +43,7 @@ def main():
     parser = argparse.ArgumentParser(description="Liquipedia roster_changes → players")
     parser.add_argument('--apply', action='store_true', help='Gerçekten yaz (yoksa dry-run)')
     args = parser.parse_args()
+    Config.validate()
 
     with Database.get_connection() as conn:
         with conn.cursor() as cur:
@@ -14,6 +14,7 @@ import logging
 from dotenv import load_dotenv
 load_dotenv()
 
+from config import Config
 from database import Database
 from etl.pandascore_client import PandaScoreClient
 from utils.logger import setup_logging
@@ -76,4 +77,5 @@ if __name__ == '__main__':
     ap = argparse.ArgumentParser()
     ap.add_argument('--tiers', default='s,a')
     args = ap.parse_args()
+    Config.validate()
     backfill(tiers=args.tiers)
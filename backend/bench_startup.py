@@ -0,0 +1,106 @@
+"""
+Başlangıç (import) süresi benchmark'ı: `python -X importtime` ile her senaryoyu
+temiz bir alt süreçte import eder, modül başına self süreleri toplar.
+
+Senaryolar:
+  • run.py          yalnızca modül (argparse öncesi)
+  • run.py --live   en sık cron çağrısının yükledikleri (LiveSyncer zinciri)
+  • sync_worker     --live daemon'unun yükledikleri (+ MatchPredictor)
+  • tüm job'lar     her job modülü birden — eski run.py'nin modül seviyesinde
+                    ödediği maliyet (referans)
+
+Her senaryo --repeat kez çalıştırılır, en iyi süre raporlanır (disk önbelleği
+ısındıktan sonraki değer). --top N en pahalı N üst seviye import'u gösterir.
+--budget-ms verilirse '--live' senaryosu bütçeyi aşınca betik hata koduyla çıkar.
+
+Kullanım: python bench_startup.py [--repeat 5] [--top 10] [--budget-ms 250]
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+from typing import Dict, List, Tuple
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+SCENARIOS: Dict[str, str] = {
+    "run.py": "import run",
+    "run.py --live": "import run; from etl.live_sync import LiveSyncer",
+    "sync_worker --live": (
+        "import sync_worker; from etl.live_sync import LiveSyncer; "
+        "from etl.predict import MatchPredictor"
+    ),
+    "tüm job'lar": (
+        "import run; from etl.live_sync import LiveSyncer; "
+        "from etl.predict import MatchPredictor; "
+        "from etl.backtest import run_backtest; "
+        "from etl.news_generator import NewsGenerator; "
+        "from etl.adapters import (LiquipediaAdapter, GeminiAdapter, HybridStatsBackfiller, "
+        "LiquipediaV3TransferAdapter, LiquipediaWikitextTransferAdapter)"
+    ),
+}
+
+
+def _parse_importtime(stderr: str) -> Tuple[int, List[Tuple[int, str]]]:
+    """-X importtime çıktısı → (toplam self µs, [(cumulative µs, üst seviye modül)])."""
+    total = 0
+    top_level: List[Tuple[int, str]] = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        total += int(self_us)
+        # Girinti yok → doğrudan senaryo kodunun import ettiği modül
+        if not name[1:].startswith(" "):
+            top_level.append((int(cumulative_us), name.strip()))
+    return total, top_level
+
+
+def measure(code: str) -> Tuple[float, float, List[Tuple[int, str]]]:
+    """(import ms, duvar saati ms, üst seviye import'lar) — tek temiz süreç."""
+    t0 = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=BACKEND_DIR, capture_output=True, text=True,
+    )
+    wall = time.perf_counter() - t0
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else code)
+    total_us, top_level = _parse_importtime(proc.stderr)
+    return total_us / 1000, wall * 1000, top_level
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--top", type=int, default=0)
+    ap.add_argument("--budget-ms", type=float, default=0)
+    args = ap.parse_args()
+
+    results = {}
+    print(f"{'senaryo':<24} {'import ms':>10} {'süreç ms':>10}")
+    for name, code in SCENARIOS.items():
+        best = None
+        for _ in range(max(1, args.repeat)):
+            run = measure(code)
+            if best is None or run[0] < best[0]:
+                best = run
+        results[name] = best
+        print(f"{name:<24} {best[0]:>10.1f} {best[1]:>10.1f}")
+
+    if args.top:
+        for name, (_, _, top_level) in results.items():
+            print(f"\n{name} — en pahalı {args.top} import (cumulative ms):")
+            for cumulative_us, module in sorted(top_level, reverse=True)[:args.top]:
+                print(f"  {cumulative_us / 1000:>8.1f}  {module}")
+
+    live_ms = results["run.py --live"][0]
+    if args.budget_ms and live_ms > args.budget_ms:
+        print(f"\n❌ run.py --live import süresi {live_ms:.1f} ms > bütçe {args.budget_ms:.0f} ms")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,235 @@
+"""
+Wikitext tokenizer benchmark + eşdeğerlik kontrolü: etl/wikitext.py'deki tek
+geçişli tokenizer ile eski karakter-karakter yardımcıları (aşağıda birebir
+kopya) gerçek kaydedilmiş sayfalar üzerinde karşılaştırır.
+
+Sayfa kaynakları (öncelik sırasıyla):
+  • komut satırı dosyaları (ör. curl ile kaydedilmiş .wiki dosyaları)
+  • Liquipedia sayfa önbelleği (LIQUIPEDIA_CACHE_FILE, etl/liquipedia_cache.py)
+  • hiçbiri yoksa sentetik turnuva/transfer sayfası
+
+Her sayfa için Match → Map → PSI ve Transfer Row zinciri hem eski hem yeni
+yolla çıkarılır; çıktı farklıysa betik hata koduyla çıkar.
+
+Kullanım: python bench_wikitext.py [sayfa.wiki ...] [--repeat 5]
+"""
+import argparse
+import os
+import sqlite3
+import sys
+import time
+from typing import Dict, List
+
+from etl import wikitext
+from etl.liquipedia_cache import DEFAULT_CACHE_FILE
+
+
+# ── Eski implementasyonlar (referans — liquipedia_service.py'den birebir) ────
+
+def legacy_extract_templates(wikitext_: str) -> List[str]:
+    text = wikitext_ or ""
+    out: List[str] = []
+    i = 0
+    n = len(text)
+    while i < n - 1:
+        if text[i:i + 2] != "{{":
+            i += 1
+            continue
+        start = i
+        depth = 1
+        i += 2
+        while i < n - 1 and depth > 0:
+            pair = text[i:i + 2]
+            if pair == "{{":
+                depth += 1
+                i += 2
+            elif pair == "}}":
+                depth -= 1
+                i += 2
+            else:
+                i += 1
+        if depth == 0:
+            out.append(text[start:i])
+        else:
+            break
+    return out
+
+
+def legacy_extract_named_templates(text: str, name_prefix: str) -> List[str]:
+    text = text or ""
+    out: List[str] = []
+    needle = "{{" + name_prefix
+    n = len(text)
+    i = 0
+    while True:
+        start = text.find(needle, i)
+        if start == -1:
+            break
+        after = start + len(needle)
+        if after < n and (text[after].isalpha()):
+            i = start + 2
+            continue
+        depth = 0
+        j = start
+        while j < n - 1:
+            pair = text[j:j + 2]
+            if pair == "{{":
+                depth += 1
+                j += 2
+            elif pair == "}}":
+                depth -= 1
+                j += 2
+                if depth == 0:
+                    break
+            else:
+                j += 1
+        if depth == 0:
+            out.append(text[start:j])
+            i = j
+        else:
+            break
+    return out
+
+
+def legacy_split_params_brace_aware(block: str) -> Dict[str, str]:
+    inner = block[2:-2] if block.startswith("{{") and block.endswith("}}") else block
+    params: Dict[str, str] = {}
+    buf: List[str] = []
+    parts: List[str] = []
+    curly = 0
+    square = 0
+    i = 0
+    n = len(inner)
+    while i < n:
+        pair = inner[i:i + 2]
+        if pair == "{{":
+            curly += 1; buf.append(pair); i += 2; continue
+        if pair == "}}":
+            curly -= 1; buf.append(pair); i += 2; continue
+        if pair == "[[":
+            square += 1; buf.append(pair); i += 2; continue
+        if pair == "]]":
+            square -= 1; buf.append(pair); i += 2; continue
+        ch = inner[i]
+        if ch == "|" and curly == 0 and square == 0:
+            parts.append("".join(buf)); buf = []; i += 1; continue
+        buf.append(ch); i += 1
+    if buf:
+        parts.append("".join(buf))
+    positional = 1
+    for part in parts[1:]:
+        chunk = part.strip()
+        if not chunk:
+            continue
+        if "=" in chunk:
+            key, value = chunk.split("=", 1)
+            params[key.strip()] = value.strip()
+        else:
+            params[f"_{positional}"] = chunk
+            positional += 1
+    return params
+
+
+# ── Aynı iş yükü: eski yol vs tokenizer ─────────────────────────────────────
+
+def workload_legacy(text: str) -> list:
+    out = [legacy_extract_templates(text)]
+    for block in legacy_extract_named_templates(text, "Match"):
+        params = legacy_split_params_brace_aware(block)
+        maps = []
+        for map_block in legacy_extract_named_templates(block, "Map"):
+            mp = legacy_split_params_brace_aware(map_block)
+            psi = [legacy_split_params_brace_aware(v) for v in mp.values() if "PSI" in v]
+            maps.append((map_block, mp, psi))
+        out.append((block, params, maps))
+    for block in legacy_extract_named_templates(text, "Transfer Row"):
+        out.append((block, legacy_split_params_brace_aware(block)))
+    return out
+
+
+def workload_tree(text: str) -> list:
+    tree = wikitext.parse(text)
+    out = [[tree.text_of(n) for n in tree.top_level()]]
+    for node in tree.named("Match"):
+        params = tree.params(node)
+        maps = []
+        for map_node in tree.named("Map", within=node):
+            mp = tree.params(map_node)
+            psi = [wikitext.split_params(v) for v in mp.values() if "PSI" in v]
+            maps.append((tree.text_of(map_node), mp, psi))
+        out.append((tree.text_of(node), params, maps))
+    for node in tree.named("Transfer Row"):
+        out.append((tree.text_of(node), tree.params(node)))
+    return out
+
+
+def _load_pages(paths: List[str]) -> Dict[str, str]:
+    pages: Dict[str, str] = {}
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as f:
+            pages[os.path.basename(path)] = f.read()
+    if pages:
+        return pages
+
+    cache_file = os.getenv("LIQUIPEDIA_CACHE_FILE", DEFAULT_CACHE_FILE)
+    if cache_file and os.path.exists(cache_file):
+        conn = sqlite3.connect(cache_file)
+        try:
+            for wiki, title, text in conn.execute(
+                "SELECT wiki, title, wikitext FROM pages ORDER BY length(wikitext) DESC LIMIT 20"
+            ):
+                pages[f"{wiki}:{title}"] = text
+        finally:
+            conn.close()
+    if pages:
+        return pages
+
+    psi = "{{PSI|player=p%d|agent=jett|kills=%d|deaths=12|assists=4|acs=230}}"
+    maps = "".join(
+        "|map%d={{Map|map=Ascent|winner=1|t1atk=7|t1def=6|t2atk=3|t2def=2|%s}}" % (
+            m, "|".join(f"t{t}p{p}=" + psi % (p, 10 + p) for t in (1, 2) for p in range(1, 6)))
+        for m in range(1, 4)
+    )
+    match = ("{{Match|opponent1={{TeamOpponent|Team %d}}|opponent2={{TeamOpponent|Team %d}}"
+             "|date=2026-01-01 {{Abbr/CET}}|vod=[[Special:x|vod]]" + maps + "}}\n")
+    transfers = "".join(
+        "{{Transfer Row|date=2026-01-%02d|name=[[Player%d|P%d]]|flag=tr|team1=Old %d|team2=New %d|role1=}}\n"
+        % (d % 28 + 1, d, d, d, d) for d in range(600)
+    )
+    pages["synthetic:tournament"] = "".join(match % (i, i + 1) for i in range(60))
+    pages["synthetic:transfers"] = "<!-- {{Transfer Row|x}} -->\n" + transfers
+    return pages
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("pages", nargs="*")
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+
+    failed = False
+    total_old = total_new = 0.0
+    print(f"{'sayfa':<48} {'KB':>7} {'eski ms':>9} {'yeni ms':>9} {'hız':>6}  eşit")
+    for name, text in _load_pages(args.pages).items():
+        timings = []
+        for fn in (workload_legacy, workload_tree):
+            best = float("inf")
+            for _ in range(max(1, args.repeat)):
+                t0 = time.perf_counter()
+                result = fn(text)
+                best = min(best, time.perf_counter() - t0)
+            timings.append((best, result))
+        (old_s, old_r), (new_s, new_r) = timings
+        same = old_r == new_r
+        failed |= not same
+        total_old += old_s
+        total_new += new_s
+        print(f"{name[:48]:<48} {len(text) / 1024:>7.1f} {old_s * 1000:>9.2f} "
+              f"{new_s * 1000:>9.2f} {old_s / max(new_s, 1e-9):>5.1f}x  {'✓' if same else '✗ FARKLI'}")
+    print(f"{'TOPLAM':<48} {'':>7} {total_old * 1000:>9.2f} {total_new * 1000:>9.2f} "
+          f"{total_old / max(total_new, 1e-9):>5.1f}x")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -19,16 +19,36 @@ class Config:
 
     # Google Gemini — LLM News Generation
     GEMINI_API_KEY = os.getenv('GEMINI_API_KEY')
+    # Eşzamanlı üretim (etl/llm_executor.py): worker sayısı + kota bütçesi.
+    # Varsayılanlar gemini-2.5-flash free tier'a göre; ücretli kotada artırın.
+    LLM_CONCURRENCY = int(os.getenv('LLM_CONCURRENCY', 4))
+    LLM_RPM = float(os.getenv('LLM_RPM', 10))        # istek/dakika
+    LLM_TPM = int(os.getenv('LLM_TPM', 250000))      # tahmini token/dakika (0 → sınırsız)
+    # Üretim sonuç önbelleği (etl/llm_cache.py, llm_generations tablosu)
+    LLM_CACHE_ENABLED = os.getenv('LLM_CACHE_ENABLED', '1') not in ('0', 'false', 'False')
     
     # Database
     DATABASE_URL = os.getenv('DATABASE_URL')
 
+    # Process-wide bağlantı havuzu (database.py). DB_POOL_ENABLED=0 → eski
+    # davranış (her get_connection yeni bağlantı açar).
+    DB_POOL_ENABLED = os.getenv('DB_POOL_ENABLED', '1') not in ('0', 'false', 'False')
+    DB_POOL_MIN_SIZE = int(os.getenv('DB_POOL_MIN_SIZE', 1))
+    DB_POOL_MAX_SIZE = int(os.getenv('DB_POOL_MAX_SIZE', 5))
+    DB_POOL_MAX_IDLE = float(os.getenv('DB_POOL_MAX_IDLE', 300))       # saniye
+    DB_POOL_CHECK_AFTER = float(os.getenv('DB_POOL_CHECK_AFTER', 30))  # saniye
+    DB_POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', 60))          # saniye
+
     # Public site URL — SEO sitemap/canonical URL üretimi için.
     # Prod domain kesinleşince .env'de SITE_URL'i güncelle, sitemap'i yeniden üret.
     SITE_URL = os.getenv('SITE_URL', 'https://esportshub.pro').rstrip('/')
     
     # ETL
     BATCH_SIZE = int(os.getenv('BATCH_SIZE', 50))
+    # --all-games / --live: oyun başına sync pipeline'ı için eşzamanlı worker
+    # (MatchSyncer.map_games). Her worker upsert sırasında bir DB bağlantısı
+    # tutar → DB_POOL_MAX_SIZE'ın altında kalmalı. 1 → sıralı (eski davranış).
+    SYNC_GAME_WORKERS = int(os.getenv('SYNC_GAME_WORKERS', 3))
     
     @classmethod
     def validate(cls):
@@ -41,5 +61,5 @@ class Config:
         
         return True
 
-# Validate on import
-Config.validate()
\ No newline at end of file
+# Validation is NOT done on import (library imports / --help stay side-effect
+# free); entry points call Config.validate() after argument parsing.
\ No newline at end of file
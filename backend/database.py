@@ -1,10 +1,15 @@
 """
 Database connection manager using psycopg3
 """
+import atexit
+import os
+import threading
 import time
 import psycopg
 import logging
+from collections import deque
 from contextlib import contextmanager
+from psycopg.pq import TransactionStatus
 from config import Config
 
 logger = logging.getLogger(__name__)
@@ -16,6 +21,168 @@ _CONNECT_ATTEMPTS = 4
 _CONNECT_TIMEOUT = 15   # saniye/deneme
 _BACKOFF_BASE = 2       # bekleme: 2s, 4s, 8s
 
+
+class PoolTimeout(psycopg.OperationalError):
+    """Havuzda max_size bağlantı meşgulken timeout içinde boş bağlantı çıkmadı."""
+
+
+class _ConnectionPool:
+    """
+    Process-wide, thread-safe psycopg bağlantı havuzu.
+
+    Her get_connection() Supabase pooler'a yeni TLS handshake (~100-300ms)
+    açıyordu; satır başına bağlantı açan helper'larda (news fact-sheet,
+    transfer resolve, force-finish) bu ETL'in en büyük sabit maliyetiydi.
+
+    - Yeni bağlantılar Database._connect_with_retry ile açılır → aynı
+      4 deneme / 2-4-8s üstel backoff semantiği.
+    - Sağlık kontrolü: closed/broken bağlantılar atılır; check_after
+      saniyeden uzun boşta kalan bağlantı verilmeden önce SELECT 1 ile
+      doğrulanır (pooler idle bağlantıyı sessizce düşürmüş olabilir).
+    - max_idle'dan uzun boşta kalan bağlantılar min_size'ın üstündeyse kapatılır.
+    """
+
+    def __init__(self, min_size=1, max_size=5, max_idle=300.0,
+                 check_after=30.0, timeout=60.0):
+        self.min_size = max(0, int(min_size))
+        self.max_size = max(1, int(max_size), self.min_size)
+        self.max_idle = float(max_idle)
+        self.check_after = float(check_after)
+        self.timeout = float(timeout)
+        self._idle = deque()          # (conn, last_used_monotonic)
+        self._size = 0                # idle + ödünç verilmiş bağlantı sayısı
+        self._cond = threading.Condition()
+        self._closed = False
+
+    def getconn(self):
+        deadline = time.monotonic() + self.timeout
+        while True:
+            with self._cond:
+                if self._closed:
+                    raise psycopg.OperationalError("connection pool is closed")
+                item = self._idle.pop() if self._idle else None
+                if item is None:
+                    if self._size < self.max_size:
+                        self._size += 1
+                        create = True
+                    else:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            raise PoolTimeout(
+                                f"no free DB connection within {self.timeout:.0f}s "
+                                f"(max_size={self.max_size})"
+                            )
+                        self._cond.wait(remaining)
+                        continue
+                else:
+                    create = False
+
+            if create:
+                try:
+                    return Database._connect_with_retry()
+                except Exception:
+                    with self._cond:
+                        self._size -= 1
+                        self._cond.notify()
+                    raise
+
+            conn, last_used = item
+            if self._is_healthy(conn, time.monotonic() - last_used):
+                return conn
+            self._discard(conn)
+
+    def putconn(self, conn):
+        if conn.closed or conn.broken:
+            self._discard(conn)
+            return
+        try:
+            # Havuza temiz (IDLE, autocommit kapalı) bağlantı döner — ensure_schema
+            # gibi autocommit açan çağıranlar sonrakini etkilemesin.
+            if conn.info.transaction_status != TransactionStatus.IDLE:
+                conn.rollback()
+            if conn.autocommit:
+                conn.autocommit = False
+        except psycopg.Error:
+            self._discard(conn)
+            return
+
+        now = time.monotonic()
+        stale = []
+        with self._cond:
+            if self._closed:
+                self._size -= 1
+                stale.append(conn)
+            else:
+                self._idle.append((conn, now))
+                # En eski idle bağlantılar soldadır; min_size üstündekileri buda.
+                while (self._idle and self._size > self.min_size
+                       and now - self._idle[0][1] > self.max_idle):
+                    stale.append(self._idle.popleft()[0])
+                    self._size -= 1
+            self._cond.notify()
+        for c in stale:
+            self._close_quietly(c)
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            idle = [c for c, _ in self._idle]
+            self._idle.clear()
+            self._size -= len(idle)
+            self._cond.notify_all()
+        for c in idle:
+            self._close_quietly(c)
+
+    def _is_healthy(self, conn, idle_for):
+        if conn.closed or conn.broken:
+            return False
+        if idle_for < self.check_after:
+            return True
+        try:
+            conn.execute("SELECT 1")
+            conn.rollback()
+            return True
+        except psycopg.Error as e:
+            logger.info(f"♻️ Havuzdaki bağlantı sağlık kontrolünü geçemedi, yenileniyor: {e}")
+            return False
+
+    def _discard(self, conn):
+        with self._cond:
+            self._size -= 1
+            self._cond.notify()
+        self._close_quietly(conn)
+
+    @staticmethod
+    def _close_quietly(conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+
+_pool = None
+_pool_pid = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool():
+    """Lazily create the process-wide pool (fork sonrası çocuk süreç kendi havuzunu açar)."""
+    global _pool, _pool_pid
+    if _pool is not None and _pool_pid == os.getpid():
+        return _pool
+    with _pool_lock:
+        if _pool is None or _pool_pid != os.getpid():
+            _pool = _ConnectionPool(
+                min_size=Config.DB_POOL_MIN_SIZE,
+                max_size=Config.DB_POOL_MAX_SIZE,
+                max_idle=Config.DB_POOL_MAX_IDLE,
+                check_after=Config.DB_POOL_CHECK_AFTER,
+                timeout=Config.DB_POOL_TIMEOUT,
+            )
+            _pool_pid = os.getpid()
+        return _pool
+
+
 class Database:
     """PostgreSQL database connection manager"""
 
@@ -48,23 +215,42 @@ class Database:
         Context manager for database connections
         Automatically commits on success, rolls back on error
 
+        Bağlantı process-wide havuzdan ödünç alınır ve çıkışta havuza iade
+        edilir (DB_POOL_ENABLED=0 → her seferinde yeni bağlantı açılıp kapanır).
+
         Usage:
             with Database.get_connection() as conn:
                 with conn.cursor() as cur:
                     cur.execute("SELECT * FROM teams")
         """
+        pool = _get_pool() if Config.DB_POOL_ENABLED else None
         conn = None
         try:
-            conn = Database._connect_with_retry()
+            conn = pool.getconn() if pool else Database._connect_with_retry()
             yield conn
             conn.commit()
         except Exception as e:
-            if conn:
-                conn.rollback()
+            if conn and not conn.closed:
+                try:
+                    conn.rollback()
+                except psycopg.Error:
+                    pass
             raise e
         finally:
             if conn:
-                conn.close()
+                if pool:
+                    pool.putconn(conn)
+                else:
+                    conn.close()
+
+    @staticmethod
+    def close_pool():
+        """Havuzdaki boşta bağlantıları kapat (süreç çıkışında atexit ile çağrılır)."""
+        global _pool
+        with _pool_lock:
+            pool, _pool = _pool, None
+        if pool is not None and _pool_pid == os.getpid():
+            pool.close()
     
     @staticmethod
     def test_connection():
@@ -91,9 +277,14 @@ class Database:
                 result = cur.fetchone()
                 return result[0] if result else None
 
+
+atexit.register(Database.close_pool)
+
+
 if __name__ == "__main__":
     from utils.logger import setup_logging
     setup_logging()
+    Config.validate()
     if Database.test_connection():
         logger.info("✅ Database connection successful!")
         game_id = Database.get_game_id('valorant')
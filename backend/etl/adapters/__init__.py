@@ -1,51 +1,47 @@
-"""Adapter package for external data sources and LLM providers."""
-
-from .base_adapter import BaseDataAdapter
-from .hybrid_stats_adapter import (
-	BaseMatchStatsSource,
-	HybridStatsBackfiller,
-	LiquipediaStatsSource,
-	LiquipediaV3StatsSource,
-	LiquipediaWikitextSource,
-	MapStat,
-	MapStatsResult,
-	MatchContext,
-	PlayerStat,
-)
-from .liquipedia_adapter import LiquipediaAdapter
-from .llm_adapter import BaseLLMAdapter, GeminiAdapter, LLMAdapterError
-from .multi_source_aggregator import MultiSourceDataAggregator
-from .riot_adapter import RiotAdapter
-from .steam_adapter import SteamAdapter
-from .transfer_adapter import (
-	BaseTransferAdapter,
-	LiquipediaTransferAdapter,
-	LiquipediaV3TransferAdapter,
-	LiquipediaWikitextTransferAdapter,
-	TransferEvent,
-)
-
-__all__ = [
-	"BaseDataAdapter",
-	"BaseMatchStatsSource",
-	"HybridStatsBackfiller",
-	"LiquipediaStatsSource",
-	"LiquipediaV3StatsSource",
-	"LiquipediaWikitextSource",
-	"MapStat",
-	"MapStatsResult",
-	"MatchContext",
-	"PlayerStat",
-	"LiquipediaAdapter",
-	"BaseLLMAdapter",
-	"GeminiAdapter",
-	"LLMAdapterError",
-	"RiotAdapter",
-	"SteamAdapter",
-	"MultiSourceDataAggregator",
-	"BaseTransferAdapter",
-	"LiquipediaTransferAdapter",
-	"LiquipediaV3TransferAdapter",
-	"LiquipediaWikitextTransferAdapter",
-	"TransferEvent",
-]
+"""Adapter package for external data sources and LLM providers.
+
+Exports are resolved lazily (PEP 562): importing one adapter no longer pulls
+in every other one (pydantic/LLM, Liquipedia, transfer parsers) at startup.
+"""
+
+from importlib import import_module
+
+_EXPORTS = {
+	"BaseDataAdapter": ".base_adapter",
+	"BaseMatchStatsSource": ".hybrid_stats_adapter",
+	"HybridStatsBackfiller": ".hybrid_stats_adapter",
+	"LiquipediaStatsSource": ".hybrid_stats_adapter",
+	"LiquipediaV3StatsSource": ".hybrid_stats_adapter",
+	"LiquipediaWikitextSource": ".hybrid_stats_adapter",
+	"MapStat": ".hybrid_stats_adapter",
+	"MapStatsResult": ".hybrid_stats_adapter",
+	"MatchContext": ".hybrid_stats_adapter",
+	"PlayerStat": ".hybrid_stats_adapter",
+	"LiquipediaAdapter": ".liquipedia_adapter",
+	"BaseLLMAdapter": ".llm_adapter",
+	"GeminiAdapter": ".llm_adapter",
+	"LLMAdapterError": ".llm_adapter",
+	"RiotAdapter": ".riot_adapter",
+	"SteamAdapter": ".steam_adapter",
+	"MultiSourceDataAggregator": ".multi_source_aggregator",
+	"BaseTransferAdapter": ".transfer_adapter",
+	"LiquipediaTransferAdapter": ".transfer_adapter",
+	"LiquipediaV3TransferAdapter": ".transfer_adapter",
+	"LiquipediaWikitextTransferAdapter": ".transfer_adapter",
+	"TransferEvent": ".transfer_adapter",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+	module = _EXPORTS.get(name)
+	if module is None:
+		raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+	value = getattr(import_module(module, __name__), name)
+	globals()[name] = value
+	return value
+
+
+def __dir__():
+	return sorted(set(globals()) | set(__all__))
@@ -31,12 +31,99 @@ import os
 import re
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
 from typing import Any, Dict, List, Optional
 
+import psycopg
+
 from database import Database
+from etl.entity_resolver import get_resolver, normalize_name
+from etl.schema_migrations import Migration, ensure_migration
 
 logger = logging.getLogger(__name__)
 
+# Bitişten bu kadar gün sonra turnuva sayfası immutable kabul edilir.
+TOURNAMENT_SETTLE_DAYS = int(os.getenv("LIQUIPEDIA_TOURNAMENT_SETTLE_DAYS", "7"))
+
+# Doldurulamayan maçlar için yeniden deneme aralığı (hybrid_stats_attempts):
+# taban × 2^(deneme-1), üst sınır MAX_DAYS. Yalnızca hata → sabit taban aralık.
+RETRY_BASE_HOURS = float(os.getenv("HYBRID_RETRY_BASE_HOURS", "24"))
+RETRY_MAX_DAYS = float(os.getenv("HYBRID_RETRY_MAX_DAYS", "30"))
+
+
+# match_needs_enrichment(raw) — _match_needs_enrichment'in SQL karşılığı
+# (sql/match_needs_enrichment.sql ile aynı; partial index oradaki migration'da).
+_NEEDS_ENRICHMENT_FN = r"""
+create or replace function public.match_needs_enrichment(raw jsonb)
+returns boolean
+language sql
+immutable
+parallel safe
+as $$
+  select case
+    when raw is null or jsonb_typeof(raw) <> 'object' then false
+    -- Python truthiness: null/false/0/""/[]/{} → işaretsiz
+    when coalesce(raw->'map_source' not in ('null', 'false', '0', '""', '[]', '{}'), false) then false
+    when jsonb_typeof(raw->'games') is distinct from 'array'
+         or jsonb_array_length(raw->'games') = 0 then true
+    else not exists (
+      select 1
+      from jsonb_array_elements(raw->'games') g
+      cross join lateral (
+        select case when jsonb_typeof(g->'map') = 'object' then g->'map'->'name' else g->'map' end as name
+      ) mp
+      where jsonb_typeof(g) = 'object'
+        and (
+          (mp.name is not null
+           and mp.name not in ('null', 'false', '0', '""', '[]', '{}')
+           -- str.strip() ile aynı küme: Python'un tüm Unicode boşlukları
+           and lower(btrim(mp.name #>> '{}',
+                             E'\t\n\u000b\u000c\r\u001c\u001d\u001e\u001f \u0085\u00a0\u1680\u2000\u2001\u2002\u2003\u2004\u2005\u2006\u2007\u2008\u2009\u200a\u2028\u2029\u202f\u205f\u3000')) not in ('', 'unknown'))
+          or exists (
+            select 1
+            from jsonb_array_elements(case when jsonb_typeof(g->'teams') = 'array' then g->'teams' else '[]' end) t,
+                 jsonb_array_elements(case when jsonb_typeof(t->'players') = 'array' then t->'players' else '[]' end) p
+            where jsonb_typeof(p) = 'object'
+              and p->'kills' is not null
+              and p->'kills' <> 'null'
+          )
+        )
+    )
+  end
+$$
+"""
+# v2: btrim yalnızca ASCII boşlukları kırpıyordu ('\xa0' gibi adlar Python'la ayrışıyordu)
+_NEEDS_ENRICHMENT_MIGRATION = Migration("match_needs_enrichment_fn", 2, (_NEEDS_ENRICHMENT_FN,))
+
+# Negatif sonuç önbelleği + backoff — sql/create_hybrid_stats_attempts.sql ile aynı
+_ATTEMPTS_MIGRATION = Migration("hybrid_stats_attempts", 1, (
+    """
+    CREATE TABLE IF NOT EXISTS public.hybrid_stats_attempts (
+        match_id         bigint      PRIMARY KEY,
+        attempts         integer     NOT NULL DEFAULT 0,
+        last_attempt_at  timestamptz NOT NULL DEFAULT now(),
+        next_attempt_at  timestamptz NOT NULL DEFAULT now(),
+        outcomes         jsonb       NOT NULL DEFAULT '{}'::jsonb
+    )
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS idx_hybrid_stats_attempts_next
+        ON public.hybrid_stats_attempts (next_attempt_at)
+    """,
+))
+
+# Aday için gereken raw_data alt kümesi (league/serie adları, bitiş tarihleri)
+_SLIM_RAW = """
+    jsonb_build_object(
+        'league', jsonb_build_object('name', m.raw_data->'league'->'name'),
+        'serie', jsonb_build_object(
+            'name',      m.raw_data->'serie'->'name',
+            'full_name', m.raw_data->'serie'->'full_name',
+            'end_at',    m.raw_data->'serie'->'end_at'),
+        'tournament', jsonb_build_object('end_at', m.raw_data->'tournament'->'end_at')
+    )
+"""
+
 
 # ── Normalize veri şekilleri ──────────────────────────────────────────────────
 
@@ -91,6 +178,9 @@ class MatchContext:
     # DB'deki tournament.name çoğu zaman "Group Stage" gibi aşama adıdır;
     # raw_data'daki league/serie isimleri çok daha eşleştirilebilir.
     tournament_candidates: List[str] = field(default_factory=list)
+    # Turnuva (serie) bitmiş ve düzenleme penceresi geçmiş → Liquipedia sayfası
+    # artık değişmez kabul edilir; sayfa önbelleği revalidasyon yapmaz.
+    tournament_finished: bool = False
 
 
 # ── Kaynak sözleşmesi ─────────────────────────────────────────────────────────
@@ -111,6 +201,12 @@ class BaseMatchStatsSource(ABC):
         Veri bulunamazsa None döner (fallback chain bir sonraki kaynağa geçer).
         """
 
+    def prefetch(self, contexts: List[MatchContext]) -> None:
+        """
+        Opsiyonel: backfill başında tüm adaylar için gereken kaynak verisini
+        toplu ısıtır (ör. sayfaları tek istekte önbelleğe alma). Varsayılan no-op.
+        """
+
 
 # ── Liquipedia Wikitext kaynağı (API key GEREKTİRMEZ — birincil hat) ──────────
 
@@ -146,6 +242,30 @@ class LiquipediaWikitextSource(BaseMatchStatsSource):
             self._services[slug] = LiquipediaService(game_slug=slug)
         return self._services[slug]
 
+    def prefetch(self, contexts: List[MatchContext]) -> None:
+        """
+        Adayların turnuva sayfalarını oyun başına toplu çeker (50 başlık / istek)
+        → fetch_map_stats sonrasında sayfaları önbellekten okur. Başlıklar
+        page_key ile tekilleştirilir ("A B" / "A_B" aynı sayfa, tek slot).
+        """
+        titles: Dict[tuple, List[str]] = {}
+        for ctx in contexts:
+            if not (self.supports_game(ctx.game_slug) and ctx.team_a_name and ctx.team_b_name):
+                continue
+            names = ctx.tournament_candidates or ([ctx.tournament_name] if ctx.tournament_name else [])
+            bucket = titles.setdefault((str(ctx.game_slug).strip().lower(), ctx.tournament_finished), [])
+            bucket.extend(names[:self.MAX_TOURNAMENT_CANDIDATES])
+
+        for (slug, finished), bucket in titles.items():
+            service = self._service(slug)
+            if not service.has_page_cache:
+                continue  # önbellek kapalı → ısıtmanın faydası yok
+            pages = list(dict.fromkeys(service.page_key(name) for name in bucket if name))
+            try:
+                service.get_pages_wikitext(pages, immutable=finished)
+            except Exception as err:
+                logger.warning("⚠️  Liquipedia sayfa ön-yüklemesi başarısız (%s): %s", slug, err)
+
     def fetch_map_stats(self, ctx: MatchContext) -> Optional[MapStatsResult]:
         if not (ctx.team_a_name and ctx.team_b_name):
             return None
@@ -164,6 +284,7 @@ class LiquipediaWikitextSource(BaseMatchStatsSource):
                     tournament_name=tour_name,
                     team_a=ctx.team_a_name,
                     team_b=ctx.team_b_name,
+                    tournament_finished=ctx.tournament_finished,
                 )
             except Exception as err:
                 logger.warning(
@@ -284,7 +405,7 @@ class LiquipediaV3StatsSource(BaseMatchStatsSource):
             return None
         # Per-match opponent sorgusu (hacimden bağımsız kesin lookup).
         cache_key = frozenset({
-            _norm_team_key(ctx.team_a_name), _norm_team_key(ctx.team_b_name), ctx.game_slug,
+            normalize_name(ctx.team_a_name), normalize_name(ctx.team_b_name), ctx.game_slug,
         })
         if cache_key in self._cache:
             m = self._cache[cache_key]
@@ -466,6 +587,8 @@ class HybridStatsBackfiller:
     """
 
     def __init__(self, sources: Optional[List[BaseMatchStatsSource]] = None) -> None:
+        # hybrid_stats_attempts kullanılabilir mi (tablo oluşturulamazsa False)
+        self.track_attempts = True
         # Öncelik sırası listedeki sıradır (ilk dolu sonuç kazanır).
         # Birincil: Wikitext (API key gerektirmez). Yedek: Cargo (key gelince
         # öne alınabilir). Wikitext zaten oyuncu KDA'sı da verdiği için şu an
@@ -513,41 +636,127 @@ class HybridStatsBackfiller:
                         return False  # en az bir KDA var → eksik değil
         return True
 
+    @staticmethod
+    def _ensure_attempts_schema(cur) -> None:
+        ensure_migration(_ATTEMPTS_MIGRATION, cur)
+
+    @staticmethod
+    def _ensure_needs_enrichment_fn(cur) -> bool:
+        """match_needs_enrichment(jsonb) güncel değilse oluşturur; kullanılamazsa False."""
+        try:
+            cur.execute("SAVEPOINT sp_needs_fn")
+            if ensure_migration(_NEEDS_ENRICHMENT_MIGRATION, cur):
+                logger.info("🛠️  match_needs_enrichment() oluşturuldu/güncellendi "
+                            "(partial index için sql/match_needs_enrichment.sql çalıştırın)")
+            cur.execute("RELEASE SAVEPOINT sp_needs_fn")
+            return True
+        except psycopg.Error as e:
+            cur.execute("ROLLBACK TO SAVEPOINT sp_needs_fn")
+            # Yetki yoksa (fonksiyon başka rolün) mevcut tanım yine kullanılabilir
+            cur.execute("SELECT to_regprocedure('public.match_needs_enrichment(jsonb)') IS NOT NULL")
+            if cur.fetchone()[0]:
+                logger.warning("⚠️  match_needs_enrichment() güncellenemedi, mevcut tanım kullanılacak: %s", e)
+                return True
+            logger.warning("⚠️  match_needs_enrichment() oluşturulamadı, Python filtresi kullanılacak: %s", e)
+            return False
+
     def find_incomplete_matches(self, limit: int = 50) -> List[MatchContext]:
-        """Harita/KDA verisi eksik, finished maçları bağlamlarıyla döner."""
-        candidates: List[MatchContext] = []
+        """
+        Harita/KDA verisi eksik, finished maçları bağlamlarıyla döner.
+        Backoff'taki maçlar (hybrid_stats_attempts.next_attempt_at > now) atlanır.
+
+        "Eksik" kuralı SQL'de (match_needs_enrichment + partial index) uygulanır;
+        yalnızca id/isimler/turnuva ve raw_data'nın küçük bir alt kümesi çekilir.
+        Fonksiyon kullanılamazsa eski yol: limit*4 satır + Python filtresi.
+        """
         with Database.get_connection() as conn:
             with conn.cursor() as cur:
-                cur.execute(
-                    """
-                    SELECT m.id, m.team_a_id, m.team_b_id, m.scheduled_at, m.raw_data,
-                           g.slug,
-                           ta.name AS team_a_name, tb.name AS team_b_name,
-                           t.name  AS tournament_name
-                    FROM matches m
-                    JOIN games g       ON m.game_id = g.id
-                    LEFT JOIN teams ta ON m.team_a_id = ta.id
-                    LEFT JOIN teams tb ON m.team_b_id = tb.id
-                    LEFT JOIN tournaments t ON m.tournament_id = t.id
-                    WHERE m.status = 'finished'
-                      AND m.raw_data IS NOT NULL
-                    -- TIER ÖNCELİĞİ: Liquipedia üst-tier'i kapsar; alt-lig maçları
-                    -- için veri yok. S→A→B→C→D→? sırası hem eşleşme hem değer artırır.
-                    ORDER BY
-                      CASE UPPER(COALESCE(t.tier, 'Z'))
-                        WHEN 'S' THEN 0 WHEN 'A' THEN 1 WHEN 'B' THEN 2
-                        WHEN 'C' THEN 3 WHEN 'D' THEN 4 ELSE 5 END,
-                      m.scheduled_at DESC NULLS LAST
-                    LIMIT %s
-                    """,
-                    (limit * 4,),  # filtre Python'da; aday havuzunu geniş tut
+                if self.track_attempts:
+                    try:
+                        cur.execute("SAVEPOINT sp_attempts")
+                        self._ensure_attempts_schema(cur)
+                        cur.execute("RELEASE SAVEPOINT sp_attempts")
+                    except psycopg.Error as e:
+                        logger.warning("⚠️  hybrid_stats_attempts oluşturulamadı, backoff kapalı: %s", e)
+                        cur.execute("ROLLBACK TO SAVEPOINT sp_attempts")
+                        self.track_attempts = False
+                backoff_join = (
+                    "LEFT JOIN hybrid_stats_attempts ha ON ha.match_id = m.id"
+                    if self.track_attempts else ""
                 )
+                backoff_where = (
+                    "AND (ha.next_attempt_at IS NULL OR ha.next_attempt_at <= now())"
+                    if self.track_attempts else ""
+                )
+                # TIER ÖNCELİĞİ: Liquipedia üst-tier'i kapsar; alt-lig maçları
+                # için veri yok. S→A→B→C→D→? sırası hem eşleşme hem değer artırır.
+                tier_rank = """
+                    CASE UPPER(COALESCE(t.tier, 'Z'))
+                      WHEN 'S' THEN 0 WHEN 'A' THEN 1 WHEN 'B' THEN 2
+                      WHEN 'C' THEN 3 WHEN 'D' THEN 4 ELSE 5 END
+                """
+
+                if self._ensure_needs_enrichment_fn(cur):
+                    cur.execute(
+                        f"""
+                        WITH c AS (
+                            SELECT m.id, g.slug, m.team_a_id, m.team_b_id, m.tournament_id,
+                                   m.scheduled_at, {tier_rank} AS tier_rank
+                            FROM matches m
+                            JOIN games g       ON m.game_id = g.id
+                            LEFT JOIN tournaments t ON m.tournament_id = t.id
+                            {backoff_join}
+                            WHERE m.status = 'finished'
+                              AND m.raw_data IS NOT NULL
+                              AND match_needs_enrichment(m.raw_data)
+                              {backoff_where}
+                            ORDER BY tier_rank, m.scheduled_at DESC NULLS LAST
+                            LIMIT %s
+                        )
+                        SELECT c.id, c.team_a_id, c.team_b_id, c.scheduled_at,
+                               {_SLIM_RAW} AS raw_data,
+                               c.slug,
+                               ta.name AS team_a_name, tb.name AS team_b_name,
+                               t.name  AS tournament_name
+                        FROM c
+                        JOIN matches m     ON m.id = c.id
+                        LEFT JOIN teams ta ON c.team_a_id = ta.id
+                        LEFT JOIN teams tb ON c.team_b_id = tb.id
+                        LEFT JOIN tournaments t ON c.tournament_id = t.id
+                        ORDER BY c.tier_rank, c.scheduled_at DESC NULLS LAST
+                        """,
+                        (limit,),
+                    )
+                    prefiltered = True
+                else:
+                    cur.execute(
+                        f"""
+                        SELECT m.id, m.team_a_id, m.team_b_id, m.scheduled_at, m.raw_data,
+                               g.slug,
+                               ta.name AS team_a_name, tb.name AS team_b_name,
+                               t.name  AS tournament_name
+                        FROM matches m
+                        JOIN games g       ON m.game_id = g.id
+                        LEFT JOIN teams ta ON m.team_a_id = ta.id
+                        LEFT JOIN teams tb ON m.team_b_id = tb.id
+                        LEFT JOIN tournaments t ON m.tournament_id = t.id
+                        {backoff_join}
+                        WHERE m.status = 'finished'
+                          AND m.raw_data IS NOT NULL
+                          {backoff_where}
+                        ORDER BY {tier_rank}, m.scheduled_at DESC NULLS LAST
+                        LIMIT %s
+                        """,
+                        (limit * 4,),  # filtre Python'da; aday havuzunu geniş tut
+                    )
+                    prefiltered = False
                 rows = cur.fetchall()
 
+        candidates: List[MatchContext] = []
         for (mid, a_id, b_id, sched, raw, slug,
              a_name, b_name, t_name) in rows:
             raw = raw or {}
-            if not self._match_needs_enrichment(raw):
+            if not prefiltered and not self._match_needs_enrichment(raw):
                 continue
             candidates.append(MatchContext(
                 match_id=mid,
@@ -559,6 +768,7 @@ class HybridStatsBackfiller:
                 tournament_name=t_name,
                 scheduled_at=sched,
                 tournament_candidates=_tournament_name_candidates(raw, t_name),
+                tournament_finished=_tournament_finished(raw),
             ))
             if len(candidates) >= limit:
                 break
@@ -566,8 +776,14 @@ class HybridStatsBackfiller:
 
     # ── 2) Kaynak deneme (fallback chain) ─────────────────────────────────────
 
-    def _resolve(self, ctx: MatchContext) -> Optional[MapStatsResult]:
-        """Kaynakları öncelik sırasıyla dener; ilk dolu sonucu döner."""
+    def _resolve(self, ctx: MatchContext,
+                 outcomes: Optional[Dict[str, str]] = None) -> Optional[MapStatsResult]:
+        """
+        Kaynakları öncelik sırasıyla dener; ilk dolu sonucu döner.
+        outcomes verilirse kaynak bazlı sonuç yazılır: filled / empty / error.
+        """
+        if outcomes is None:
+            outcomes = {}
         for source in self.sources:
             if not source.supports_game(ctx.game_slug):
                 continue
@@ -578,11 +794,59 @@ class HybridStatsBackfiller:
                     "⚠️  %s kaynağı match %s için hata verdi: %s",
                     source.source_name, ctx.match_id, err,
                 )
+                outcomes[source.source_name] = 'error'
                 continue
             if result and not result.is_empty():
+                outcomes[source.source_name] = 'filled'
                 return result
+            outcomes[source.source_name] = 'empty'
         return None
 
+    def _record_attempts(self, attempts: List[tuple]) -> None:
+        """
+        Deneme sonuçlarını hybrid_stats_attempts'e tek sorguda yazar.
+        attempts: [(match_id, durum, outcomes)] — durum: filled / empty / error.
+          empty → next = now + taban × 2^(attempts-1) (MAX_DAYS ile sınırlı)
+          error → next = now + taban (geçici hata; aralık büyümez)
+          filled → backoff yok (map_source işareti zaten tekrar seçilmesini önler)
+        """
+        if not attempts or not self.track_attempts:
+            return
+        ids = [a[0] for a in attempts]
+        states = [a[1] for a in attempts]
+        outcomes = [_json(a[2]) for a in attempts]
+        try:
+            with Database.get_connection() as conn:
+                with conn.cursor() as cur:
+                    cur.execute(
+                        """
+                        INSERT INTO hybrid_stats_attempts
+                            (match_id, attempts, last_attempt_at, next_attempt_at, outcomes)
+                        SELECT u.match_id, COALESCE(prev.attempts, 0) + 1, now(),
+                               now() + CASE u.state
+                                   WHEN 'filled' THEN interval '0'
+                                   WHEN 'empty' THEN LEAST(
+                                       %(base)s * interval '1 hour'
+                                           * power(2, LEAST(COALESCE(prev.attempts, 0), 16)),
+                                       %(cap)s * interval '1 day')
+                                   ELSE %(base)s * interval '1 hour'
+                               END,
+                               u.outcomes::jsonb
+                        FROM unnest(%(ids)s::bigint[], %(states)s::text[], %(outcomes)s::text[])
+                             AS u(match_id, state, outcomes)
+                        LEFT JOIN hybrid_stats_attempts prev ON prev.match_id = u.match_id
+                        ON CONFLICT (match_id) DO UPDATE SET
+                            attempts        = EXCLUDED.attempts,
+                            last_attempt_at = EXCLUDED.last_attempt_at,
+                            next_attempt_at = EXCLUDED.next_attempt_at,
+                            outcomes        = EXCLUDED.outcomes
+                        """,
+                        {'ids': ids, 'states': states, 'outcomes': outcomes,
+                         'base': RETRY_BASE_HOURS, 'cap': RETRY_MAX_DAYS},
+                    )
+        except psycopg.Error as e:
+            logger.warning("⚠️  Hybrid deneme kaydı yazılamadı: %s", e)
+
     # ── 3) DB'ye yazma ────────────────────────────────────────────────────────
 
     def _persist(self, ctx: MatchContext, result: MapStatsResult) -> None:
@@ -625,10 +889,12 @@ class HybridStatsBackfiller:
                     )
 
                 # player_match_stats: nickname eşlemeli oyuncu KDA
+                # (süreç genelinde paylaşılan çözümleyici — maç başına tablo okunmaz)
                 if result.players:
-                    players_by_name = self._load_players_by_name(cur)
+                    resolver = get_resolver('player')
+                    resolver.refresh(cur)
                     for ps in result.players:
-                        pid = players_by_name.get(_normalize_name(ps.player_name))
+                        pid = resolver.resolve(ps.player_name, alias=False)
                         if pid is None:
                             continue  # DB'de olmayan oyuncuyu atla (sessizce)
                         cur.execute(
@@ -672,16 +938,6 @@ class HybridStatsBackfiller:
                 )
                 conn.commit()
 
-    @staticmethod
-    def _load_players_by_name(cur) -> Dict[str, Any]:
-        cur.execute("SELECT id, nickname FROM players WHERE nickname IS NOT NULL")
-        mapping: Dict[str, Any] = {}
-        for pid, nickname in cur.fetchall():
-            key = _normalize_name(nickname)
-            if key and key not in mapping:
-                mapping[key] = pid
-        return mapping
-
     # ── Orkestrasyon girişi ───────────────────────────────────────────────────
 
     def backfill(self, limit: int = 50) -> Dict[str, int]:
@@ -692,20 +948,37 @@ class HybridStatsBackfiller:
             dict: {'candidates', 'enriched', 'skipped'}
         """
         candidates = self.find_incomplete_matches(limit=limit)
+        groups = _group_by_tournament(candidates)
         logger.info(
-            "🔍 Harita/KDA verisi eksik %d maç bulundu (limit=%d)",
-            len(candidates), limit,
+            "🔍 Harita/KDA verisi eksik %d maç bulundu (limit=%d, %d turnuva)",
+            len(candidates), limit, len(groups),
         )
+        for source in self.sources:
+            try:
+                source.prefetch(candidates)
+            except Exception as err:
+                logger.warning("⚠️  %s ön-yükleme hatası: %s", source.source_name, err)
+
         enriched = 0
-        for ctx in candidates:
-            result = self._resolve(ctx)
+        # Turnuva bazında art arda işlenir → sayfa + maç indeksi turnuva başına
+        # bir kez çözülür, gruptaki diğer maçlar indeksten O(1) eşleşir.
+        attempts: List[tuple] = []
+        for ctx in (c for group in groups for c in group):
+            outcomes: Dict[str, str] = {}
+            result = self._resolve(ctx, outcomes)
             if result is None:
+                # Hiçbir kaynak "boş" demediyse (yalnızca hata) → geçici, aralık büyümez
+                state = 'empty' if 'empty' in outcomes.values() else 'error'
+                attempts.append((ctx.match_id, state, outcomes))
                 continue
             try:
                 self._persist(ctx, result)
                 enriched += 1
+                attempts.append((ctx.match_id, 'filled', outcomes))
             except Exception as err:
                 logger.warning("⚠️  match %s yazılamadı: %s", ctx.match_id, err)
+                attempts.append((ctx.match_id, 'error', {**outcomes, 'persist': 'error'}))
+        self._record_attempts(attempts)
 
         skipped = len(candidates) - enriched
         logger.info(
@@ -717,25 +990,54 @@ class HybridStatsBackfiller:
 
 # ── Yardımcılar ───────────────────────────────────────────────────────────────
 
-def _normalize_name(name: Any) -> str:
-    """Oyuncu nickname'ini eşleme için normalize eder."""
-    return str(name or "").strip().lower()
-
-
-def _norm_team_key(name: Any) -> str:
-    """Takım adını index anahtarı için normalize eder (alfanümerik, küçük harf)."""
-    return re.sub(r"[^a-z0-9]", "", str(name or "").casefold())
-
-
 def _names_match(a: Any, b: Any) -> bool:
     """İki takım adını normalize edip eşitlik/containment ile karşılaştırır."""
-    na = re.sub(r"[^a-z0-9]", "", str(a or "").casefold())
-    nb = re.sub(r"[^a-z0-9]", "", str(b or "").casefold())
+    na = normalize_name(a)
+    nb = normalize_name(b)
     if not na or not nb:
         return False
     return na == nb or na in nb or nb in na
 
 
+def _group_by_tournament(candidates: List[MatchContext]) -> List[List[MatchContext]]:
+    """
+    Adayları (oyun, en iyi turnuva adayı) bazında gruplar. Gruplar ilk
+    görünme sırasını korur → find_incomplete_matches'in tier önceliği bozulmaz.
+    """
+    groups: Dict[tuple, List[MatchContext]] = {}
+    for ctx in candidates:
+        names = ctx.tournament_candidates or [ctx.tournament_name or ""]
+        key = (ctx.game_slug, normalize_name(names[0]) if names else "")
+        groups.setdefault(key, []).append(ctx)
+    return list(groups.values())
+
+
+def _tournament_finished(raw_data: Dict[str, Any]) -> bool:
+    """
+    Serie/turnuva end_at + TOURNAMENT_SETTLE_DAYS geçmiş mi? Liquipedia
+    editörleri sonuçları bitişten sonra birkaç gün düzeltebildiği için pencere
+    dolana kadar sayfa değişebilir sayılır.
+    """
+    if not isinstance(raw_data, dict):
+        return False
+    ends = []
+    for key in ("serie", "tournament"):
+        obj = raw_data.get(key)
+        end_at = obj.get("end_at") if isinstance(obj, dict) else None
+        if not end_at:
+            continue
+        try:
+            ends.append(datetime.fromisoformat(str(end_at).replace("Z", "+00:00")))
+        except ValueError:
+            continue
+    if not ends:
+        return False
+    end = max(ends)
+    if end.tzinfo is None:
+        end = end.replace(tzinfo=timezone.utc)
+    return end + timedelta(days=TOURNAMENT_SETTLE_DAYS) < datetime.now(timezone.utc)
+
+
 def _tournament_name_candidates(raw_data: Dict[str, Any], db_name: Optional[str]) -> List[str]:
     """
     raw_data'dan Liquipedia eşleştirmesi için turnuva adı adaylarını üretir
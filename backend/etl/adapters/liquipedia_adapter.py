@@ -14,6 +14,7 @@ from typing import Any, Dict, Iterable, List, Optional, Tuple
 from database import Database
 from etl.adapters.base_adapter import BaseDataAdapter
 from etl.liquipedia_service import LiquipediaService
+from etl.schema_migrations import Migration, ensure_migration
 import logging
 
 logger = logging.getLogger(__name__)
@@ -47,33 +48,29 @@ def _lru_team_transfers(game_slug: str, team_name: str) -> str:
     return json.dumps(LiquipediaService(game_slug=game_slug).get_team_transfers(team_name))
 
 
+_EXTRA_METADATA_MIGRATION = Migration("liquipedia_extra_metadata", 1, (
+    """
+    ALTER TABLE public.tournaments
+      ADD COLUMN IF NOT EXISTS extra_metadata jsonb DEFAULT '{}'::jsonb
+    """,
+    """
+    ALTER TABLE public.teams
+      ADD COLUMN IF NOT EXISTS extra_metadata jsonb DEFAULT '{}'::jsonb
+    """,
+    """
+    ALTER TABLE public.players
+      ADD COLUMN IF NOT EXISTS extra_metadata jsonb DEFAULT '{}'::jsonb
+    """,
+))
+
+
 class LiquipediaAdapter(BaseDataAdapter):
     """Adapter that enriches PandaScore entities with Liquipedia metadata."""
 
     source_name = "liquipedia"
 
     def ensure_schema(self) -> None:
-        with Database.get_connection() as conn:
-            conn.autocommit = True
-            with conn.cursor() as cur:
-                cur.execute(
-                    """
-                    ALTER TABLE public.tournaments
-                      ADD COLUMN IF NOT EXISTS extra_metadata jsonb DEFAULT '{}'::jsonb
-                    """
-                )
-                cur.execute(
-                    """
-                    ALTER TABLE public.teams
-                      ADD COLUMN IF NOT EXISTS extra_metadata jsonb DEFAULT '{}'::jsonb
-                    """
-                )
-                cur.execute(
-                    """
-                    ALTER TABLE public.players
-                      ADD COLUMN IF NOT EXISTS extra_metadata jsonb DEFAULT '{}'::jsonb
-                    """
-                )
+        ensure_migration(_EXTRA_METADATA_MIGRATION)
 
     def run(self, limit: int = 50, sections: tuple[str, ...] = ("all",)) -> Dict[str, Dict[str, int]]:
         self.ensure_schema()
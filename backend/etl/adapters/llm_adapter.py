@@ -32,6 +32,11 @@ class BaseLLMAdapter(ABC):
         Raises LLMAdapterError on unrecoverable failures.
         """
 
+    @property
+    def cache_identity(self) -> dict:
+        """Provider settings that shape the output (part of the LLM result cache key)."""
+        return {"adapter": type(self).__name__}
+
     def safe_generate(
         self,
         user_prompt: str,
@@ -76,6 +81,14 @@ class GeminiAdapter(BaseLLMAdapter):
         self._temperature = temperature
         self._client = self._build_client()
 
+    @property
+    def cache_identity(self) -> dict:
+        return {
+            "adapter": type(self).__name__,
+            "model": self._model_name,
+            "temperature": self._temperature,
+        }
+
     def _build_client(self):
         try:
             from google import genai
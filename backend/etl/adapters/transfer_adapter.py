@@ -3,8 +3,9 @@
 Pipeline per ingest() call:
   1. fetch_raw_transfers() → LRU-cached Liquipedia Cargo query.
   2. _parse_row()          → raw dict → TransferEvent dataclass + idempotency hash.
-  3. _resolve_ids()        → player_name / team_name → local DB IDs.
-  4. _persist()            → INSERT ON CONFLICT DO NOTHING (idempotent).
+  3. _resolve_ids_batch()  → player / team adları → local DB IDs (EntityResolver).
+  4. _persist_batch()      → tek çok satırlı INSERT ON CONFLICT DO NOTHING
+                             RETURNING (idempotent).
 
 The thin DB trigger (trg_roster_change_sync) handles players.team_id update
 for permanent/trial transfers — no application code needed for that step.
@@ -21,12 +22,19 @@ from datetime import date, datetime, timedelta, timezone
 from functools import lru_cache
 from typing import Optional
 
+import psycopg
+
 from database import Database
+from etl.entity_resolver import get_resolver
 from etl.liquipedia_service import CargoCandidate, LiquipediaService
 
 logger = logging.getLogger(__name__)
 
 
+# Tek INSERT'teki satır sayısı (8 parametre/satır, sorgu başına 65535 sınırı)
+_INSERT_CHUNK = 1000
+
+
 # ── Liquipedia JoinOrLeave → internal transfer_type ──────────────────────────
 _JOIN_OR_LEAVE_MAP: dict[str, str] = {
     "joins":  "permanent",
@@ -44,7 +52,7 @@ class TransferEvent:
     Single roster change event parsed from a data source.
 
     Phase 1 (after parse): player_name / *_team_name populated, IDs are None.
-    Phase 2 (after _resolve_ids): *_id fields filled in where DB match found.
+    Phase 2 (after _resolve_ids_batch): *_id fields filled in where DB match found.
     idempotency_hash is computed in __post_init__ from name + target + date.
     """
 
@@ -121,7 +129,10 @@ class BaseTransferAdapter(ABC):
 
     def ingest(self, days_back: int = 7) -> dict[str, int]:
         """
-        Full pipeline: fetch → resolve → persist.
+        Full pipeline: fetch → resolve → persist (toplu).
+
+        Tüm isimler tek sorguda çözülür, çözülen olaylar tek çok satırlı
+        INSERT ... ON CONFLICT DO NOTHING RETURNING ile yazılır.
 
         Returns stats dict: {found, inserted, skipped, failed}.
         'skipped' covers duplicates (ON CONFLICT) + unresolvable names.
@@ -134,115 +145,169 @@ class BaseTransferAdapter(ABC):
             "🔄 %d transfer olayı bulundu  game=%s  son %d gün",
             len(events), self.game_slug, days_back,
         )
+        if not events:
+            return stats
 
-        for event in events:
-            self._resolve_ids(event)
+        self._resolve_ids_batch(events)
 
+        resolvable: list[TransferEvent] = []
+        for event in events:
             if event.player_id is None:
                 logger.debug("⚠️  Oyuncu DB'de bulunamadı: %s — atlanıyor", event.player_name)
                 stats["skipped"] += 1
-                continue
-
-            try:
-                inserted = self._persist(event)
-                if inserted:
-                    stats["inserted"] += 1
-                    logger.info(
-                        "✅ Transfer  %s → %s  (%s)",
-                        event.old_team_name or "FA",
-                        event.new_team_name or "FA",
-                        event.player_name,
-                    )
-                else:
-                    stats["skipped"] += 1  # ON CONFLICT — already in DB
-            except Exception as exc:
-                logger.warning(
-                    "❌ DB kayıt hatası  hash=%s  %s",
-                    event.idempotency_hash[:12], exc,
+            else:
+                resolvable.append(event)
+
+        inserted, failed = self._persist_batch(resolvable)
+        for event in resolvable:
+            if event.idempotency_hash in inserted:
+                logger.info(
+                    "✅ Transfer  %s → %s  (%s)",
+                    event.old_team_name or "FA",
+                    event.new_team_name or "FA",
+                    event.player_name,
                 )
-                stats["failed"] += 1
-
+        stats["inserted"] = len(inserted)
+        stats["failed"] = failed
+        stats["skipped"] += len(resolvable) - len(inserted) - failed  # ON CONFLICT — already in DB
         return stats
 
     # ── Shared DB helpers (available to all subclasses) ───────────────────────
 
     def _resolve_ids(self, event: TransferEvent) -> None:
+        """Tek olay için _resolve_ids_batch (geriye dönük uyumluluk)."""
+        self._resolve_ids_batch([event])
+
+    def _resolve_ids_batch(self, events: list[TransferEvent]) -> None:
         """
-        Populate player_id, source_team_id, target_team_id from the local DB.
+        Populate player_id, source_team_id, target_team_id from the shared
+        EntityResolver (etl/entity_resolver.py) — süreç başına bir warm load,
+        sonra yalnızca updated_at artımlı yenileme; olay başına sorgu yok.
 
-        Lookup order:
-          player  → exact LOWER match on nickname or name.
-          teams   → ILIKE match (tolerates minor capitalisation differences).
+        Lookup (normalize_name: küçük harf, a-z0-9):
+          player  → nickname (exact), tek adaylı real_name (alias).
+          teams   → name (exact), tek adaylı acronym (alias).
 
-        Mutates event in-place; sets field to None if no DB row found.
+        Mutates events in-place; sets field to None if no DB row found.
         """
-        with Database.get_connection() as conn:
-            with conn.cursor() as cur:
-                # Player: exact lowercase match on nickname or full name
-                cur.execute(
-                    """
-                    SELECT id FROM players
-                     WHERE LOWER(nickname)  = LOWER(%s)
-                        OR LOWER(real_name) = LOWER(%s)
-                     LIMIT 1
-                    """,
-                    (event.player_name, event.player_name),
-                )
-                row = cur.fetchone()
-                event.player_id = row[0] if row else None
-
-                if event.player_id is None:
-                    return  # team lookups pointless without a resolved player
-
-                if event.old_team_name:
-                    cur.execute(
-                        "SELECT id FROM teams WHERE name ILIKE %s LIMIT 1",
-                        (event.old_team_name,),
-                    )
-                    row = cur.fetchone()
-                    event.source_team_id = row[0] if row else None
-
-                if event.new_team_name:
-                    cur.execute(
-                        "SELECT id FROM teams WHERE name ILIKE %s LIMIT 1",
-                        (event.new_team_name,),
-                    )
-                    row = cur.fetchone()
-                    event.target_team_id = row[0] if row else None
+        if not events:
+            return
+        players = get_resolver("player")
+        teams = get_resolver("team")
+        players.refresh()
+        teams.refresh()
+
+        for event in events:
+            event.player_id = players.resolve(event.player_name)
+            if event.player_id is None:
+                continue  # team lookups pointless without a resolved player
+            if event.old_team_name:
+                event.source_team_id = teams.resolve(event.old_team_name)
+            if event.new_team_name:
+                event.target_team_id = teams.resolve(event.new_team_name)
 
     def _persist(self, event: TransferEvent) -> bool:
+        """Tek olay için _persist_batch — True: yeni satır, False: duplicate."""
+        inserted, failed = self._persist_batch([event])
+        if failed:
+            raise RuntimeError(f"roster_changes kaydı yazılamadı: {event.idempotency_hash[:12]}")
+        return event.idempotency_hash in inserted
+
+    def _persist_batch(self, events: list[TransferEvent]) -> tuple[set[str], int]:
         """
-        Insert one TransferEvent into roster_changes.
+        Insert resolved TransferEvents into roster_changes with one multi-row
+        INSERT ... ON CONFLICT (idempotency_hash) DO NOTHING RETURNING.
 
-        ON CONFLICT (idempotency_hash) DO NOTHING ensures re-runs are safe.
-        Returns True if a new row was created, False on duplicate.
+        Returns (yeni eklenen hash'ler, başarısız olay sayısı). Toplu INSERT
+        hata verirse (ör. tek satırda CHECK / FK ihlali) aynı bağlantıda olay
+        başına SAVEPOINT ile yeniden denenir → sağlam satırlar yine yazılır,
+        yalnızca bozuk olanlar 'failed' sayılır.
         """
+        if not events:
+            return set(), 0
+
+        inserted: set[str] = set()
+        try:
+            with Database.get_connection() as conn:
+                with conn.cursor() as cur:
+                    for i in range(0, len(events), _INSERT_CHUNK):
+                        chunk = events[i:i + _INSERT_CHUNK]
+                        # Çok satırlı VALUES: id tipleri (uuid / bigint) psycopg
+                        # adaptasyonundan gelir, şemaya göre cast yazılmaz.
+                        values = ", ".join(["(%s, %s, %s, %s, %s, %s, %s, %s)"] * len(chunk))
+                        params: list = []
+                        for e in chunk:
+                            params.extend((
+                                e.player_id,
+                                e.source_team_id,
+                                e.target_team_id,
+                                e.transfer_date,
+                                e.transfer_type,
+                                e.data_source,
+                                json.dumps(e.raw_payload),
+                                e.idempotency_hash,
+                            ))
+                        cur.execute(
+                            f"""
+                            INSERT INTO public.roster_changes (
+                                player_id, source_team_id, target_team_id,
+                                transfer_date, transfer_type, data_source,
+                                raw_payload, idempotency_hash
+                            )
+                            VALUES {values}
+                            ON CONFLICT (idempotency_hash) DO NOTHING
+                            RETURNING idempotency_hash
+                            """,
+                            params,
+                        )
+                        inserted.update(row[0] for row in cur.fetchall())
+            return inserted, 0
+        except psycopg.Error as exc:
+            logger.warning(
+                "⚠️  Toplu transfer kaydı başarısız (%d olay), tek tek deneniyor: %s",
+                len(events), exc,
+            )
+
+        inserted = set()  # toplu transaction geri alındı
+        failed = 0
         with Database.get_connection() as conn:
             with conn.cursor() as cur:
-                cur.execute(
-                    """
-                    INSERT INTO public.roster_changes (
-                        player_id, source_team_id, target_team_id,
-                        transfer_date, transfer_type, data_source,
-                        raw_payload, idempotency_hash
-                    )
-                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-                    ON CONFLICT (idempotency_hash) DO NOTHING
-                    """,
-                    (
-                        event.player_id,
-                        event.source_team_id,
-                        event.target_team_id,
-                        event.transfer_date.isoformat(),
-                        event.transfer_type,
-                        event.data_source,
-                        json.dumps(event.raw_payload),
-                        event.idempotency_hash,
-                    ),
-                )
-                inserted = cur.rowcount > 0
-            conn.commit()
-        return inserted
+                for event in events:
+                    try:
+                        cur.execute("SAVEPOINT sp_transfer")
+                        cur.execute(
+                            """
+                            INSERT INTO public.roster_changes (
+                                player_id, source_team_id, target_team_id,
+                                transfer_date, transfer_type, data_source,
+                                raw_payload, idempotency_hash
+                            )
+                            VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+                            ON CONFLICT (idempotency_hash) DO NOTHING
+                            RETURNING idempotency_hash
+                            """,
+                            (
+                                event.player_id,
+                                event.source_team_id,
+                                event.target_team_id,
+                                event.transfer_date,
+                                event.transfer_type,
+                                event.data_source,
+                                json.dumps(event.raw_payload),
+                                event.idempotency_hash,
+                            ),
+                        )
+                        if cur.fetchone():
+                            inserted.add(event.idempotency_hash)
+                        cur.execute("RELEASE SAVEPOINT sp_transfer")
+                    except psycopg.Error as exc:
+                        cur.execute("ROLLBACK TO SAVEPOINT sp_transfer")
+                        logger.warning(
+                            "❌ DB kayıt hatası  hash=%s  %s",
+                            event.idempotency_hash[:12], exc,
+                        )
+                        failed += 1
+        return inserted, failed
 
 
 # ── Liquipedia implementation ─────────────────────────────────────────────────
@@ -429,13 +494,15 @@ class LiquipediaWikitextTransferAdapter(BaseTransferAdapter):
 
         events: list[TransferEvent] = []
         seen: set[str] = set()
-        for (yr, mo) in self._months_in_window(cutoff):
-            try:
-                rows = svc.get_transfers_wikitext(yr, self._MONTHS[mo - 1])
-            except Exception as exc:
-                logger.warning("⚠️  Transfer wikitext alınamadı %s/%s: %s", yr, mo, exc)
-                continue
-            for row in rows:
+        months = [(yr, self._MONTHS[mo - 1]) for (yr, mo) in self._months_in_window(cutoff)]
+        # Tüm aylar tek toplu istekte (50 sayfa / istek) — ay başına istek yok
+        try:
+            rows_by_month = svc.get_transfers_wikitext_months(months)
+        except Exception as exc:
+            logger.warning("⚠️  Transfer wikitext alınamadı (%d ay): %s", len(months), exc)
+            rows_by_month = {}
+        for month in months:
+            for row in rows_by_month.get(month, []):
                 event = self._row_to_event(row)
                 if event is None or event.transfer_date < cutoff:
                     continue
@@ -0,0 +1,262 @@
+"""
+Walk-forward Elo backtest — predict.py'deki modelin tekrar üretilebilir ölçümü.
+
+Bitmiş maçlar DB'den TEK sefer okunur ve kompakt NumPy dizilerine çevrilir
+(takım id'leri 0..n-1 yoğun indekslere eşlenir). Replay maç başına bir kez
+döner ama her adım tüm parametre setleri üzerinde vektörel çalışır: ratingler
+(n_takım × n_ayar) matrisi, beklenti/güncelleme tüm ayarlar için tek NumPy
+işlemi. Büyük grid'ler ayar-parçaları halinde process pool'a dağıtılır.
+
+Metrikler (maç ÖNCESİ olasılık → dürüst out-of-sample):
+  • accuracy   — 50/50 tahminler hariç (calculate_prediction_accuracy ile aynı)
+  • log-loss, Brier
+  • güvenli tahmin (fav ≥ CONFIDENT_PROB) başarı oranı
+  • kalibrasyon kovaları (favori olasılığı → gerçekleşen oran)
+
+Not: başlangıç ratingi (base) yalnızca tüm ratingleri ötelediği için beklentiyi
+değiştirmez (lojistik sadece farka bakar) → grid K × MOV ağırlığıdır.
+
+Kullanım: python run.py --backtest [--backtest-k 24 32 40] [--backtest-mov 0 0.5 1]
+"""
+import itertools
+import logging
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Optional, Sequence
+
+import numpy as np
+
+from database import Database
+from etl.predict import CONFIDENT_PROB, ELO_BASE, MOV_WEIGHT, _FINISHED_WHERE
+
+logger = logging.getLogger(__name__)
+
+CALIBRATION_EDGES = (0.5, 0.55, 0.6, 0.65, 0.7, 0.8, 0.9, 1.0)
+_EPS = 1e-12
+
+
+@dataclass(frozen=True)
+class BacktestData:
+    """Kronolojik bitmiş maçlar — yoğun takım indeksli NumPy dizileri."""
+    team_a: np.ndarray        # int32, 0..n_teams-1
+    team_b: np.ndarray        # int32
+    a_won: np.ndarray         # float64, 1.0 / 0.0
+    log_margin: np.ndarray    # float64, ln(|skor farkı| + 1) (0 → MOV terimi yok)
+    scheduled_at: np.ndarray  # float64, epoch saniye
+    prior_games: np.ndarray   # int32, maç öncesi min(oynanan_a, oynanan_b) — warmup filtresi
+    n_teams: int
+
+    def __len__(self) -> int:
+        return len(self.team_a)
+
+
+def load_matches() -> BacktestData:
+    """Bitmiş maçları (MatchPredictor ile aynı filtre ve sıra) tek sorguyla yükler."""
+    with Database.get_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                f"""
+                SELECT team_a_id, team_b_id, winner_id,
+                       COALESCE(team_a_score, 0), COALESCE(team_b_score, 0),
+                       extract(epoch FROM scheduled_at)::float8
+                FROM matches
+                WHERE {_FINISHED_WHERE}
+                ORDER BY scheduled_at ASC, id ASC
+                """
+            )
+            rows = cur.fetchall()
+
+    if not rows:
+        empty = np.empty(0)
+        return BacktestData(empty.astype(np.int32), empty.astype(np.int32), empty, empty,
+                            empty, empty.astype(np.int32), 0)
+
+    a, b, w, sa, sb, ts = (np.asarray(col) for col in zip(*rows))
+    team_ids, dense = np.unique(np.concatenate([a, b]), return_inverse=True)
+    n = len(rows)
+    team_a = dense[:n].astype(np.int32)
+    team_b = dense[n:].astype(np.int32)
+
+    # Maç öncesi oynanan maç sayısı (sıralı sayaç — tek geçiş, O(n))
+    played = np.zeros(len(team_ids), dtype=np.int32)
+    prior = np.empty(n, dtype=np.int32)
+    for i, (ia, ib) in enumerate(zip(team_a.tolist(), team_b.tolist())):
+        prior[i] = min(played[ia], played[ib])
+        played[ia] += 1
+        played[ib] += 1
+
+    return BacktestData(
+        team_a=team_a,
+        team_b=team_b,
+        a_won=(w == a).astype(np.float64),
+        log_margin=np.log1p(np.abs(sa.astype(np.int64) - sb.astype(np.int64))).astype(np.float64),
+        scheduled_at=ts.astype(np.float64),
+        prior_games=prior,
+        n_teams=len(team_ids),
+    )
+
+
+def replay(data: BacktestData, k_factors: Sequence[float], mov_weights: Sequence[float],
+           base: float = ELO_BASE) -> np.ndarray:
+    """
+    Walk-forward Elo: her ayar i için (k_factors[i], mov_weights[i]) → maç ÖNCESİ
+    A kazanma olasılıkları, shape (n_ayar, n_maç). MatchPredictor._fold ile aynı
+    güncelleme kuralı (K * (1 + ln(margin+1) * w), margin=0 → K).
+    """
+    k = np.asarray(k_factors, dtype=np.float64)
+    w = np.asarray(mov_weights, dtype=np.float64)
+    n = len(data)
+    ratings = np.full((data.n_teams, len(k)), base, dtype=np.float64)
+    probs = np.empty((n, len(k)), dtype=np.float64)
+
+    # Python skalerleri ile indeksleme np.int32'den belirgin şekilde hızlı
+    team_a = data.team_a.tolist()
+    team_b = data.team_b.tolist()
+    a_won = data.a_won.tolist()
+    log_margin = data.log_margin.tolist()
+    for i in range(n):
+        a, b = team_a[i], team_b[i]
+        ra = ratings[a]
+        rb = ratings[b]
+        ea = 1.0 / (1.0 + np.power(10.0, (rb - ra) / 400.0))
+        probs[i] = ea
+        lm = log_margin[i]
+        delta = (k * (1.0 + lm * w) if lm > 0 else k) * (a_won[i] - ea)
+        ratings[a] = ra + delta
+        ratings[b] = rb - delta
+    return probs.T
+
+
+def evaluate(probs: np.ndarray, a_won: np.ndarray, mask: Optional[np.ndarray] = None) -> list:
+    """probs (n_ayar, n_maç) → ayar başına metrik dict'leri (mask: değerlendirilecek maçlar)."""
+    if mask is not None:
+        probs = probs[:, mask]
+        a_won = a_won[mask]
+    results = []
+    if probs.shape[1] == 0:
+        return [{'evaluated': 0} for _ in range(probs.shape[0])]
+
+    p = np.clip(probs, _EPS, 1 - _EPS)
+    y = a_won[np.newaxis, :]
+    log_loss = -(y * np.log(p) + (1 - y) * np.log(1 - p)).mean(axis=1)
+    brier = ((probs - y) ** 2).mean(axis=1)
+
+    decisive = probs != 0.5
+    fav_prob = np.maximum(probs, 1 - probs)
+    fav_won = (probs > 0.5) == (y == 1.0)
+    correct = (fav_won & decisive).sum(axis=1)
+    total = decisive.sum(axis=1)
+    confident = decisive & (fav_prob >= CONFIDENT_PROB)
+    conf_total = confident.sum(axis=1)
+    conf_correct = (fav_won & confident).sum(axis=1)
+    bucket = np.digitize(fav_prob, CALIBRATION_EDGES[1:-1])
+
+    for s in range(probs.shape[0]):
+        calibration = []
+        for j, (lo, hi) in enumerate(zip(CALIBRATION_EDGES, CALIBRATION_EDGES[1:])):
+            sel = decisive[s] & (bucket[s] == j)
+            cnt = int(sel.sum())
+            calibration.append({
+                'bucket': f"{lo:.2f}-{hi:.2f}",
+                'count': cnt,
+                'predicted': round(float(fav_prob[s, sel].mean()), 4) if cnt else None,
+                'actual': round(float(fav_won[s, sel].mean()), 4) if cnt else None,
+            })
+        results.append({
+            'evaluated': int(probs.shape[1]),
+            'accuracy_pct': round(float(correct[s] / total[s] * 100), 2) if total[s] else 0.0,
+            'log_loss': round(float(log_loss[s]), 5),
+            'brier': round(float(brier[s]), 5),
+            'confident_total': int(conf_total[s]),
+            'confident_pct': round(float(conf_correct[s] / conf_total[s] * 100), 2) if conf_total[s] else 0.0,
+            'calibration': calibration,
+        })
+    return results
+
+
+# ── Process pool ─────────────────────────────────────────────────────────────
+_worker_data: Optional[BacktestData] = None
+_worker_mask: Optional[np.ndarray] = None
+
+
+def _init_worker(data: BacktestData, mask: Optional[np.ndarray]) -> None:
+    # Veri worker başına bir kez pickle'lanır (her görevde değil)
+    global _worker_data, _worker_mask
+    _worker_data, _worker_mask = data, mask
+
+
+def _run_chunk(settings: list, base: float) -> list:
+    ks = [k for k, _ in settings]
+    ws = [w for _, w in settings]
+    probs = replay(_worker_data, ks, ws, base=base)
+    metrics = evaluate(probs, _worker_data.a_won, _worker_mask)
+    return [
+        {'k_factor': k, 'mov_weight': w, 'base': base, **m}
+        for (k, w), m in zip(settings, metrics)
+    ]
+
+
+def run_backtest(k_factors: Sequence[float] = (32.0,), mov_weights: Sequence[float] = (MOV_WEIGHT,),
+                 base: float = ELO_BASE, workers: int = 0, min_games: int = 0,
+                 days: int = 0, data: Optional[BacktestData] = None) -> list:
+    """
+    K × MOV grid'i için walk-forward backtest. Replay her zaman tüm geçmiş
+    üzerinden yapılır; değerlendirme min_games (iki takım da en az N maç
+    oynamış) ve days (son N gün, 0 = tümü) ile daraltılabilir.
+    workers=0 → os.cpu_count(). Sonuçlar log-loss'a göre sıralı döner.
+    """
+    if data is None:
+        data = load_matches()
+    if len(data) == 0:
+        logger.warning("⚠️  Backtest için bitmiş maç yok.")
+        return []
+
+    mask = data.prior_games >= min_games
+    if days and days > 0:
+        mask &= data.scheduled_at >= data.scheduled_at[-1] - days * 86400
+    if not mask.any():
+        logger.warning("⚠️  Filtrelerden (min_games/days) geçen maç yok.")
+        return []
+    grid = list(itertools.product(
+        dict.fromkeys(float(k) for k in k_factors),
+        dict.fromkeys(float(w) for w in mov_weights),
+    ))
+
+    workers = min(workers or os.cpu_count() or 1, len(grid))
+    logger.info(
+        f"🧪 Backtest: {len(data)} maç, {data.n_teams} takım, {len(grid)} ayar, "
+        f"{workers} worker (değerlendirilen: {int(mask.sum())} maç)"
+    )
+    if workers <= 1:
+        _init_worker(data, mask)
+        results = _run_chunk(grid, base)
+    else:
+        size = math.ceil(len(grid) / workers)
+        chunks = [grid[i:i + size] for i in range(0, len(grid), size)]
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(data, mask)) as pool:
+            results = [r for part in pool.map(_run_chunk, chunks, [base] * len(chunks)) for r in part]
+
+    results.sort(key=lambda r: (r.get('log_loss', math.inf), -r.get('accuracy_pct', 0)))
+    return results
+
+
+def log_report(results: list, top: int = 10) -> None:
+    """Grid sonuçlarını tablo + en iyi ayarın kalibrasyonu olarak loglar."""
+    if not results:
+        return
+    logger.info(f"   {'K':>6} {'MOV':>5} {'acc%':>6} {'logloss':>8} {'brier':>7} {'güvenli%':>9}")
+    for r in results[:top]:
+        logger.info(
+            f"   {r['k_factor']:>6g} {r['mov_weight']:>5g} {r['accuracy_pct']:>6.2f} "
+            f"{r['log_loss']:>8.5f} {r['brier']:>7.5f} "
+            f"{r['confident_pct']:>8.2f}% (n={r['confident_total']})"
+        )
+    best = results[0]
+    logger.info(f"🏆 En iyi (log-loss): K={best['k_factor']:g}, MOV={best['mov_weight']:g}")
+    logger.info("   Kalibrasyon (favori olasılığı → gerçekleşen):")
+    for c in best['calibration']:
+        if c['count']:
+            logger.info(f"     {c['bucket']}: tahmin {c['predicted']:.3f} | gerçek {c['actual']:.3f} | n={c['count']}")
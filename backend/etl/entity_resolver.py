@@ -0,0 +1,234 @@
+"""
+Oyuncu / takım adı çözümleyici — tüm ETL job'larının ortak isim → id eşlemesi.
+
+Eskiden her job kendi normalizer'ını ve kendi players sözlüğünü taşıyordu:
+sync_players (_normalize_nickname, a-z0-9), hybrid stats (_normalize_name,
+yalnızca lower; _persist her maçta players tablosunu baştan okuyordu),
+transfer adapter (SQL LOWER()), liquipedia_service (_norm_team, casefold).
+Aynı isim job'a göre farklı eşleşebiliyordu.
+
+Burada tek kural (normalize_name) ve süreç başına tek önbellek var:
+  • ilk kullanımda tablo bir kez okunur (warm load)
+  • sonraki refresh'ler yalnızca updated_at'i ilerlemiş satırları çeker
+    (sql/entity_name_norm.sql isim değişiminde updated_at'i tetikleyiciyle
+    günceller; kolon yoksa REFRESH aralığında tam yeniden yükleme)
+  • FULL_RELOAD aralığında tam yükleme (silinen satırlar düşer)
+
+Eşleme katmanları (lookup):
+  exact  → birincil ad (players.nickname / teams.name); çakışmada en küçük id
+           (sync_players SQL yolundaki DISTINCT ON (norm) ... ORDER BY id ile aynı)
+  alias  → ikincil ad (players.real_name / teams.acronym); yalnızca tek aday varsa
+  fuzzy  → difflib benzerliği (FUZZY_CUTOFF); opt-in, varsayılan kapalı
+
+DB tarafındaki karşılık: players.nickname_norm / real_name_norm, teams.name_norm /
+acronym_norm — normalize_name ile birebir aynı ifadeyle üretilmiş, index'li
+generated kolonlar. Varsa yükleme bu kolonları okur, yoksa ham adları
+Python'da normalize eder.
+"""
+from __future__ import annotations
+
+import difflib
+import logging
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+REFRESH_SECONDS = float(os.getenv("ENTITY_RESOLVER_REFRESH_SECONDS", 300))
+FULL_RELOAD_SECONDS = float(os.getenv("ENTITY_RESOLVER_FULL_RELOAD_SECONDS", 6 * 3600))
+FUZZY_CUTOFF = float(os.getenv("ENTITY_RESOLVER_FUZZY_CUTOFF", 0.88))
+# Aynı saniyede commit edilen / geç görünen satırlar kaçmasın → pencere örtüşmesi
+_REFRESH_OVERLAP_SECONDS = 120
+_FUZZY_MIN_LEN = 4
+
+_NORM_RE = re.compile(r"[^a-z0-9]+")
+
+
+def normalize_name(name: Any) -> str:
+    """
+    İsim eşleme anahtarı: küçük harf, yalnızca a-z0-9.
+    SQL karşılığı: regexp_replace(lower(coalesce(x, '')), '[^a-z0-9]+', '', 'g').
+    """
+    return _NORM_RE.sub("", str(name or "").lower())
+
+
+@dataclass(frozen=True)
+class EntitySpec:
+    """Çözümlenecek tablo: birincil ad kolonu + alias kolonları."""
+    table: str
+    primary: str
+    aliases: Tuple[str, ...] = ()
+
+
+ENTITY_SPECS: Dict[str, EntitySpec] = {
+    "player": EntitySpec("players", "nickname", ("real_name",)),
+    "team":   EntitySpec("teams", "name", ("acronym",)),
+}
+
+
+@dataclass(frozen=True)
+class Resolution:
+    """lookup() sonucu: bulunan id + hangi katmanda eşleştiği."""
+    entity_id: Any
+    tier: str       # 'exact' | 'alias' | 'fuzzy'
+
+
+class EntityResolver:
+    """Tek tablo için normalize ad → id önbelleği. Thread-safe."""
+
+    def __init__(self, kind: str) -> None:
+        if kind not in ENTITY_SPECS:
+            raise ValueError(f"Bilinmeyen varlık türü: {kind!r}. Geçerli: {tuple(ENTITY_SPECS)}")
+        self.kind = kind
+        self.spec = ENTITY_SPECS[kind]
+        self._lock = threading.RLock()
+        self._exact: Dict[str, Set[Any]] = {}
+        self._alias: Dict[str, Set[Any]] = {}
+        self._keys_by_id: Dict[Any, Tuple[Tuple[str, ...], Tuple[str, ...]]] = {}
+        self._fuzzy_memo: Dict[str, Optional[str]] = {}
+        self._columns: Optional[Set[str]] = None
+        self._high_water: Optional[Any] = None
+        self._loaded_at = 0.0
+        self._refreshed_at = 0.0
+
+    # ── Yükleme ───────────────────────────────────────────────────────────────
+
+    def refresh(self, cur=None, force: bool = False) -> None:
+        """
+        Önbelleği günceller: ilk çağrıda / FULL_RELOAD sonrası tam yükleme,
+        aksi halde REFRESH aralığı dolmuşsa updated_at ile artımlı yükleme.
+        cur verilirse o bağlantı (ve transaction) kullanılır.
+        """
+        now = time.monotonic()
+        with self._lock:
+            full = force or not self._loaded_at or now - self._loaded_at >= FULL_RELOAD_SECONDS
+            if not full and now - self._refreshed_at < REFRESH_SECONDS:
+                return
+            if cur is not None:
+                self._load(cur, full)
+                return
+            from database import Database
+            with Database.get_connection() as conn:
+                with conn.cursor() as own_cur:
+                    self._load(own_cur, full)
+
+    def _load(self, cur, full: bool) -> None:
+        spec = self.spec
+        if self._columns is None:
+            cur.execute(
+                "SELECT column_name FROM information_schema.columns "
+                "WHERE table_schema = 'public' AND table_name = %s",
+                (spec.table,),
+            )
+            self._columns = {row[0] for row in cur.fetchall()}
+        # Eski şemada olmayan alias kolonu (ör. teams.acronym) atlanır
+        name_cols = (spec.primary,) + tuple(a for a in spec.aliases if a in self._columns)
+        norm_cols = tuple(f"{c}_norm" for c in name_cols)
+        use_norm = all(c in self._columns for c in norm_cols)
+        incremental = not full and "updated_at" in self._columns and self._high_water is not None
+
+        select_cols = ", ".join(norm_cols if use_norm else name_cols)
+        stamp = "updated_at" if "updated_at" in self._columns else "NULL"
+        sql = f"SELECT id, {stamp}, {select_cols} FROM {spec.table}"
+        params: tuple = ()
+        if incremental:
+            sql += f" WHERE updated_at >= %s::timestamptz - interval '{_REFRESH_OVERLAP_SECONDS} seconds'"
+            params = (self._high_water,)
+        cur.execute(sql, params)
+        rows = cur.fetchall()
+
+        if not incremental:
+            self._exact, self._alias, self._keys_by_id = {}, {}, {}
+            self._high_water = None
+        for entity_id, updated_at, *names in rows:
+            keys = [n if use_norm else normalize_name(n) for n in names]
+            self._index(entity_id, keys[0] or "", tuple(k for k in keys[1:] if k))
+            if updated_at is not None and (self._high_water is None or updated_at > self._high_water):
+                self._high_water = updated_at
+        self._fuzzy_memo.clear()
+
+        now = time.monotonic()
+        self._refreshed_at = now
+        if not incremental:
+            self._loaded_at = now
+            logger.debug("🔤 %s çözümleyici yüklendi: %d ad", self.kind, len(self._exact))
+        elif rows:
+            logger.debug("🔤 %s çözümleyici: %d satır güncellendi", self.kind, len(rows))
+
+    def _index(self, entity_id: Any, primary: str, aliases: Tuple[str, ...]) -> None:
+        """id'nin eski anahtarlarını (yeniden adlandırma) düşürüp yenilerini ekler."""
+        old = self._keys_by_id.get(entity_id)
+        if old is not None:
+            for key in old[0]:
+                _discard(self._exact, key, entity_id)
+            for key in old[1]:
+                _discard(self._alias, key, entity_id)
+        primary_keys = (primary,) if primary else ()
+        for key in primary_keys:
+            self._exact.setdefault(key, set()).add(entity_id)
+        for key in aliases:
+            self._alias.setdefault(key, set()).add(entity_id)
+        self._keys_by_id[entity_id] = (primary_keys, aliases)
+
+    # ── Sorgu ─────────────────────────────────────────────────────────────────
+
+    def lookup(self, name: Any, alias: bool = True, fuzzy: bool = False) -> Optional[Resolution]:
+        """İsmi exact → alias → fuzzy sırasıyla çözer; bulunamazsa None."""
+        key = normalize_name(name)
+        if not key:
+            return None
+        with self._lock:
+            if not self._loaded_at:
+                self.refresh()
+            ids = self._exact.get(key)
+            if ids:
+                return Resolution(min(ids), "exact")
+            if alias:
+                ids = self._alias.get(key)
+                if ids and len(ids) == 1:
+                    return Resolution(next(iter(ids)), "alias")
+            if fuzzy and len(key) >= _FUZZY_MIN_LEN:
+                if key not in self._fuzzy_memo:
+                    close = difflib.get_close_matches(key, self._exact.keys(), n=1, cutoff=FUZZY_CUTOFF)
+                    self._fuzzy_memo[key] = close[0] if close else None
+                match = self._fuzzy_memo[key]
+                if match is not None:
+                    return Resolution(min(self._exact[match]), "fuzzy")
+        return None
+
+    def resolve(self, name: Any, alias: bool = True, fuzzy: bool = False) -> Optional[Any]:
+        """lookup() kısayolu: yalnızca id (veya None)."""
+        found = self.lookup(name, alias=alias, fuzzy=fuzzy)
+        return found.entity_id if found else None
+
+    def resolve_many(self, names: Iterable[Any], alias: bool = True,
+                     fuzzy: bool = False) -> Dict[Any, Optional[Any]]:
+        """{ham ad: id veya None} — toplu çağıranlar için."""
+        return {name: self.resolve(name, alias=alias, fuzzy=fuzzy) for name in set(names)}
+
+
+def _discard(index: Dict[str, Set[Any]], key: str, entity_id: Any) -> None:
+    ids = index.get(key)
+    if ids is None:
+        return
+    ids.discard(entity_id)
+    if not ids:
+        del index[key]
+
+
+_shared: Dict[str, EntityResolver] = {}
+_shared_lock = threading.Lock()
+
+
+def get_resolver(kind: str) -> EntityResolver:
+    """Süreç başına tür başına tek çözümleyici (job'lar ve thread'ler paylaşır)."""
+    with _shared_lock:
+        resolver = _shared.get(kind)
+        if resolver is None:
+            resolver = EntityResolver(kind)
+            _shared[kind] = resolver
+        return resolver
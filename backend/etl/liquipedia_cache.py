@@ -0,0 +1,190 @@
+"""
+Liquipedia wikitext sayfa önbelleği — revision id ile anahtarlı, diskte (SQLite).
+
+Turnuva sayfası maç başına bir kez indiriliyordu (40 maçlık turnuva → aynı
+sayfa 40 kez, her biri 1-2 sn pacing). Önbellek başlık → (revid, wikitext)
+tutar; LiquipediaService.get_page_wikitext şu sırayla karar verir:
+
+  • immutable (bitmiş turnuva) kayıt   → doğrudan servis, istek yok
+  • TTL içinde doğrulanmış kayıt        → doğrudan servis, istek yok
+  • TTL dışı                            → ucuz prop=info lastrevid kontrolü;
+                                          revid aynıysa validated_at güncellenir,
+                                          değiştiyse sayfa yeniden indirilir
+
+Sayfadan türetilen ayrıştırılmış yapılar (ör. turnuva maç indeksi) aynı dosyada
+`derived` tablosunda, wikitext'in SHA-1'i ile anahtarlı tutulur → sayfa
+değişmedikçe bir kez ayrıştırılır, süreçler arası da paylaşılır.
+
+SQLite WAL modunda açılır → paralel ETL süreçleri aynı dosyayı güvenle paylaşır.
+Dosya: LIQUIPEDIA_CACHE_FILE (boş string → önbellek kapalı).
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_FILE = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), "..", ".liquipedia_cache.sqlite")
+)
+
+
+@dataclass(frozen=True)
+class CachedPage:
+    """Önbellekteki tek sayfa kaydı."""
+    title: str
+    revid: Optional[int]
+    wikitext: str
+    fetched_at: float
+    validated_at: float
+    immutable: bool
+
+    def is_fresh(self, ttl_seconds: float, now: Optional[float] = None) -> bool:
+        """Revalidasyon gerekmeden servis edilebilir mi?"""
+        if self.immutable:
+            return True
+        return ((now or time.time()) - self.validated_at) < ttl_seconds
+
+
+class WikitextPageCache:
+    """(wiki, başlık) → (revid, wikitext) SQLite deposu. Thread-safe."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS pages (
+                    wiki          TEXT    NOT NULL,
+                    title         TEXT    NOT NULL,
+                    revid         INTEGER,
+                    wikitext      TEXT    NOT NULL,
+                    fetched_at    REAL    NOT NULL,
+                    validated_at  REAL    NOT NULL,
+                    immutable     INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (wiki, title)
+                )
+                """
+            )
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS derived (
+                    wiki         TEXT NOT NULL,
+                    title        TEXT NOT NULL,
+                    kind         TEXT NOT NULL,
+                    text_sha1    TEXT NOT NULL,
+                    payload      TEXT NOT NULL,
+                    PRIMARY KEY (wiki, title, kind)
+                )
+                """
+            )
+
+    def get(self, wiki: str, title: str) -> Optional[CachedPage]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT title, revid, wikitext, fetched_at, validated_at, immutable "
+                "FROM pages WHERE wiki = ? AND title = ?",
+                (wiki, title),
+            ).fetchone()
+        if row is None:
+            return None
+        return CachedPage(row[0], row[1], row[2], row[3], row[4], bool(row[5]))
+
+    def put(self, wiki: str, title: str, revid: Optional[int], wikitext: str,
+            immutable: bool = False) -> None:
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                INSERT INTO pages (wiki, title, revid, wikitext, fetched_at, validated_at, immutable)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (wiki, title) DO UPDATE SET
+                    revid        = excluded.revid,
+                    wikitext     = excluded.wikitext,
+                    fetched_at   = excluded.fetched_at,
+                    validated_at = excluded.validated_at,
+                    immutable    = MAX(pages.immutable, excluded.immutable)
+                """,
+                (wiki, title, revid, wikitext, now, now, int(immutable)),
+            )
+
+    def touch(self, wiki: str, title: str, immutable: bool = False) -> None:
+        """Revid değişmedi → kaydı yeniden doğrulanmış say (opsiyonel immutable işaretle)."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE pages SET validated_at = ?, immutable = MAX(immutable, ?) "
+                "WHERE wiki = ? AND title = ?",
+                (time.time(), int(immutable), wiki, title),
+            )
+
+    def get_derived(self, wiki: str, title: str, kind: str, text_sha1: str) -> Optional[Any]:
+        """Sayfa içeriği (SHA-1) değişmediyse önceden ayrıştırılmış yapıyı döner."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload FROM derived "
+                "WHERE wiki = ? AND title = ? AND kind = ? AND text_sha1 = ?",
+                (wiki, title, kind, text_sha1),
+            ).fetchone()
+        if row is None:
+            return None
+        try:
+            return json.loads(row[0])
+        except ValueError:
+            return None
+
+    def put_derived(self, wiki: str, title: str, kind: str, text_sha1: str, payload: Any) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                INSERT INTO derived (wiki, title, kind, text_sha1, payload)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (wiki, title, kind) DO UPDATE SET
+                    text_sha1 = excluded.text_sha1,
+                    payload   = excluded.payload
+                """,
+                (wiki, title, kind, text_sha1, json.dumps(payload, ensure_ascii=False)),
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_shared: dict = {}
+_shared_lock = threading.Lock()
+
+
+def get_page_cache(path: Optional[str] = None) -> Optional[WikitextPageCache]:
+    """
+    Süreç başına paylaşılan önbellek örneği (path başına bir bağlantı).
+    path=None → LIQUIPEDIA_CACHE_FILE / varsayılan; boş string → None (kapalı).
+    """
+    if path is None:
+        path = os.getenv("LIQUIPEDIA_CACHE_FILE", DEFAULT_CACHE_FILE)
+    path = (path or "").strip()
+    if not path:
+        return None
+    with _shared_lock:
+        cache = _shared.get(path)
+        if cache is None:
+            try:
+                cache = WikitextPageCache(path)
+            except sqlite3.Error as err:
+                logger.warning(f"⚠️ Liquipedia sayfa önbelleği açılamadı ({path}): {err}")
+                return None
+            _shared[path] = cache
+        return cache
@@ -0,0 +1,123 @@
+"""
+Liquipedia istek pacing deposu — süreçler arası atomik (SQLite, WAL).
+
+Eski .liquipedia_pacing.json her istekte json load + dump + os.replace ile
+okunup yazılıyordu ve yalnızca süreç içi threading.Lock ile korunuyordu →
+paralel çalışan hybrid-stats / transfer / enrichment süreçleri aynı slotu
+kapabiliyordu.
+
+Burada tek satırlık `pacing` kaydı BEGIN IMMEDIATE ile okunup-yazılır (yazıcı
+kilidi tüm süreçler arasında tek). İstek sırası "slot rezervasyonu" ile verilir:
+transaction içinde slot = max(şimdi, next_request_after, cooldown_until) alınır,
+next_request_after = slot + jitter yazılır ve commit edilir; bekleme kilit
+DIŞINDA yapılır. Böylece her süreç/thread farklı bir slot alır, kimse kilidi
+uykuda tutmaz.
+
+Dosya: LIQUIPEDIA_PACING_FILE (varsayılan backend/.liquipedia_pacing.sqlite).
+"""
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+import time
+from typing import Tuple
+
+DEFAULT_PACING_FILE = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), "..", ".liquipedia_pacing.sqlite")
+)
+
+
+class PacingStore:
+    """Süreçler arası paylaşılan tek kayıt: next_request_after + cooldown."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # isolation_level=None → transaction'ları BEGIN IMMEDIATE ile elle yönet
+        self._conn = sqlite3.connect(path, timeout=30, isolation_level=None,
+                                     check_same_thread=False)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS pacing (
+                    id                  INTEGER PRIMARY KEY CHECK (id = 1),
+                    next_request_after  REAL NOT NULL DEFAULT 0,
+                    cooldown_until      REAL NOT NULL DEFAULT 0,
+                    cooldown_reason     TEXT NOT NULL DEFAULT '',
+                    updated_at          REAL NOT NULL DEFAULT 0
+                )
+                """
+            )
+            self._conn.execute("INSERT OR IGNORE INTO pacing (id) VALUES (1)")
+
+    def reserve(self, jitter_seconds: float, not_before: float = 0.0) -> Tuple[float, float]:
+        """
+        Bir sonraki istek slotunu atomik olarak ayırır.
+
+        Returns: (slot, next_after) — çağıran slot'a kadar bekleyip isteği atar.
+        """
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                next_after, cooldown_until = self._conn.execute(
+                    "SELECT next_request_after, cooldown_until FROM pacing WHERE id = 1"
+                ).fetchone()
+                now = time.time()
+                slot = max(now, next_after, cooldown_until, not_before)
+                next_request_after = slot + jitter_seconds
+                if cooldown_until and cooldown_until <= slot:
+                    # Cooldown bu slotla geçmiş olacak → temizle
+                    self._conn.execute(
+                        "UPDATE pacing SET next_request_after = ?, cooldown_until = 0, "
+                        "cooldown_reason = '', updated_at = ? WHERE id = 1",
+                        (next_request_after, now),
+                    )
+                else:
+                    self._conn.execute(
+                        "UPDATE pacing SET next_request_after = ?, updated_at = ? WHERE id = 1",
+                        (next_request_after, now),
+                    )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return slot, next_request_after
+
+    def mark_cooldown(self, until: float, reason: str) -> float:
+        """Paylaşılan cooldown'u (yalnızca ileri) uzatır; geçerli bitiş zamanını döner."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                (current,) = self._conn.execute(
+                    "SELECT cooldown_until FROM pacing WHERE id = 1"
+                ).fetchone()
+                cooldown_until = max(current or 0.0, until)
+                self._conn.execute(
+                    "UPDATE pacing SET cooldown_until = ?, cooldown_reason = ?, updated_at = ? WHERE id = 1",
+                    (cooldown_until, reason, time.time()),
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return cooldown_until
+
+
+_shared: dict = {}
+_shared_lock = threading.Lock()
+
+
+def get_pacing_store(path: str) -> PacingStore:
+    """Süreç başına path başına tek bağlantı (thread'ler paylaşır)."""
+    with _shared_lock:
+        store = _shared.get(path)
+        if store is None:
+            store = PacingStore(path)
+            _shared[path] = store
+        return store
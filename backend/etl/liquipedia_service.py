@@ -2,10 +2,11 @@
 
 from __future__ import annotations
 
-import json
+import hashlib
 import os
 import random
 import re
+import sqlite3
 import threading
 import time
 from datetime import datetime, timedelta
@@ -15,6 +16,11 @@ from typing import Any, Dict, Iterable, List, Optional, Tuple
 import requests
 import logging
 
+from etl import wikitext as wikitext_parser
+from etl.entity_resolver import normalize_name
+from etl.liquipedia_cache import get_page_cache
+from etl.liquipedia_pacing import DEFAULT_PACING_FILE, PacingStore, get_pacing_store
+
 logger = logging.getLogger(__name__)
 
 
@@ -39,11 +45,6 @@ class LiquipediaApiError(RuntimeError):
         self.params = params or {}
 
 
-def _norm_team(name: Any) -> str:
-    """Takım adını eşleştirme için normalize eder (alfanümerik, küçük harf)."""
-    return re.sub(r"[^a-z0-9]", "", str(name or "").casefold())
-
-
 def _team_in(target: str, candidates: set) -> bool:
     """target, adaylardan biriyle eşit veya containment ilişkisindeyse True."""
     if not target:
@@ -124,8 +125,11 @@ class LiquipediaService:
             "social_links": {"twitter": "https://x.com/G2NiKo"},
         },
     }
+    # MediaWiki action=query başlık üst sınırı (bot olmayan istemciler)
+    BULK_TITLES = 50
     _pacing_lock = threading.Lock()
     _global_next_request_after = 0.0
+    _global_cooldown_until = 0.0
 
     def __init__(self, game_slug: str = "valorant") -> None:
         self.game_slug = game_slug
@@ -151,8 +155,6 @@ class LiquipediaService:
         if api_key:
             self.session.headers.update({"Authorization": f"Apikey {api_key}"})
 
-        self._rate_lock = threading.Lock()
-        self._last_request_monotonic = 0.0
         self.last_errors: List[str] = []
         try:
             jitter_min = float(os.getenv("LIQUIPEDIA_JITTER_MIN_SECONDS", "1.0"))
@@ -165,76 +167,77 @@ class LiquipediaService:
         jitter_max = max(0.6, min(jitter_max, 10.0))
         self._request_jitter_min = min(jitter_min, jitter_max)
         self._request_jitter_max = max(jitter_min, jitter_max)
-        self._pacing_file = os.getenv(
-            "LIQUIPEDIA_PACING_FILE",
-            os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".liquipedia_pacing.json")),
-        )
-
-    def _read_pacing_state(self) -> Dict[str, Any]:
+        # Süreçler arası pacing (SQLite WAL, atomik slot rezervasyonu)
+        pacing_file = os.getenv("LIQUIPEDIA_PACING_FILE", DEFAULT_PACING_FILE)
+        if pacing_file.endswith(".json"):
+            pacing_file = pacing_file[:-len(".json")] + ".sqlite"  # eski JSON yolu
+        self._pacing_file = pacing_file
+        self._pacing_store: Optional[PacingStore] = None
+        self._pacing_store_failed = False
+        # Wikitext sayfa önbelleği (revid anahtarlı, diskte). TTL içinde istek atılmaz.
+        self._page_cache = get_page_cache()
         try:
-            with open(self._pacing_file, "r", encoding="utf-8") as f:
-                payload = json.load(f)
-            if isinstance(payload, dict):
-                return payload
-        except FileNotFoundError:
-            return {}
-        except Exception:
-            return {}
-        return {}
-
-    def _write_pacing_state(self, state: Dict[str, Any]) -> None:
-        directory = os.path.dirname(self._pacing_file)
-        if directory:
-            os.makedirs(directory, exist_ok=True)
+            self._page_cache_ttl = float(os.getenv("LIQUIPEDIA_CACHE_TTL_SECONDS", "21600"))
+        except ValueError:
+            self._page_cache_ttl = 21600.0
+        # turnuva adı → (immutable, oluşturulma, page_title, maç indeksi)
+        self._match_index_memo: Dict[str, Tuple[bool, float, str, Dict[str, Dict[str, Any]]]] = {}
 
-        tmp_file = f"{self._pacing_file}.tmp"
-        with open(tmp_file, "w", encoding="utf-8") as f:
-            json.dump(state, f)
-        os.replace(tmp_file, self._pacing_file)
+    def _get_pacing_store(self) -> Optional[PacingStore]:
+        """Süreçler arası pacing deposu; açılamazsa None (süreç içi pacing'e düşülür)."""
+        if self._pacing_store is None and not self._pacing_store_failed:
+            try:
+                self._pacing_store = get_pacing_store(self._pacing_file)
+            except sqlite3.Error as err:
+                self._pacing_store_failed = True
+                logger.warning(
+                    f"⚠️ Liquipedia pacing deposu açılamadı ({self._pacing_file}): {err} "
+                    "— yalnızca süreç içi pacing kullanılacak"
+                )
+        return self._pacing_store
 
     def _mark_shared_cooldown(self, wait_seconds: float, reason: str) -> float:
         wait_seconds = max(float(wait_seconds), 60.0)
         now = time.time()
         until = now + wait_seconds
 
+        cls = type(self)
         with self._pacing_lock:
-            state = self._read_pacing_state()
-            cooldown_until = max(float(state.get("cooldown_until", 0.0) or 0.0), until)
-            state["cooldown_until"] = cooldown_until
-            state["cooldown_reason"] = reason
-            state["updated_at"] = now
-            self._write_pacing_state(state)
+            cls._global_cooldown_until = max(cls._global_cooldown_until, until)
+            cooldown_until = cls._global_cooldown_until
+
+        store = self._get_pacing_store()
+        if store is not None:
+            try:
+                cooldown_until = store.mark_cooldown(until, reason)
+            except sqlite3.Error as err:  # pragma: no cover - kilit zaman aşımı
+                logger.warning(f"⚠️ Liquipedia cooldown paylaşılamadı: {err}")
 
         return max(0.0, cooldown_until - now)
 
     def _respect_rate_limit(self) -> None:
         """Ensure shared cooldown + randomized jitter pacing between requests."""
-        with self._rate_lock:
-            with self._pacing_lock:
-                state = self._read_pacing_state()
-                now = time.time()
-
-                cooldown_until = float(state.get("cooldown_until", 0.0) or 0.0)
-                persisted_next = float(state.get("next_request_after", 0.0) or 0.0)
-                local_next = self._last_request_monotonic
-                global_next = self._global_next_request_after
-
-                wait_until = max(cooldown_until, persisted_next, local_next, global_next)
-                if wait_until > now:
-                    time.sleep(wait_until - now)
-
-                request_at = time.time()
-                jitter_seconds = random.uniform(self._request_jitter_min, self._request_jitter_max)
-                next_after = request_at + jitter_seconds
-                self._last_request_monotonic = next_after
-                self._global_next_request_after = next_after
-
-                state["next_request_after"] = next_after
-                if cooldown_until <= request_at and state.get("cooldown_until"):
-                    state["cooldown_until"] = 0.0
-                    state["cooldown_reason"] = ""
-                state["updated_at"] = request_at
-                self._write_pacing_state(state)
+        jitter_seconds = random.uniform(self._request_jitter_min, self._request_jitter_max)
+        cls = type(self)
+        slot = None
+
+        store = self._get_pacing_store()
+        if store is not None:
+            try:
+                slot, next_after = store.reserve(jitter_seconds)
+            except sqlite3.Error as err:  # pragma: no cover - kilit zaman aşımı
+                logger.warning(f"⚠️ Liquipedia pacing deposu kullanılamadı: {err}")
+
+        with self._pacing_lock:
+            if slot is None:
+                slot = max(time.time(), cls._global_next_request_after, cls._global_cooldown_until)
+                next_after = slot + jitter_seconds
+            cls._global_next_request_after = max(cls._global_next_request_after, next_after)
+
+        # Slot atomik olarak ayrıldı → bekleme kilit dışında
+        wait_seconds = slot - time.time()
+        if wait_seconds > 0:
+            time.sleep(wait_seconds)
 
     def _request(self, params: Dict[str, Any]) -> Dict[str, Any]:
         max_attempts = 4
@@ -336,64 +339,207 @@ class LiquipediaService:
             logger.warning(f"⚠️ Liquipedia candidate queries failed for {self.game_slug}: {last_error}")
         return []
 
-    def _query_parse_wikitext(self, page_title: str) -> str:
+    def _query_parse_wikitext(self, page_title: str) -> Tuple[str, Optional[int]]:
         payload = self._request({
             "action": "parse",
             "format": "json",
             "page": page_title,
-            "prop": "wikitext",
+            "prop": "wikitext|revid",
             "formatversion": "2",
         })
         parsed = payload.get("parse", {})
         wikitext = parsed.get("wikitext")
-        return wikitext if isinstance(wikitext, str) else ""
+        return (wikitext if isinstance(wikitext, str) else ""), _to_int_or_none(parsed.get("revid"))
 
-    def _query_revisions_wikitext(self, page_title: str) -> str:
-        payload = self._request({
+    def _query_pages(self, params: Dict[str, Any]) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, str]]:
+        """
+        Çok başlıklı action=query (formatversion=2) — `continue` zincirini takip
+        eder (büyük içerikler birden çok yanıta bölünebilir).
+
+        Returns: (sayfa başlığı → page objesi, istenen başlık → nihai başlık)
+        """
+        pages: Dict[str, Dict[str, Any]] = {}
+        normalized: Dict[str, str] = {}
+        redirects: Dict[str, str] = {}
+        cont: Dict[str, Any] = {}
+        for _ in range(10):  # güvenlik tavanı
+            payload = self._request({**params, **cont})
+            query = payload.get("query", {})
+            for item in query.get("normalized", []):
+                normalized[item.get("from")] = item.get("to")
+            for item in query.get("redirects", []):
+                redirects[item.get("from")] = item.get("to")
+            for page in query.get("pages", []):
+                title = page.get("title")
+                merged = pages.setdefault(title, {})
+                revisions = merged.get("revisions") or page.get("revisions")
+                merged.update(page)
+                if revisions:
+                    merged["revisions"] = revisions
+            cont = payload.get("continue") or {}
+            if not cont:
+                break
+
+        resolved: Dict[str, str] = {}
+        for title in str(params.get("titles", "")).split("|"):
+            final = normalized.get(title, title)
+            seen = set()
+            while final in redirects and final not in seen:
+                seen.add(final)
+                final = redirects[final]
+            resolved[title] = final
+        return pages, resolved
+
+    def _query_revisions_bulk(self, titles: List[str]) -> Dict[str, Tuple[str, Optional[int]]]:
+        """≤50 başlığın güncel içeriği tek istekte (redirect'ler çözülür)."""
+        pages, resolved = self._query_pages({
             "action": "query",
             "format": "json",
             "prop": "revisions",
-            "titles": page_title,
-            "rvprop": "content",
+            "titles": "|".join(titles),
+            "redirects": "1",
+            "rvprop": "content|ids",
             "rvslots": "main",
             "formatversion": "2",
         })
-        pages = payload.get("query", {}).get("pages", [])
-        if not pages:
-            return ""
-        revs = pages[0].get("revisions", [])
-        if not revs:
-            return ""
-        slots = revs[0].get("slots", {})
-        main = slots.get("main", {})
-        return main.get("content", "") if isinstance(main, dict) else ""
+        out: Dict[str, Tuple[str, Optional[int]]] = {}
+        for title in titles:
+            page = pages.get(resolved.get(title, title)) or {}
+            revs = page.get("revisions") or []
+            if page.get("missing") or not revs:
+                continue
+            main = (revs[0].get("slots") or {}).get("main", {})
+            text = main.get("content", "") if isinstance(main, dict) else ""
+            if text:
+                out[title] = (text, _to_int_or_none(revs[0].get("revid")))
+        return out
+
+    def _query_lastrevids(self, titles: List[str]) -> Dict[str, Optional[int]]:
+        """Ucuz revalidasyon: ≤50 başlığın son revid'i tek istekte (yoksa None)."""
+        pages, resolved = self._query_pages({
+            "action": "query",
+            "format": "json",
+            "prop": "info",
+            "titles": "|".join(titles),
+            "redirects": "1",
+            "formatversion": "2",
+        })
+        out: Dict[str, Optional[int]] = {}
+        for title in titles:
+            page = pages.get(resolved.get(title, title)) or {}
+            out[title] = None if page.get("missing") else _to_int_or_none(page.get("lastrevid"))
+        return out
 
-    def get_page_wikitext(self, page_candidates: List[str]) -> Tuple[str, str]:
-        """Try parse first, then query revisions for each page title."""
+    @staticmethod
+    def page_key(title: Any) -> str:
+        """
+        Başlığın önbellek/sorgu anahtarı: MediaWiki "A B" ile "A_B"yi aynı
+        sayfaya çözer → tek anahtar, toplu sorguda tek slot.
+        """
+        return str(title or "").strip().replace(" ", "_")
+
+    @property
+    def has_page_cache(self) -> bool:
+        """Disk sayfa önbelleği açık mı (kapalıysa ön-yükleme fayda getirmez)."""
+        return self._page_cache is not None
+
+    def get_pages_wikitext(self, titles: List[str], immutable: bool = False) -> Dict[str, str]:
+        """
+        Birden çok sayfanın wikitext'i — MediaWiki sorgu başına 50 başlık kabul
+        eder → 50 başlık başına TEK paced istek (redirect'ler çözülür). Aynı
+        sayfanın yazım biçimleri ("A B" / "A_B") page_key ile tekilleştirilir.
+
+        Sonuçlar revid ile diskte önbelleklenir (etl/liquipedia_cache.py):
+        TTL içinde istek atılmaz, TTL dışındakiler toplu prop=info ile
+        revalide edilir, yalnızca revid'i değişenler yeniden indirilir.
+        immutable=True (bitmiş turnuva) → kayıt bir daha revalide edilmez.
+
+        Returns: {istenen başlık: wikitext} (bulunamayanlar "")
+        """
         self.last_errors = []
+        requested = [t for t in (str(t or "").strip() for t in titles) if t]
+        wanted = list(dict.fromkeys(self.page_key(t) for t in requested))
+        out: Dict[str, str] = {t: "" for t in wanted}
+        cache = self._page_cache
+
+        stale: Dict[str, Any] = {}
+        missing: List[str] = []
+        for title in wanted:
+            cached = cache.get(self.wiki, title) if cache is not None else None
+            if cached is None:
+                missing.append(title)
+            elif cached.is_fresh(self._page_cache_ttl):
+                out[title] = cached.wikitext
+                if immutable and not cached.immutable:
+                    cache.touch(self.wiki, title, immutable=True)
+            else:
+                stale[title] = cached
 
-        for page_title in page_candidates:
-            title = str(page_title or "").strip()
-            if not title:
-                continue
+        stale_titles = list(stale)
+        for i in range(0, len(stale_titles), self.BULK_TITLES):
+            chunk = stale_titles[i:i + self.BULK_TITLES]
             try:
-                text = self._query_parse_wikitext(title)
-                if text:
-                    return title, text
-                self._record_error("parse", f"Empty wikitext for page={title}")
+                revids = self._query_lastrevids(chunk)
             except Exception as err:  # pragma: no cover
-                self._record_error("parse", f"page={title} -> {err}")
+                self._record_error("info", f"titles={len(chunk)} -> {err}")
+                revids = {}
+            for title in chunk:
+                cached = stale[title]
+                if revids.get(title) is not None and revids[title] == cached.revid:
+                    cache.touch(self.wiki, title, immutable=immutable)
+                    out[title] = cached.wikitext
+                else:
+                    missing.append(title)
 
+        for i in range(0, len(missing), self.BULK_TITLES):
+            chunk = missing[i:i + self.BULK_TITLES]
             try:
-                text = self._query_revisions_wikitext(title)
-                if text:
-                    return title, text
-                self._record_error("revisions", f"Empty revisions content for page={title}")
+                fetched = self._query_revisions_bulk(chunk)
             except Exception as err:  # pragma: no cover
-                self._record_error("revisions", f"page={title} -> {err}")
+                # Toplu sorgu reddedildi → başlık başına action=parse'a düş
+                self._record_error("revisions", f"titles={len(chunk)} -> {err}")
+                fetched = {}
+                for title in chunk:
+                    try:
+                        text, revid = self._query_parse_wikitext(title)
+                        if text:
+                            fetched[title] = (text, revid)
+                    except Exception as parse_err:  # pragma: no cover
+                        self._record_error("parse", f"page={title} -> {parse_err}")
+
+            for title in chunk:
+                if title in fetched:
+                    text, revid = fetched[title]
+                    self._store_page(title, revid, text, immutable)
+                    out[title] = text
+                elif title in stale:
+                    # İndirme başarısız ama eski kopya var → bayat içerik boş sonuçtan iyidir
+                    logger.info(f"♻️ Liquipedia: {title} bayat önbellekten servis edildi")
+                    out[title] = stale[title].wikitext
+                else:
+                    self._record_error("revisions", f"Empty revisions content for page={title}")
+        return {t: out[self.page_key(t)] for t in requested}
 
+    def get_page_wikitext(self, page_candidates: List[str], immutable: bool = False) -> Tuple[str, str]:
+        """
+        Aday başlıklardan içeriği olan ilkini döner → (başlık, wikitext).
+        Tüm adaylar tek toplu istekte sorgulanır (get_pages_wikitext).
+        """
+        pages = self.get_pages_wikitext(page_candidates, immutable=immutable)
+        for page_title in page_candidates:
+            title = str(page_title or "").strip()
+            if pages.get(title):
+                return title, pages[title]
         return "", ""
 
+    def _store_page(self, title: str, revid: Optional[int], text: str, immutable: bool) -> None:
+        if self._page_cache is None:
+            return
+        try:
+            self._page_cache.put(self.wiki, title, revid, text, immutable=immutable)
+        except Exception as err:  # pragma: no cover - disk dolu / kilit
+            logger.warning(f"⚠️ Liquipedia önbelleğe yazılamadı ({title}): {err}")
+
     def search_page_titles(self, term: str, limit: int = 5) -> List[str]:
         """Search wiki page titles when exact page title is unknown."""
         try:
@@ -413,32 +559,8 @@ class LiquipediaService:
 
     def _extract_templates(self, wikitext: str) -> List[str]:
         """Extract top-level template blocks with brace balancing."""
-        text = wikitext or ""
-        out: List[str] = []
-        i = 0
-        n = len(text)
-        while i < n - 1:
-            if text[i:i + 2] != "{{":
-                i += 1
-                continue
-            start = i
-            depth = 1
-            i += 2
-            while i < n - 1 and depth > 0:
-                pair = text[i:i + 2]
-                if pair == "{{":
-                    depth += 1
-                    i += 2
-                elif pair == "}}":
-                    depth -= 1
-                    i += 2
-                else:
-                    i += 1
-            if depth == 0:
-                out.append(text[start:i])
-            else:
-                break
-        return out
+        tree = wikitext_parser.parse(wikitext)
+        return [tree.text_of(node) for node in tree.top_level()]
 
     def _parse_template_params(self, block: str) -> Dict[str, str]:
         """Parse first-level template params from a template block."""
@@ -648,42 +770,12 @@ class LiquipediaService:
         Verilen isimle başlayan TÜM template bloklarını (iç içe olanlar dahil)
         brace-dengeli olarak çıkarır. `_extract_templates` yalnızca top-level
         bulur; bu metod nested {{Match}} / {{Map}} için gereklidir.
+
+        Aynı metin üzerinde birden çok sorgu yapılacaksa doğrudan
+        etl.wikitext.parse() ağacını kullanın (tek tokenizasyon).
         """
-        text = text or ""
-        out: List[str] = []
-        needle = "{{" + name_prefix
-        n = len(text)
-        i = 0
-        while True:
-            start = text.find(needle, i)
-            if start == -1:
-                break
-            # İsim sınırını doğrula: prefix'ten sonra harf gelmemeli
-            # (örn. "Map" ararken "MapVeto"yu kaçır).
-            after = start + len(needle)
-            if after < n and (text[after].isalpha()):
-                i = start + 2
-                continue
-            depth = 0
-            j = start
-            while j < n - 1:
-                pair = text[j:j + 2]
-                if pair == "{{":
-                    depth += 1
-                    j += 2
-                elif pair == "}}":
-                    depth -= 1
-                    j += 2
-                    if depth == 0:
-                        break
-                else:
-                    j += 1
-            if depth == 0:
-                out.append(text[start:j])
-                i = j
-            else:
-                break
-        return out
+        tree = wikitext_parser.parse(text)
+        return [tree.text_of(node) for node in tree.named(name_prefix)]
 
     @staticmethod
     def _split_params_brace_aware(block: str) -> Dict[str, str]:
@@ -691,44 +783,7 @@ class LiquipediaService:
         Bir template bloğunun parametrelerini, nested {{...}} ve [[...]] içindeki
         '|' karakterlerini yok sayarak ayrıştırır (depth-0 split).
         """
-        inner = block[2:-2] if block.startswith("{{") and block.endswith("}}") else block
-        params: Dict[str, str] = {}
-        buf: List[str] = []
-        parts: List[str] = []
-        curly = 0
-        square = 0
-        i = 0
-        n = len(inner)
-        while i < n:
-            pair = inner[i:i + 2]
-            if pair == "{{":
-                curly += 1; buf.append(pair); i += 2; continue
-            if pair == "}}":
-                curly -= 1; buf.append(pair); i += 2; continue
-            if pair == "[[":
-                square += 1; buf.append(pair); i += 2; continue
-            if pair == "]]":
-                square -= 1; buf.append(pair); i += 2; continue
-            ch = inner[i]
-            if ch == "|" and curly == 0 and square == 0:
-                parts.append("".join(buf)); buf = []; i += 1; continue
-            buf.append(ch); i += 1
-        if buf:
-            parts.append("".join(buf))
-
-        # İlk parça template adıdır → atla
-        positional = 1
-        for part in parts[1:]:
-            chunk = part.strip()
-            if not chunk:
-                continue
-            if "=" in chunk:
-                key, value = chunk.split("=", 1)
-                params[key.strip()] = value.strip()
-            else:
-                params[f"_{positional}"] = chunk
-                positional += 1
-        return params
+        return wikitext_parser.split_params(block)
 
     # ── Liquipedia v3 yapısal veri API'si (API key ile) ──────────────────────
 
@@ -826,10 +881,7 @@ class LiquipediaService:
         v3 /match opponent koşuluyla team_a vs team_b maçını bulur (hacimden
         bağımsız kesin lookup). Normalize edilmiş maç dict'i veya None döner.
         """
-        def _norm(s: str) -> str:
-            return re.sub(r"[^a-z0-9]", "", str(s or "").casefold())
-
-        na, nb = _norm(team_a), _norm(team_b)
+        na, nb = normalize_name(team_a), normalize_name(team_b)
         if not (na and nb):
             return None
 
@@ -845,10 +897,10 @@ class LiquipediaService:
             })
             for m in (payload or {}).get("result", []):
                 norm_match = self._normalize_v3_match(m)
-                team_keys = {_norm(t) for t in norm_match["teams"]}
+                team_keys = {normalize_name(t) for t in norm_match["teams"]}
                 # Her iki takım da (containment toleranslı) eşleşmeli
                 if any(other_norm == k or other_norm in k or k in other_norm for k in team_keys) \
-                   and any(_norm(probe_team) == k or _norm(probe_team) in k or k in _norm(probe_team) for k in team_keys):
+                   and any(normalize_name(probe_team) == k or normalize_name(probe_team) in k or k in normalize_name(probe_team) for k in team_keys):
                     if any(mp["players"] for mp in norm_match["maps"]):
                         return norm_match
         return None
@@ -888,22 +940,41 @@ class LiquipediaService:
         """
         Aylık transfer sayfasının ("Player Transfers/<year>/<month>") wikitext'inden
         {{Transfer Row|date|name|flag|team1(eski)|team2(yeni)|role1|role2}} satırlarını
-        çıkarır. API key GEREKTİRMEZ (action=parse).
+        çıkarır. API key GEREKTİRMEZ.
 
         Returns: [{date, player, old_team, new_team, role, flag}], boş satırlar atlanır.
         """
-        page = f"Player Transfers/{year}/{month_name}"
-        _, wikitext = self.get_page_wikitext([page, page.replace(" ", "_")])
-        if not wikitext:
-            self._record_error("transfers_wikitext", f"No wikitext for {page}")
-            return []
+        return self.get_transfers_wikitext_months([(year, month_name)]).get((year, month_name), [])
+
+    def get_transfers_wikitext_months(
+        self,
+        months: List[Tuple[int, str]],
+    ) -> Dict[Tuple[int, str], List[Dict[str, Any]]]:
+        """
+        Birden çok ayın transfer sayfası tek toplu istekte (50 ay / istek).
+
+        Returns: {(year, month_name): satırlar} — sayfası olmayan aylar [].
+        """
+        pages = {(year, month): f"Player Transfers/{year}/{month}" for year, month in months}
+        texts = self.get_pages_wikitext(list(pages.values()))
+        out: Dict[Tuple[int, str], List[Dict[str, Any]]] = {}
+        for key, page in pages.items():
+            wikitext = texts.get(page, "")
+            if not wikitext:
+                self._record_error("transfers_wikitext", f"No wikitext for {page}")
+                out[key] = []
+                continue
+            out[key] = self._parse_transfer_rows(wikitext)
+        return out
 
+    def _parse_transfer_rows(self, wikitext: str) -> List[Dict[str, Any]]:
         # HTML yorumlarını temizle (commented şablon örnekleri gerçek değil)
         wikitext = re.sub(r"<!--.*?-->", "", wikitext, flags=re.S)
 
         out: List[Dict[str, Any]] = []
-        for block in self._extract_named_templates(wikitext, "Transfer Row"):
-            p = self._split_params_brace_aware(block)
+        tree = wikitext_parser.parse(wikitext)
+        for node in tree.named("Transfer Row"):
+            p = tree.params(node)
             name = self._clean_wikitext_value(p.get("name", "")).strip()
             if not name:
                 continue
@@ -926,67 +997,140 @@ class LiquipediaService:
         team_a: str,
         team_b: str,
         limit: int = 20,
+        tournament_finished: bool = False,
     ) -> List[Dict[str, Any]]:
         """
         Turnuva sayfasının wikitext'inden, team_a vs team_b maçının harita
         bazlı verisini (harita adı + skor + oyuncu KDA) çıkarır.
 
         API key GEREKTİRMEZ. Eşleşme bulunamazsa boş liste döner.
+        Sayfa bir kez ayrıştırılıp takım çifti indeksine çevrilir
+        (get_tournament_match_index) → aynı turnuvanın sonraki maçları O(1).
 
         Returns:
             list[dict]: her biri {map, winner, team1_score, team2_score,
                         team1_name, team2_name, players[], source}
         """
-        page_candidates = [tournament_name, tournament_name.replace(" ", "_")]
-        page_title, wikitext = self.get_page_wikitext(page_candidates)
-        if not wikitext:
-            searched = self.search_page_titles(tournament_name, limit=5)
-            if searched:
-                page_title, wikitext = self.get_page_wikitext(searched)
-        if not wikitext:
+        page_title, index = self.get_tournament_match_index(
+            tournament_name, tournament_finished=tournament_finished,
+        )
+        if not index:
             self._record_error("match_maps_wikitext", f"No wikitext for {tournament_name}")
             return []
 
-        norm_a = _norm_team(team_a)
-        norm_b = _norm_team(team_b)
+        match = self._lookup_match(index, team_a, team_b)
+        if match is None:
+            return []
+        return [
+            {
+                "source": "wikitext",
+                "page": page_title,
+                "map": mp["map"],
+                "winner": mp["winner"],
+                "team1_name": match["team1_name"],
+                "team2_name": match["team2_name"],
+                "team1_score": mp["team1_score"],
+                "team2_score": mp["team2_score"],
+                "players": [dict(p) for p in mp["players"]],
+            }
+            for mp in match["maps"][:limit]
+        ]
+
+    def get_tournament_match_index(
+        self,
+        tournament_name: str,
+        tournament_finished: bool = False,
+    ) -> Tuple[str, Dict[str, Dict[str, Any]]]:
+        """
+        Turnuva sayfasındaki tüm {{Match}} bloklarını "normA|normB" (sıralı)
+        anahtarlı bir indekse çevirir: {team1_name, team2_name, maps[]}; her
+        harita skorları ve PSI oyuncu satırlarıyla önceden çıkarılmış halde.
+
+        Üç katman: süreç içi memo (TTL / immutable) → disk önbelleği (wikitext
+        SHA-1 anahtarlı, sayfanın yanında) → ayrıştırma. Sayfa bulunamazsa
+        boş indeks de memo'lanır (aynı koşuda tekrar arama yapılmaz).
+
+        Returns: (page_title, index)
+        """
+        memo_key = str(tournament_name or "").strip()
+        now = time.time()
+        memo = self._match_index_memo.get(memo_key)
+        if memo is not None and (memo[0] or now - memo[1] < self._page_cache_ttl):
+            return memo[2], memo[3]
 
-        for match_block in self._extract_named_templates(wikitext, "Match"):
-            params = self._split_params_brace_aware(match_block)
+        page_candidates = [tournament_name, tournament_name.replace(" ", "_")]
+        page_title, wikitext = self.get_page_wikitext(page_candidates, immutable=tournament_finished)
+        if not wikitext:
+            searched = self.search_page_titles(tournament_name, limit=5)
+            if searched:
+                page_title, wikitext = self.get_page_wikitext(searched, immutable=tournament_finished)
+
+        index: Dict[str, Dict[str, Any]] = {}
+        if wikitext:
+            text_sha1 = hashlib.sha1(wikitext.encode("utf-8")).hexdigest()
+            cached = None
+            if self._page_cache is not None:
+                cached = self._page_cache.get_derived(self.wiki, page_title, "match_index:v2", text_sha1)
+            if isinstance(cached, dict):
+                index = cached
+            else:
+                index = self._build_match_index(wikitext)
+                if self._page_cache is not None:
+                    try:
+                        self._page_cache.put_derived(self.wiki, page_title, "match_index:v2", text_sha1, index)
+                    except Exception as err:  # pragma: no cover - disk dolu / kilit
+                        logger.warning(f"⚠️ Liquipedia maç indeksi önbelleğe yazılamadı ({page_title}): {err}")
+
+        self._match_index_memo[memo_key] = (tournament_finished and bool(index), now, page_title, index)
+        return page_title, index
+
+    def _build_match_index(self, wikitext: str) -> Dict[str, Dict[str, Any]]:
+        """Sayfadaki {{Match}} bloklarını tek geçişte indeksler (sayfa sırası korunur)."""
+        index: Dict[str, Dict[str, Any]] = {}
+        tree = wikitext_parser.parse(wikitext)
+        for match_node in tree.named("Match"):
+            params = tree.params(match_node)
             opp1 = self._extract_opponent_name(params.get("opponent1", ""))
             opp2 = self._extract_opponent_name(params.get("opponent2", ""))
             if not (opp1 and opp2):
                 continue
-            n1, n2 = _norm_team(opp1), _norm_team(opp2)
-            pair = {n1, n2}
-            if not (_team_in(norm_a, pair) and _team_in(norm_b, pair)):
-                continue
+            key = "|".join(sorted((normalize_name(opp1), normalize_name(opp2))))
+            if key in index:
+                continue  # aynı çiftin ilk maçı (eski doğrusal taramayla aynı davranış)
 
-            # Eşleşen maç bulundu → haritaları çıkar
             maps_out: List[Dict[str, Any]] = []
-            for map_block in self._extract_named_templates(match_block, "Map"):
-                mp = self._split_params_brace_aware(map_block)
+            for map_node in tree.named("Map", within=match_node):
+                mp = tree.params(map_node)
                 map_name = (mp.get("map") or "").strip()
                 if not map_name:
                     continue
                 t1 = _to_int(mp.get("t1atk")) + _to_int(mp.get("t1def"))
                 t2 = _to_int(mp.get("t2atk")) + _to_int(mp.get("t2def"))
-                players = self._extract_psi_players(map_block)
                 maps_out.append({
-                    "source": "wikitext",
-                    "page": page_title,
                     "map": map_name,
                     "winner": mp.get("winner"),
-                    "team1_name": opp1,
-                    "team2_name": opp2,
                     "team1_score": t1 or None,
                     "team2_score": t2 or None,
-                    "players": players,
+                    "players": self._psi_players_from_params(mp),
                 })
-                if len(maps_out) >= limit:
-                    break
-            return maps_out
+            index[key] = {"team1_name": opp1, "team2_name": opp2, "maps": maps_out}
+        return index
 
-        return []
+    @staticmethod
+    def _lookup_match(index: Dict[str, Dict[str, Any]], team_a: str, team_b: str) -> Optional[Dict[str, Any]]:
+        """Tam anahtar eşleşmesi O(1); yoksa containment ile (sayfa sırasında) tarar."""
+        norm_a = normalize_name(team_a)
+        norm_b = normalize_name(team_b)
+        if not (norm_a and norm_b):
+            return None
+        match = index.get("|".join(sorted((norm_a, norm_b))))
+        if match is not None:
+            return match
+        for key, candidate in index.items():
+            pair = set(key.split("|"))
+            if _team_in(norm_a, pair) and _team_in(norm_b, pair):
+                return candidate
+        return None
 
     @staticmethod
     def _extract_opponent_name(opponent_param: str) -> str:
@@ -999,9 +1143,12 @@ class LiquipediaService:
         Map bloğundaki {{PSI|player=..|kills=..|deaths=..|...}} şablonlarını
         oyuncu listesine çevirir. t1p* → team 1, t2p* → team 2.
         """
+        return self._psi_players_from_params(self._split_params_brace_aware(map_block))
+
+    def _psi_players_from_params(self, params: Dict[str, str]) -> List[Dict[str, Any]]:
+        """Ayrıştırılmış Map parametrelerinden PSI oyuncu satırları."""
         players: List[Dict[str, Any]] = []
         # tX p Y = {{PSI ...}} eşlemesi için anahtar bazlı tarama
-        params = self._split_params_brace_aware(map_block)
         for key, value in params.items():
             m = re.match(r"^t([12])p\d+$", key)
             if not m or "PSI" not in value:
@@ -1275,7 +1422,7 @@ class LiquipediaService:
         return links
 
     def _normalize_player_key(self, player_name: str) -> str:
-        return re.sub(r"[^a-z0-9]", "", str(player_name or "").casefold())
+        return normalize_name(player_name)
 
     def _bootstrap_player_profile(self, player_name: str) -> Optional[Dict[str, Any]]:
         key = self._normalize_player_key(player_name)
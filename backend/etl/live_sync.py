@@ -0,0 +1,125 @@
+"""
+Canlı maç senkronizasyon döngüsü — `run.py --live` ve `sync_worker.py --live`
+daemon'u aynı adımları paylaşır.
+
+Tek döngü (run_cycle):
+  1. Her oyun için /running → upsert, oyunlar eşzamanlı (live_id birleşimi toplanır)
+  2. Orphan çözümü: DB'de running olup /running'de olmayan maçlar → final skor
+  3. Stale not_started temizliği (stale_every saniyede bir; daemon'da seyrek)
+  4. Canlı maç istatistikleri (harita/KDA/tur skoru)
+  5. Maç bittiyse Elo'ya artımlı katlama (predictor verilmişse)
+
+Tek seferlik cron çağrısında nesne her run'da yeniden kurulur; daemon'da
+aynı LiveSyncer tutulur → DB havuzu, PandaScore HTTP session'ı ve Elo
+ratingleri süreç boyunca sıcak kalır.
+"""
+from __future__ import annotations
+
+import logging
+import time
+from typing import Iterable, Optional
+
+from database import Database
+from etl.sync_matches import MatchSyncer
+from etl.sync_players import PlayerStatsSyncer
+
+logger = logging.getLogger(__name__)
+
+ALL_GAMES = ('valorant', 'csgo', 'lol')
+
+
+class LiveSyncer:
+    """Canlı maç döngüsü; tek süreçte tekrar tekrar çalıştırılabilir."""
+
+    def __init__(self, games: Iterable[str] = ALL_GAMES, limit: int = 20,
+                 fix_orphans: bool = False, stale_every: float = 0.0,
+                 predictor=None, syncer: Optional[MatchSyncer] = None) -> None:
+        self.games = list(games)
+        self.limit = limit
+        # --fix-orphans verilirse cap'i yükselt (backlog temizliği için)
+        self.cap = 200 if fix_orphans else 100
+        # 0 → her döngüde; daemon'da ör. 900 sn
+        self.stale_every = stale_every
+        self.predictor = predictor
+        self.syncer = syncer or MatchSyncer()
+        self.stats_syncer = PlayerStatsSyncer()
+        self._stale_at = 0.0
+
+    def run_cycle(self) -> dict:
+        """
+        Tek canlı sync turu.
+
+        Returns: {'fetched', 'cleaned', 'synced', 'new', 'changed', 'unchanged',
+                  'live', 'resolved', 'stale', 'stats'}
+        """
+        total_live = {'fetched': 0, 'cleaned': 0, 'synced': 0,
+                      'new': 0, 'changed': 0, 'unchanged': 0}
+        all_live_ids = set()
+        per_game = self.syncer.map_games(
+            lambda game: self.syncer.sync_running_matches(game, limit=self.limit),
+            self.games,
+        )
+        for r in per_game:
+            all_live_ids |= r.get('live_ids', set())
+            for k in total_live:
+                total_live[k] += r.get(k, 0)
+        logger.info(
+            f"📡 Live sync done — synced {total_live['synced']} running matches "
+            f"(new={total_live['new']} | changed={total_live['changed']} | "
+            f"unchanged={total_live['unchanged']})"
+        )
+
+        # Orphan resolution: tüm oyunların live_id birleşimiyle TEK seferde
+        # (oyun-slug'ından bağımsız → 'cs-go'/'league-of-legends' slug bug'ı yok).
+        resolved = self.syncer.resolve_orphans(all_live_ids, cap=self.cap)
+        logger.info(f"🔍 Orphan resolution: {resolved} maç finished'a güncellendi")
+
+        # Stale not_started temizliği (planlı zamanı geçmiş hayalet maçlar)
+        stale = 0
+        now = time.monotonic()
+        if not self._stale_at or now - self._stale_at >= self.stale_every:
+            stale = self.syncer.resolve_stale_upcoming(hours_ago=6, cap=self.cap)
+            self._stale_at = now
+            logger.info(f"🔍 Stale upcoming resolution: {stale} maç güncellendi")
+
+        # Canlı maç istatistiklerini de güncelle (harita/KDA/tur skoru)
+        self.stats_syncer.ensure_schema()   # schema_migrations: güncelse DDL yok
+        stats_count = self.stats_syncer.sync_match_stats(limit=50)
+        logger.info(f"📊 Live stats refreshed — {stats_count} matches processed")
+
+        # Biten maçları Elo'ya katla (persist watermark'tan artımlı; üst üste binen
+        # maçların geç bitmesi tam replay tetiklemez — bkz. MatchPredictor._replay)
+        if self.predictor is not None and (resolved or stale):
+            try:
+                self.predictor.build_elo_ratings()
+            except Exception as e:
+                logger.warning(f"⚠️  Elo güncellenemedi: {e}")
+
+        return {**total_live, 'live': len(all_live_ids), 'resolved': resolved,
+                'stale': stale, 'stats': stats_count}
+
+    @staticmethod
+    def seconds_until_next_start(horizon_seconds: float, overdue_minutes: int = 30) -> Optional[float]:
+        """
+        Sıradaki planlı maçın başlamasına kalan süre (horizon içindeyse).
+
+        Planlı saati son overdue_minutes içinde geçmiş ama hâlâ not_started
+        olan maç varsa 0 döner — maçlar sık sık geç başlar, /running'e her an
+        düşebilir. Horizon içinde maç yoksa None.
+        """
+        with Database.get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    """
+                    SELECT EXTRACT(EPOCH FROM (MIN(scheduled_at) - NOW()))
+                    FROM matches
+                    WHERE status = 'not_started'
+                      AND scheduled_at >= NOW() - (%s * INTERVAL '1 minute')
+                      AND scheduled_at <= NOW() + (%s * INTERVAL '1 second')
+                    """,
+                    (overdue_minutes, horizon_seconds),
+                )
+                (seconds,) = cur.fetchone()
+        if seconds is None:
+            return None
+        return max(0.0, float(seconds))
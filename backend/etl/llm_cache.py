@@ -0,0 +1,147 @@
+"""
+LLM üretim sonuç önbelleği — fact sheet hash'i ile anahtarlı, Postgres'te.
+
+Gemini yanıtı döndükten sonra _save_* düşerse veya süreç çökerse, sonraki run
+aynı makale için yeniden üretim (kota + ~10 sn gecikme) ödüyordu. Önbellek
+her ham yanıtı ayrıştırma durumuyla birlikte saklar; NewsGenerator adaptörü
+çağırmadan önce toplu olarak buraya bakar.
+
+Anahtar: sha256(adapter kimliği (model, temperature), system prompt,
+user prompt (fact sheet), response schema). Prompt veya model değişince
+anahtar da değişir → eski yanıt asla yanlış içerikle servis edilmez.
+
+  • parse_ok = true   → yeniden servis edilir (LLM çağrısı yok)
+  • parse_ok = false  → servis edilmez; yeni yanıt kaydın üzerine yazılır
+
+GitHub Actions runner'ları kalıcı disk tutmadığı için depo SQLite değil
+Postgres (sql/create_llm_generations.sql). Önbellek hatası üretimi
+durdurmaz: uyarı loglanır, süreç boyunca önbellek kapanır.
+
+Ayar: LLM_CACHE_ENABLED (varsayılan açık).
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+from typing import Any, Dict, Iterable, Optional, Type
+
+import psycopg
+from pydantic import BaseModel
+
+from config import Config
+from database import Database
+from etl.schema_migrations import Migration, ensure_migration
+
+logger = logging.getLogger(__name__)
+
+# sql/create_llm_generations.sql ile aynı
+_LLM_GENERATIONS_MIGRATION = Migration("llm_generations", 1, (
+    """
+    CREATE TABLE IF NOT EXISTS public.llm_generations (
+        cache_key     text        PRIMARY KEY,
+        kind          text        NOT NULL,
+        subject_id    text,
+        identity      jsonb       NOT NULL DEFAULT '{}'::jsonb,
+        raw_response  text        NOT NULL,
+        parse_ok      boolean     NOT NULL,
+        created_at    timestamptz NOT NULL DEFAULT now(),
+        hits          integer     NOT NULL DEFAULT 0,
+        last_hit_at   timestamptz
+    )
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS idx_llm_generations_created_at
+        ON public.llm_generations (created_at)
+    """,
+))
+
+
+def cache_key(identity: dict, system_prompt: Optional[str], user_prompt: str,
+              response_schema: Optional[Type[BaseModel]] = None) -> str:
+    """Yanıtı belirleyen tüm girdilerin sha256 özeti."""
+    schema = response_schema.model_json_schema() if response_schema is not None else None
+    payload = json.dumps(
+        [identity, system_prompt or "", user_prompt, schema],
+        sort_keys=True, ensure_ascii=False, default=str, separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMResultCache:
+    """cache_key → ham LLM yanıtı (llm_generations tablosu)."""
+
+    def __init__(self, enabled: Optional[bool] = None) -> None:
+        self.enabled = Config.LLM_CACHE_ENABLED if enabled is None else enabled
+        self._schema_ready = False
+
+    def _ensure_schema(self, cur) -> bool:
+        if self._schema_ready:
+            return True
+        try:
+            cur.execute("SAVEPOINT sp_llm_cache")
+            ensure_migration(_LLM_GENERATIONS_MIGRATION, cur)
+            cur.execute("RELEASE SAVEPOINT sp_llm_cache")
+        except psycopg.Error as exc:
+            cur.execute("ROLLBACK TO SAVEPOINT sp_llm_cache")
+            self._disable(exc)
+            return False
+        self._schema_ready = True
+        return True
+
+    def _disable(self, exc: Exception) -> None:
+        logger.warning("⚠️  LLM sonuç önbelleği kullanılamıyor, kapatıldı: %s", exc)
+        self.enabled = False
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, str]:
+        """parse_ok kayıtların ham yanıtları: {cache_key: raw}. Hit sayacı artırılır."""
+        keys = sorted({k for k in keys if k})
+        if not self.enabled or not keys:
+            return {}
+        try:
+            with Database.get_connection() as conn:
+                with conn.cursor() as cur:
+                    if not self._ensure_schema(cur):
+                        return {}
+                    cur.execute(
+                        """
+                        UPDATE llm_generations
+                           SET hits = hits + 1, last_hit_at = now()
+                         WHERE cache_key = ANY(%s) AND parse_ok
+                        RETURNING cache_key, raw_response
+                        """,
+                        (keys,),
+                    )
+                    return dict(cur.fetchall())
+        except psycopg.Error as exc:
+            self._disable(exc)
+            return {}
+
+    def put(self, key: str, kind: str, subject_id: Any, identity: dict,
+            raw: str, parse_ok: bool) -> None:
+        """Yanıtı kaydeder. Mevcut parse_ok kaydın üzerine yazılmaz."""
+        if not self.enabled or not key:
+            return
+        try:
+            with Database.get_connection() as conn:
+                with conn.cursor() as cur:
+                    if not self._ensure_schema(cur):
+                        return
+                    cur.execute(
+                        """
+                        INSERT INTO llm_generations
+                            (cache_key, kind, subject_id, identity, raw_response, parse_ok)
+                        VALUES (%s, %s, %s, %s::jsonb, %s, %s)
+                        ON CONFLICT (cache_key) DO UPDATE
+                           SET raw_response = EXCLUDED.raw_response,
+                               parse_ok     = EXCLUDED.parse_ok,
+                               created_at   = now(),
+                               hits         = 0,
+                               last_hit_at  = NULL
+                         WHERE NOT llm_generations.parse_ok
+                        """,
+                        (key, kind, None if subject_id is None else str(subject_id),
+                         json.dumps(identity, default=str), raw, parse_ok),
+                    )
+        except psycopg.Error as exc:
+            self._disable(exc)
@@ -0,0 +1,214 @@
+"""
+Eşzamanlı LLM üretim yürütücüsü + RPM/TPM hız yöneticisi.
+
+NewsGenerator'ın dört üreticisi Gemini'yi tamamen seri çağırıyordu: her
+makaleden sonra sabit time.sleep(4), hata başına maç-özel 35/65 sn bloklayan
+bekleme. Gerçek kota ne olursa olsun verim ~5 sn'de bir makalede kalıyordu.
+
+Burada:
+  • RateGovernor  süreç genelinde paylaşılan bütçe:
+      - istek aralığı 60/rpm sn (slot rezervasyonu; patlama yok)
+      - 60 sn kayan pencerede tahmini token toplamı ≤ tpm
+      - 429 / "retry in Xs" → GLOBAL cooldown (tüm worker'lar bekler) ve
+        etkin rpm yarıya iner; kesintisiz başarılar rpm'i +1 adımlarla
+        yapılandırılan üst sınıra geri taşır (AIMD)
+  • LLMExecutor   işleri N worker ile çalıştırır, sonuçları tamamlanma
+                  sırasıyla döner; ayrıştırma/DB yazımı çağıranda (tek thread)
+
+Ayarlar (config.py): LLM_CONCURRENCY, LLM_RPM, LLM_TPM.
+"""
+from __future__ import annotations
+
+import logging
+import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Any, Iterable, Iterator, Optional, Tuple
+
+from config import Config
+from etl.adapters.llm_adapter import BaseLLMAdapter, LLMAdapterError
+
+logger = logging.getLogger(__name__)
+
+_WINDOW_SECONDS = 60.0
+# Yanıt token'ı bilinmiyor → makale başına tahmini çıktı payı
+_OUTPUT_TOKEN_ESTIMATE = 1024
+
+# "Please retry in 47 seconds." veya "retry in 47.3s" gibi API mesajlarını yakalar
+_RETRY_AFTER_RE = re.compile(r"retry\s+in\s+([\d.]+)\s*s", re.IGNORECASE)
+_RATE_LIMIT_RE = re.compile(r"\b429\b|RESOURCE_EXHAUSTED|rate.?limit|quota", re.IGNORECASE)
+
+# Free tier varsayılan cooldown adımları (Google'ın 30-60s cooldown'ını absorbe eder)
+_DEFAULT_WAITS = [35, 65]
+# Kota dışı geçici hatalarda (5xx, boş yanıt) yalnızca o işin yerel beklemesi
+_TRANSIENT_WAIT = 5
+
+
+def parse_retry_after(exc_str: str) -> Optional[int]:
+    """Hata metninden 'Please retry in X seconds' süresini saniye cinsinden çıkarır."""
+    m = _RETRY_AFTER_RE.search(exc_str)
+    if m:
+        return int(float(m.group(1))) + 2  # +2s güvenlik tamponu
+    return None
+
+
+def estimate_tokens(*texts: Optional[str]) -> int:
+    """Kaba token tahmini (~4 karakter/token) + çıktı payı."""
+    return sum(len(t or "") for t in texts) // 4 + _OUTPUT_TOKEN_ESTIMATE
+
+
+class RateGovernor:
+    """Süreç içi RPM/TPM bütçesi + global cooldown. Thread-safe."""
+
+    def __init__(self, rpm: float, tpm: int = 0) -> None:
+        self.max_rpm = max(float(rpm), 1.0)
+        self.rpm = self.max_rpm
+        self.tpm = max(int(tpm or 0), 0)   # 0 → token sınırı yok
+        self._cond = threading.Condition()
+        self._next_slot = 0.0
+        self._cooldown_until = 0.0
+        self._tokens: deque = deque()      # (monotonic, tahmini token)
+        self._streak = 0
+
+    def acquire(self, tokens: int) -> None:
+        """Bir istek slotu + token bütçesi ayrılana kadar bekler."""
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                while self._tokens and now - self._tokens[0][0] >= _WINDOW_SECONDS:
+                    self._tokens.popleft()
+                wait = max(self._cooldown_until, self._next_slot) - now
+                if wait <= 0 and self.tpm and self._tokens:
+                    used = sum(t for _, t in self._tokens)
+                    if used + tokens > self.tpm:
+                        wait = self._tokens[0][0] + _WINDOW_SECONDS - now
+                if wait <= 0:
+                    self._next_slot = now + _WINDOW_SECONDS / self.rpm
+                    self._tokens.append((now, tokens))
+                    return
+                self._cond.wait(timeout=wait)
+
+    def on_success(self) -> None:
+        """Additive increase: rpm kadar kesintisiz başarı → rpm +1 (üst sınıra kadar)."""
+        with self._cond:
+            if self.rpm >= self.max_rpm:
+                return
+            self._streak += 1
+            if self._streak >= self.rpm:
+                self._streak = 0
+                self.rpm = min(self.max_rpm, self.rpm + 1)
+                logger.info("📈 LLM hız sınırı artırıldı: %.0f istek/dk", self.rpm)
+
+    def on_rate_limited(self, wait_seconds: float) -> None:
+        """
+        Kota sinyali: tüm worker'lar için cooldown + multiplicative decrease.
+
+        Aynı kota duvarına çarpan worker'lar aynı pencerede art arda 429 alır;
+        rpm cooldown penceresi başına en fazla BİR kez yarıya iner (aksi halde
+        4 worker hızı tek seferde 10 → 1'e düşürürdü).
+        """
+        with self._cond:
+            now = time.monotonic()
+            in_cooldown = now < self._cooldown_until
+            until = now + wait_seconds
+            if until > self._cooldown_until:
+                self._cooldown_until = until
+            self._streak = 0
+            if in_cooldown:
+                self._cond.notify_all()
+                return
+            self.rpm = max(1.0, self.rpm / 2)
+            logger.warning(
+                "⏸️  LLM kota sinyali — global %ds bekleme, hız %.0f istek/dk",
+                wait_seconds, self.rpm,
+            )
+            self._cond.notify_all()
+
+
+_shared_governor: Optional[RateGovernor] = None
+_shared_lock = threading.Lock()
+
+
+def get_governor() -> RateGovernor:
+    """Süreç başına tek yönetici → ardışık üreticiler cooldown'u paylaşır."""
+    global _shared_governor
+    with _shared_lock:
+        if _shared_governor is None:
+            _shared_governor = RateGovernor(Config.LLM_RPM, Config.LLM_TPM)
+        return _shared_governor
+
+
+@dataclass
+class LLMJob:
+    """Tek üretim işi. payload çağıranın bağlamıdır (maç dict'i vb.)."""
+    key: Any
+    user_prompt: str
+    system_prompt: str
+    response_schema: Any = None
+    payload: Any = None
+    kind: str = ""                   # 'match' | 'preview' | ... (log / önbellek etiketi)
+    cache_key: Optional[str] = None  # etl/llm_cache.cache_key
+
+
+class LLMExecutor:
+    """LLM işlerini N worker ile, paylaşılan RateGovernor altında çalıştırır."""
+
+    def __init__(self, llm: BaseLLMAdapter, workers: Optional[int] = None,
+                 governor: Optional[RateGovernor] = None, max_retries: int = 3) -> None:
+        self._llm = llm
+        self.workers = max(1, int(workers or Config.LLM_CONCURRENCY))
+        self.governor = governor or get_governor()
+        self.max_retries = max_retries
+
+    def run(self, jobs: Iterable[LLMJob]) -> Iterator[Tuple[LLMJob, Optional[str]]]:
+        """(iş, ham yanıt | None) çiftlerini tamamlanma sırasıyla üretir."""
+        jobs = list(jobs)
+        if not jobs:
+            return
+        with ThreadPoolExecutor(max_workers=min(self.workers, len(jobs)),
+                                thread_name_prefix="llm") as pool:
+            futures = {pool.submit(self._generate, job): job for job in jobs}
+            for future in as_completed(futures):
+                yield futures[future], future.result()
+
+    def _generate(self, job: LLMJob) -> Optional[str]:
+        """
+        LLM çağrısını max_retries denemeye kadar yeniden dener.
+
+        Kota hatası (429 / RESOURCE_EXHAUSTED / "retry in Xs") → governor'a
+        global cooldown bildirilir: önce API'nin verdiği süre (+2s tampon),
+        yoksa varsayılan 35s / 65s. Diğer hatalar yalnızca bu işi kısa bekletir.
+        """
+        tokens = estimate_tokens(job.system_prompt, job.user_prompt)
+        for attempt in range(1, self.max_retries + 1):
+            self.governor.acquire(tokens)
+            try:
+                raw = self._llm.generate(
+                    user_prompt=job.user_prompt,
+                    system_prompt=job.system_prompt,
+                    response_schema=job.response_schema,
+                )
+                self.governor.on_success()
+                return raw
+            except LLMAdapterError as exc:
+                exc_str = str(exc)
+                dynamic = parse_retry_after(exc_str)
+                rate_limited = dynamic is not None or bool(_RATE_LIMIT_RE.search(exc_str))
+                logger.warning(
+                    "⚠️  %s — LLM hatası (deneme %d/%d): %s",
+                    job.key, attempt, self.max_retries, exc_str[:120],
+                )
+                if rate_limited:
+                    # Son denemede de bildirilir: diğer worker'lar cooldown'a uyar
+                    wait = dynamic if dynamic is not None else _DEFAULT_WAITS[min(attempt, len(_DEFAULT_WAITS)) - 1]
+                    self.governor.on_rate_limited(wait)
+                if attempt >= self.max_retries:
+                    break
+                if not rate_limited:
+                    time.sleep(_TRANSIENT_WAIT * attempt)
+
+        logger.warning("❌ %s — %d denemede yanıt alınamadı, atlanıyor.", job.key, self.max_retries)
+        return None
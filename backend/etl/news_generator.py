@@ -12,9 +12,8 @@ from __future__ import annotations
 
 import json
 import logging
-import re
-import time
 from collections import Counter, defaultdict
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 
@@ -22,6 +21,8 @@ from pydantic import BaseModel
 
 from database import Database
 from etl.adapters.llm_adapter import BaseLLMAdapter
+from etl.llm_cache import LLMResultCache, cache_key
+from etl.llm_executor import LLMExecutor, LLMJob
 
 
 class NewsArticleSchema(BaseModel):
@@ -421,11 +422,33 @@ class FactSheetBuilder:
         return "\n".join(lines)
 
 
+@dataclass
+class FactSheetInputs:
+    """NewsGenerator._prefetch_inputs çıktısı — fact sheet kurulumu bellekte yapılır."""
+    player_stats: dict = field(default_factory=lambda: defaultdict(list))   # match_id → [oyuncu satırı]
+    match_stats: dict = field(default_factory=lambda: defaultdict(list))    # match_id → [{team_id, stats}]
+    records: dict = field(default_factory=dict)                             # (turnuva, takım) → {w, l}
+    forms: dict = field(default_factory=dict)                               # team_id → form özeti
+    forms_missing: bool = False
+
+    def record(self, tournament_id, team_id) -> Optional[dict]:
+        return self.records.get((tournament_id, team_id))
+
+
+def _form_summary(form: str) -> dict:
+    """'WWLWL' (yeni→eski) → {"n", "wins", "losses", "form"} (_fetch_team_form ile aynı şekil)."""
+    wins = form.count("W")
+    return {"n": len(form), "wins": wins, "losses": len(form) - wins, "form": form}
+
+
 class NewsGenerator:
     """Fetches unprocessed finished matches and writes LLM-generated articles."""
 
-    def __init__(self, llm_adapter: BaseLLMAdapter) -> None:
+    def __init__(self, llm_adapter: BaseLLMAdapter, workers: Optional[int] = None) -> None:
         self._llm = llm_adapter
+        # Üretim eşzamanlı; hız sınırı süreç geneli RateGovernor'da (llm_executor)
+        self._executor = LLMExecutor(llm_adapter, workers=workers)
+        self._cache = LLMResultCache()
 
     # ── DB helpers ────────────────────────────────────────────────────────────
 
@@ -469,50 +492,11 @@ class NewsGenerator:
                 cols = [d[0] for d in cur.description]
                 return [dict(zip(cols, row)) for row in cur.fetchall()]
 
-    def _fetch_stats(self, match_id) -> list[dict]:
-        with Database.get_connection() as conn:
-            with conn.cursor() as cur:
-                cur.execute(
-                    "SELECT team_id, stats FROM match_stats WHERE match_id = %s",
-                    (match_id,),
-                )
-                cols = [d[0] for d in cur.description]
-                return [dict(zip(cols, row)) for row in cur.fetchall()]
-
-    def _fetch_player_stats(self, match_id) -> list[dict]:
-        """
-        Maçın en yüksek kill'e sahip oyuncularını döner (Hibrit Adapter ile
-        player_match_stats dolduğunda makaleleri zenginleştirir). Veri yoksa [].
-
-        OPSİYONEL zenginleştirme: şema/veri sorununda [] döner — haber üretimini
-        ASLA çökertmez (no silent fail: hata loglanır).
-        """
-        try:
-            with Database.get_connection() as conn:
-                with conn.cursor() as cur:
-                    cur.execute(
-                        """
-                        SELECT p.nickname, t.name AS team_name,
-                               pms.kills, pms.deaths, pms.assists,
-                               pms.hs_percentage, pms.impact_score, pms.stats
-                        FROM player_match_stats pms
-                        JOIN players p ON p.id = pms.player_id
-                        LEFT JOIN teams t ON t.id = pms.team_id
-                        WHERE pms.match_id = %s AND pms.kills IS NOT NULL
-                        ORDER BY pms.kills DESC NULLS LAST
-                        LIMIT 5
-                        """,
-                        (match_id,),
-                    )
-                    cols = [d[0] for d in cur.description]
-                    return [dict(zip(cols, row)) for row in cur.fetchall()]
-        except Exception as exc:
-            logger.warning("⚠️  player_match_stats okunamadı (atlanıyor) match %s: %s", match_id, exc)
-            return []
-
     def _fetch_team_form(self, team_id, limit: int = 5) -> Optional[dict]:
         """
         Takımın son N bitmiş maçının W/L formu (önizleme fact sheet'ini derinleştirir).
+        Yalnızca get_teams_recent_form RPC'si yoksa _prefetch_inputs'un yedeği
+        (RPC ile aynı kural: winner_id dolu maçlar, en yeni başta).
         Veri yoksa None döner — önizleme üretimini ASLA çökertmez.
         Dönüş: {"n": int, "wins": int, "losses": int, "form": "WWLWL"}  (yeni→eski)
         """
@@ -525,9 +509,9 @@ class NewsGenerator:
                         """
                         SELECT winner_id
                         FROM matches
-                        WHERE status = 'finished'
+                        WHERE status = 'finished' AND winner_id IS NOT NULL
                           AND (team_a_id = %s OR team_b_id = %s)
-                        ORDER BY scheduled_at DESC
+                        ORDER BY scheduled_at DESC NULLS LAST
                         LIMIT %s
                         """,
                         (team_id, team_id, limit),
@@ -539,36 +523,132 @@ class NewsGenerator:
         if not rows:
             return None
         tid = str(team_id)
-        results = ["W" if str(w[0] or "") == tid else "L" for w in rows]
-        wins = results.count("W")
-        return {"n": len(results), "wins": wins, "losses": len(results) - wins, "form": "".join(results)}
+        return _form_summary("".join("W" if str(w[0] or "") == tid else "L" for w in rows))
+
+    # ── Toplu ön-yükleme (fact sheet girdileri) ───────────────────────────────
 
-    def _fetch_tournament_record(self, tournament_id, team_id) -> Optional[dict]:
+    def _prefetch_inputs(self, matches: list[dict], player_stats: bool = True,
+                         match_stats: bool = True, forms: bool = False) -> "FactSheetInputs":
         """
-        Takımın BU turnuvadaki W-L kaydı (turnuva sıralaması bağlamı). Veri yoksa None.
-        Üretimi ASLA çökertmez.
+        Bekleyen maç kümesinin tüm fact sheet girdilerini TEK bağlantıda, kümeye
+        göre birkaç sorguda çeker (eskiden maç başına 4 sorgu × yeni bağlantı):
+          • player_match_stats  → maç başına en çok kill'li 5 oyuncu (window)
+          • match_stats         → match_id = ANY(...)
+          • turnuva W-L kaydı   → (turnuva, takım) çiftleri unnest + GROUP BY
+          • takım formu         → get_teams_recent_form RPC (sql/get_teams_recent_form.sql)
+        Opsiyonel zenginleştirmeler (oyuncu, kayıt, form) kendi SAVEPOINT'inde;
+        hata loglanır, ilgili girdi boş kalır → üretim ASLA çökmez.
         """
-        if not tournament_id or not team_id:
-            return None
-        try:
-            with Database.get_connection() as conn:
-                with conn.cursor() as cur:
+        inputs = FactSheetInputs()
+        match_ids = [m["id"] for m in matches]
+        if not match_ids:
+            return inputs
+        pairs = sorted({
+            (m["tournament"].get("id"), team.get("id"))
+            for m in matches
+            for team in (m["team_a"], m["team_b"])
+            if m["tournament"].get("id") and team.get("id")
+        })
+        team_ids = sorted({
+            team.get("id") for m in matches for team in (m["team_a"], m["team_b"]) if team.get("id")
+        })
+
+        with Database.get_connection() as conn:
+            with conn.cursor() as cur:
+                if match_stats:
                     cur.execute(
-                        """
-                        SELECT
-                            COUNT(*) FILTER (WHERE winner_id = %s) AS wins,
-                            COUNT(*) FILTER (WHERE winner_id IS NOT NULL AND winner_id <> %s) AS losses
-                        FROM matches
-                        WHERE tournament_id = %s AND status = 'finished'
-                          AND (team_a_id = %s OR team_b_id = %s) AND winner_id IS NOT NULL
-                        """,
-                        (team_id, team_id, tournament_id, team_id, team_id),
+                        "SELECT match_id, team_id, stats FROM match_stats WHERE match_id = ANY(%s)",
+                        (match_ids,),
                     )
-                    w, l = cur.fetchone()
-        except Exception:
-            return None
-        w, l = int(w or 0), int(l or 0)
-        return {"w": w, "l": l} if (w or l) else None
+                    for match_id, team_id, stats in cur.fetchall():
+                        inputs.match_stats[match_id].append({"team_id": team_id, "stats": stats})
+
+                if player_stats:
+                    try:
+                        cur.execute("SAVEPOINT sp_news_players")
+                        cur.execute(
+                            """
+                            SELECT match_id, nickname, team_name, kills, deaths, assists,
+                                   hs_percentage, impact_score, stats
+                            FROM (
+                                SELECT pms.match_id, p.nickname, t.name AS team_name,
+                                       pms.kills, pms.deaths, pms.assists,
+                                       pms.hs_percentage, pms.impact_score, pms.stats,
+                                       row_number() OVER (
+                                           PARTITION BY pms.match_id
+                                           ORDER BY pms.kills DESC NULLS LAST
+                                       ) AS rn
+                                FROM player_match_stats pms
+                                JOIN players p ON p.id = pms.player_id
+                                LEFT JOIN teams t ON t.id = pms.team_id
+                                WHERE pms.match_id = ANY(%s) AND pms.kills IS NOT NULL
+                            ) ranked
+                            WHERE rn <= 5
+                            ORDER BY match_id, rn
+                            """,
+                            (match_ids,),
+                        )
+                        cols = [d[0] for d in cur.description][1:]
+                        for row in cur.fetchall():
+                            inputs.player_stats[row[0]].append(dict(zip(cols, row[1:])))
+                        cur.execute("RELEASE SAVEPOINT sp_news_players")
+                    except Exception as exc:
+                        cur.execute("ROLLBACK TO SAVEPOINT sp_news_players")
+                        inputs.player_stats.clear()
+                        logger.warning("⚠️  player_match_stats okunamadı (atlanıyor): %s", exc)
+
+                if pairs:
+                    try:
+                        cur.execute("SAVEPOINT sp_news_records")
+                        cur.execute(
+                            """
+                            SELECT p.tournament_id, p.team_id,
+                                   COUNT(*) FILTER (WHERE m.winner_id = p.team_id) AS wins,
+                                   COUNT(*) FILTER (WHERE m.winner_id <> p.team_id) AS losses
+                            FROM unnest(%s::bigint[], %s::bigint[]) AS p(tournament_id, team_id)
+                            JOIN matches m
+                              ON m.tournament_id = p.tournament_id
+                             AND m.status = 'finished'
+                             AND m.winner_id IS NOT NULL
+                             AND (m.team_a_id = p.team_id OR m.team_b_id = p.team_id)
+                            GROUP BY p.tournament_id, p.team_id
+                            """,
+                            ([p[0] for p in pairs], [p[1] for p in pairs]),
+                        )
+                        for tn_id, team_id, w, l in cur.fetchall():
+                            w, l = int(w or 0), int(l or 0)
+                            if w or l:
+                                inputs.records[(tn_id, team_id)] = {"w": w, "l": l}
+                        cur.execute("RELEASE SAVEPOINT sp_news_records")
+                    except Exception as exc:
+                        cur.execute("ROLLBACK TO SAVEPOINT sp_news_records")
+                        inputs.records.clear()
+                        logger.warning("⚠️  turnuva kayıtları okunamadı (atlanıyor): %s", exc)
+
+                if forms and team_ids:
+                    try:
+                        cur.execute("SAVEPOINT sp_news_forms")
+                        cur.execute(
+                            "SELECT team_id, form FROM get_teams_recent_form(%s::bigint[])",
+                            (team_ids,),
+                        )
+                        for team_id, form in cur.fetchall():
+                            if form:
+                                inputs.forms[team_id] = _form_summary(form)
+                        cur.execute("RELEASE SAVEPOINT sp_news_forms")
+                    except Exception as exc:
+                        cur.execute("ROLLBACK TO SAVEPOINT sp_news_forms")
+                        logger.warning(
+                            "⚠️  get_teams_recent_form RPC kullanılamadı, takım başına sorguya düşülüyor: %s", exc,
+                        )
+                        inputs.forms_missing = True
+
+        if forms and inputs.forms_missing:
+            for team_id in team_ids:
+                form = self._fetch_team_form(team_id)
+                if form:
+                    inputs.forms[team_id] = form
+        return inputs
 
     @staticmethod
     def _is_newsworthy(match: dict, player_rows: list) -> bool:
@@ -711,10 +791,12 @@ class NewsGenerator:
         rows = self._fetch_unprocessed(hours_back=hours_back)
         logger.info("📰 Haber üretilecek maç: %d", len(rows))
         stats = {"attempted": len(rows), "generated": 0, "failed": 0, "skipped": 0}
+        matches = [self._denormalize(row) for row in rows]
+        inputs = self._prefetch_inputs(matches)
 
-        for row in rows:
-            match = self._denormalize(row)
-            player_rows = self._fetch_player_stats(match["id"])
+        jobs = []
+        for match in matches:
+            player_rows = inputs.player_stats.get(match["id"], [])
 
             # Kalite kapısı: şablon/dolgu üretecek zayıf maçları atla
             if not self._is_newsworthy(match, player_rows):
@@ -722,22 +804,19 @@ class NewsGenerator:
                 logger.info("⏭️  Atlandı (haberlik değil) match_id=%s", match["id"])
                 continue
 
-            stats_rows = self._fetch_stats(match["id"])
+            stats_rows = inputs.match_stats.get(match["id"], [])
             tn_id = match["tournament"].get("id")
-            rec_a = self._fetch_tournament_record(tn_id, match["team_a"].get("id"))
-            rec_b = self._fetch_tournament_record(tn_id, match["team_b"].get("id"))
+            rec_a = inputs.record(tn_id, match["team_a"].get("id"))
+            rec_b = inputs.record(tn_id, match["team_b"].get("id"))
             fact_sheet = FactSheetBuilder.build(match, stats_rows, player_rows, rec_a=rec_a, rec_b=rec_b)
             user_prompt = (
                 "Aşağıdaki maç özet raporunu kullanarak Türkçe haber bülteni üret:\n\n"
                 + fact_sheet
             )
+            jobs.append(self._job("match", match["id"], user_prompt, SYSTEM_PROMPT, match))
 
-            raw = self._generate_with_backoff(user_prompt, match["id"])
-            if raw is None:
-                stats["failed"] += 1
-                continue
-
-            article = self._parse_llm_json(raw)
+        for job, article in self._generate(jobs):
+            match = job.payload
             if article is None:
                 stats["failed"] += 1
                 continue
@@ -754,8 +833,6 @@ class NewsGenerator:
                 logger.warning("⚠️  DB kayıt hatası match %s: %s", match["id"], exc)
                 stats["failed"] += 1
 
-            time.sleep(4)
-
         return stats
 
     # ── Önizleme (upcoming) üretimi ───────────────────────────────────────────
@@ -841,25 +918,25 @@ class NewsGenerator:
         rows = self._fetch_upcoming_for_preview(hours_ahead=hours_ahead)
         logger.info("🔮 Önizleme üretilecek maç: %d", len(rows))
         stats = {"attempted": len(rows), "generated": 0, "failed": 0}
+        matches = [self._denormalize(row) for row in rows]
+        inputs = self._prefetch_inputs(matches, player_stats=False, match_stats=False, forms=True)
 
-        for row in rows:
-            match = self._denormalize(row)
-            form_a = self._fetch_team_form(match["team_a"].get("id"))
-            form_b = self._fetch_team_form(match["team_b"].get("id"))
+        jobs = []
+        for match in matches:
+            form_a = inputs.forms.get(match["team_a"].get("id"))
+            form_b = inputs.forms.get(match["team_b"].get("id"))
             tn_id = match["tournament"].get("id")
-            rec_a = self._fetch_tournament_record(tn_id, match["team_a"].get("id"))
-            rec_b = self._fetch_tournament_record(tn_id, match["team_b"].get("id"))
+            rec_a = inputs.record(tn_id, match["team_a"].get("id"))
+            rec_b = inputs.record(tn_id, match["team_b"].get("id"))
             fact_sheet = FactSheetBuilder.build_preview(match, form_a=form_a, form_b=form_b, rec_a=rec_a, rec_b=rec_b)
             user_prompt = (
                 "Aşağıdaki yaklaşan maç önizleme raporunu kullanarak Türkçe maç önizlemesi üret:\n\n"
                 + fact_sheet
             )
+            jobs.append(self._job("preview", match["id"], user_prompt, PREVIEW_SYSTEM_PROMPT, match))
 
-            raw = self._generate_with_backoff(user_prompt, match["id"], system_prompt=PREVIEW_SYSTEM_PROMPT)
-            if raw is None:
-                stats["failed"] += 1
-                continue
-            article = self._parse_llm_json(raw)
+        for job, article in self._generate(jobs):
+            match = job.payload
             if article is None:
                 stats["failed"] += 1
                 continue
@@ -870,7 +947,6 @@ class NewsGenerator:
             except Exception as exc:
                 logger.warning("⚠️  Önizleme kayıt hatası match %s: %s", match["id"], exc)
                 stats["failed"] += 1
-            time.sleep(4)
 
         return stats
 
@@ -969,6 +1045,7 @@ class NewsGenerator:
         logger.info("🔁 Transfer haberi üretilecek: %d", len(rows))
         stats = {"attempted": len(rows), "generated": 0, "failed": 0}
 
+        jobs = []
         for tr in rows:
             form = self._player_form_summary(tr["player_id"])
             fact_sheet = FactSheetBuilder.build_transfer(tr, player_form=form)
@@ -976,11 +1053,10 @@ class NewsGenerator:
                 "Aşağıdaki transfer raporunu kullanarak Türkçe transfer haberi üret:\n\n"
                 + fact_sheet
             )
-            raw = self._generate_with_backoff(user_prompt, tr["rc_id"], system_prompt=TRANSFER_SYSTEM_PROMPT)
-            if raw is None:
-                stats["failed"] += 1
-                continue
-            article = self._parse_llm_json(raw)
+            jobs.append(self._job("transfer", tr["rc_id"], user_prompt, TRANSFER_SYSTEM_PROMPT, tr))
+
+        for job, article in self._generate(jobs):
+            tr = job.payload
             if article is None:
                 stats["failed"] += 1
                 continue
@@ -991,7 +1067,6 @@ class NewsGenerator:
             except Exception as exc:
                 logger.warning("⚠️  Transfer kayıt hatası rc=%s: %s", tr["rc_id"], exc)
                 stats["failed"] += 1
-            time.sleep(4)
 
         return stats
 
@@ -1106,6 +1181,7 @@ class NewsGenerator:
         rows = self._fetch_finished_tournaments(days_back=days_back, limit=limit)
         logger.info("🏆 Turnuva recap üretilecek: %d", len(rows))
         stats = {"attempted": len(rows), "generated": 0, "failed": 0}
+        jobs = []
         for t in rows:
             ctx = self._fetch_tournament_context(t["id"])
             if not ctx or not ctx.get("champion"):
@@ -1113,11 +1189,10 @@ class NewsGenerator:
                 continue
             fact_sheet = FactSheetBuilder.build_tournament(t, ctx)
             user_prompt = "Aşağıdaki turnuva sonuç raporunu kullanarak Türkçe recap üret:\n\n" + fact_sheet
-            raw = self._generate_with_backoff(user_prompt, t["id"], system_prompt=TOURNAMENT_SYSTEM_PROMPT)
-            if raw is None:
-                stats["failed"] += 1
-                continue
-            article = self._parse_llm_json(raw)
+            jobs.append(self._job("tournament", t["id"], user_prompt, TOURNAMENT_SYSTEM_PROMPT, (t, ctx)))
+
+        for job, article in self._generate(jobs):
+            t, ctx = job.payload
             if article is None:
                 stats["failed"] += 1
                 continue
@@ -1128,56 +1203,41 @@ class NewsGenerator:
             except Exception as exc:
                 logger.warning("⚠️  Turnuva recap kayıt hatası %s: %s", t["id"], exc)
                 stats["failed"] += 1
-            time.sleep(4)
         return stats
 
-    # "Please retry in 47 seconds." veya "retry in 47.3s" gibi API mesajlarını yakalar
-    _RETRY_AFTER_RE = re.compile(r"retry\s+in\s+([\d.]+)\s*s", re.IGNORECASE)
-
-    # Free tier varsayılan bekleme adımları (Google'ın 30-60s cooldown'ını absorbe eder)
-    _DEFAULT_WAITS = [35, 65]
-
-    def _parse_retry_after(self, exc_str: str) -> Optional[int]:
-        """Hata metninden 'Please retry in X seconds' süresini saniye cinsinden çıkarır."""
-        m = self._RETRY_AFTER_RE.search(exc_str)
-        if m:
-            return int(float(m.group(1))) + 2  # +2s güvenlik tamponu
-        return None
+    def _job(self, kind: str, key, user_prompt: str, system_prompt: str, payload) -> LLMJob:
+        return LLMJob(
+            key=key,
+            user_prompt=user_prompt,
+            system_prompt=system_prompt,
+            response_schema=NewsArticleSchema,
+            payload=payload,
+            kind=kind,
+            cache_key=cache_key(self._llm.cache_identity, system_prompt, user_prompt, NewsArticleSchema),
+        )
 
-    def _generate_with_backoff(self, user_prompt: str, match_id, system_prompt: str = SYSTEM_PROMPT) -> Optional[str]:
+    def _generate(self, jobs: list[LLMJob]):
         """
-        LLM çağrısını 3 denemeye kadar yeniden dener.
+        (iş, makale | None) çiftleri üretir.
 
-        Bekleme süresi önceliği:
-          1. API hata mesajından dinamik olarak çekilen "retry in Xs" süresi (+2s tampon)
-          2. Sabit varsayılanlar: 1. hata → 35s, 2. hata → 65s
+        Önbellekte ayrışmış yanıtı olan işler LLM'e gitmez; diğerleri executor
+        ile üretilir ve ham yanıt ayrıştırma durumuyla birlikte — kayıttan
+        ÖNCE — önbelleğe yazılır (_save_* düşse de yanıt kaybolmaz).
         """
-        from etl.adapters.llm_adapter import LLMAdapterError
-
-        max_retries = 3
-        for attempt in range(1, max_retries + 1):
-            try:
-                raw = self._llm.generate(
-                    user_prompt=user_prompt,
-                    system_prompt=system_prompt,
-                    response_schema=NewsArticleSchema,
-                )
-                return raw
-            except LLMAdapterError as exc:
-                exc_str = str(exc)
-                if attempt >= max_retries:
-                    break
-
-                dynamic = self._parse_retry_after(exc_str)
-                wait = dynamic if dynamic is not None else self._DEFAULT_WAITS[attempt - 1]
-
-                source = f"API direktifi ({dynamic}s + 2s tampon)" if dynamic else "varsayılan"
-                logger.warning(
-                    "⚠️  match %s — LLM hatası (deneme %d/%d): %s | "
-                    "%ds bekleniyor [%s]…",
-                    match_id, attempt, max_retries, exc_str[:120], wait, source,
-                )
-                time.sleep(wait)
-
-        logger.warning("❌ match %s — %d denemede yanıt alınamadı, atlanıyor.", match_id, max_retries)
-        return None
+        cached = self._cache.get_many(job.cache_key for job in jobs)
+        if cached:
+            logger.info("💾 LLM önbelleğinden servis: %d / %d", len(cached), len(jobs))
+        for job in jobs:
+            raw = cached.get(job.cache_key)
+            if raw is not None:
+                yield job, self._parse_llm_json(raw)
+
+        misses = [job for job in jobs if job.cache_key not in cached]
+        for job, raw in self._executor.run(misses):
+            if raw is None:
+                yield job, None
+                continue
+            article = self._parse_llm_json(raw)
+            self._cache.put(job.cache_key, job.kind, job.key, self._llm.cache_identity,
+                            raw, article is not None)
+            yield job, article
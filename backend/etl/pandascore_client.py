@@ -3,15 +3,117 @@ PandaScore API client for fetching esports match data
 """
 import requests
 import os
+import threading
 import time
 from datetime import datetime, timedelta, timezone
+from requests.adapters import HTTPAdapter
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+class PandaScoreRateLimiter:
+    """
+    Süreç genelinde paylaşılan token-bucket limiter.
+
+    - Normalde `rate` istek/sn, `burst` kadar ani patlamaya izin verir.
+    - Her yanıttaki X-Rate-Limit-Remaining / X-Rate-Limit-Used header'ları
+      okunur; kalan kota düşük su seviyesinin altına inince hız kalan kotayı
+      pencereye (varsayılan 1 saat) yayacak şekilde düşürülür, kota toparlanınca
+      taban hıza döner.
+    - 429/503'te cooldown() TÜM thread'leri/çağrı noktalarını birlikte bekletir
+      (çağrı noktası başına ayrı sleep/backoff yerine).
+    """
+
+    def __init__(self, rate=4.0, burst=8, window_seconds=3600.0, min_rate=1 / 60):
+        self.base_rate = max(float(rate), min_rate)
+        self.rate = self.base_rate
+        self.burst = max(1.0, float(burst))
+        self.window_seconds = float(window_seconds)
+        self.min_rate = float(min_rate)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._cooldown_until = 0.0
+        self._lock = threading.Lock()
+        self.remaining = None
+        self.limit = None
+
+    def acquire(self):
+        """Bir token alınana kadar (ve aktif cooldown bitene kadar) bekler."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if now < self._cooldown_until:
+                    wait = self._cooldown_until - now
+                elif self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return
+                else:
+                    wait = (1.0 - self._tokens) / self.rate
+            time.sleep(wait)
+
+    def cooldown(self, seconds):
+        """Global bekleme: herkes `seconds` boyunca istek atmaz, bucket boşaltılır."""
+        with self._lock:
+            self._cooldown_until = max(self._cooldown_until, time.monotonic() + float(seconds))
+            self._tokens = 0.0
+
+    def update_from_response(self, response):
+        remaining = self._int_header(response, 'X-Rate-Limit-Remaining')
+        if remaining is None:
+            return
+        used = self._int_header(response, 'X-Rate-Limit-Used')
+        with self._lock:
+            self.remaining = remaining
+            if used is not None:
+                self.limit = remaining + used
+            low_water = max(20, int(0.1 * self.limit)) if self.limit else 50
+            if remaining < low_water:
+                # Kalan kotayı pencereye yay: 1000/saat planında 30 kalmışsa ~2dk/istek
+                self.rate = min(self.base_rate, max(self.min_rate, remaining / self.window_seconds))
+                self._tokens = min(self._tokens, 1.0)
+            else:
+                self.rate = self.base_rate
+
+    @staticmethod
+    def _int_header(response, name):
+        value = response.headers.get(name) if response is not None else None
+        try:
+            return int(value) if value is not None else None
+        except (TypeError, ValueError):
+            return None
+
+
+_shared_session = None
+_shared_limiter = None
+_shared_lock = threading.Lock()
+
+
+def _shared_http():
+    """Tüm PandaScoreClient örnekleri aynı keep-alive Session + limiter'ı kullanır."""
+    global _shared_session, _shared_limiter
+    with _shared_lock:
+        if _shared_session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            session.headers.update({'Accept': 'application/json'})
+            _shared_session = session
+            _shared_limiter = PandaScoreRateLimiter(
+                rate=float(os.getenv('PANDASCORE_RATE_PER_SEC', 4)),
+                burst=float(os.getenv('PANDASCORE_BURST', 8)),
+            )
+        return _shared_session, _shared_limiter
+
+
 class PandaScoreClient:
     """Client for interacting with PandaScore API"""
+
+    # Sunucu tarafı geçici hatalar: limiter üzerinden global bekleme + retry
+    _RETRY_STATUSES = (429, 502, 503, 504)
     
     def __init__(self):
         self.base_url = "https://api.pandascore.co"
@@ -20,6 +122,8 @@ class PandaScoreClient:
         if not self.api_token:
             raise ValueError("PANDASCORE_TOKEN not found in environment variables")
 
+        self.session, self.limiter = _shared_http()
+
     @staticmethod
     def _retry_delay_seconds(response, attempt, base_delay=2.0, max_delay=60.0):
         retry_after = response.headers.get('Retry-After') if response is not None else None
@@ -32,32 +136,64 @@ class PandaScoreClient:
         delay = base_delay * (2 ** max(0, attempt - 1))
         return min(max_delay, delay)
 
-    def _request_json_with_backoff(self, url, params, label, max_attempts=5, base_delay=2.0):
-        last_response = None
+    def request(self, path, params=None, timeout=30, max_attempts=5, base_delay=2.0):
+        """
+        Backend'deki TÜM PandaScore GET'lerinin tek giriş noktası.
+
+        Paylaşılan keep-alive Session + token-bucket limiter kullanır. 429/5xx
+        ve ağ hatalarında limiter'a global cooldown yazılıp yeniden denenir.
+        Son yanıtı döner (çağıran status_code'u yorumlar); tüm denemeler ağ
+        hatasıyla biterse son RequestException yükseltilir.
+
+        path: '/teams/123' gibi göreli yol ya da tam URL.
+        """
+        url = path if path.startswith('http') else f"{self.base_url}{path}"
+        params = {k: v for k, v in (params or {}).items() if k != 'token'}
+        headers = {'Authorization': f'Bearer {self.api_token}'}
+        response = None
+        last_exc = None
 
         for attempt in range(1, max_attempts + 1):
-            response = requests.get(url, params=params, timeout=30)
-            last_response = response
+            self.limiter.acquire()
+            try:
+                response = self.session.get(url, params=params, headers=headers, timeout=timeout)
+            except requests.exceptions.RequestException as exc:
+                last_exc = exc
+                if attempt < max_attempts:
+                    wait_seconds = self._retry_delay_seconds(None, attempt, base_delay=base_delay)
+                    logger.warning(
+                        f"⚠️  PandaScore request failed (attempt {attempt}/{max_attempts}): {exc}; "
+                        f"retrying in {wait_seconds:.1f}s"
+                    )
+                    time.sleep(wait_seconds)
+                continue
 
-            if response.status_code == 429:
+            self.limiter.update_from_response(response)
+            if response.status_code in self._RETRY_STATUSES and attempt < max_attempts:
                 wait_seconds = self._retry_delay_seconds(response, attempt, base_delay=base_delay)
                 logger.warning(
-                    f"⚠️  {label} rate limited (attempt {attempt}/{max_attempts}); "
-                    f"waiting {wait_seconds:.1f}s before retry..."
+                    f"⚠️  PandaScore {response.status_code} (attempt {attempt}/{max_attempts}); "
+                    f"all requests paused {wait_seconds:.1f}s"
                 )
-                time.sleep(wait_seconds)
+                self.limiter.cooldown(wait_seconds)
                 continue
+            return response
 
-            response.raise_for_status()
-            payload = response.json()
-            logger.info(f"✅ {label} fetched {len(payload)} matches")
-            return payload
+        if response is not None:
+            return response
+        raise last_exc
 
-        if last_response is not None and last_response.status_code == 429:
+    def _request_json_with_backoff(self, url, params, label, max_attempts=5, base_delay=2.0):
+        response = self.request(url, params, max_attempts=max_attempts, base_delay=base_delay)
+
+        if response.status_code == 429:
             logger.error(f"❌ {label} rate limited after {max_attempts} attempts")
             return None
 
-        return None
+        response.raise_for_status()
+        payload = response.json()
+        logger.info(f"✅ {label} fetched {len(payload)} matches")
+        return payload
     
     def get_upcoming_matches(self, game_slug, limit=50, days_ahead=7):
         """
@@ -79,7 +215,6 @@ class PandaScoreClient:
         until_iso = until_utc.isoformat().replace('+00:00', 'Z')
         
         params = {
-            'token': self.api_token,
             'per_page': limit,
             'sort': 'begin_at',
             'range[begin_at]': f'{now_iso},{until_iso}',
@@ -101,7 +236,6 @@ class PandaScoreClient:
 
         if params.get('range[begin_at]'):
             fallback_params = {
-                'token': self.api_token,
                 'per_page': limit,
                 'sort': 'begin_at',
             }
@@ -123,7 +257,6 @@ class PandaScoreClient:
         """Fetch currently running (live) matches from PandaScore /running endpoint."""
         url = f"{self.base_url}/{game_slug}/matches/running"
         params = {
-            'token': self.api_token,
             'per_page': limit,
         }
         try:
@@ -138,10 +271,8 @@ class PandaScoreClient:
 
     def get_match_by_id(self, match_id):
         """Fetch a single match by ID — used to resolve final score after match leaves /running."""
-        url = f"{self.base_url}/matches/{match_id}"
-        params = {'token': self.api_token}
         try:
-            response = requests.get(url, params=params, timeout=30)
+            response = self.request(f"/matches/{match_id}")
             if response.status_code == 404:
                 logger.warning(f"⚠️  Match {match_id} not found on PandaScore (404)")
                 return None
@@ -155,6 +286,48 @@ class PandaScoreClient:
             logger.error(f"❌ get_match_by_id({match_id}) failed: {e}")
             return None
 
+    # /matches?filter[id]=... tek istekte en fazla per_page (100) maç döndürür.
+    MAX_IDS_PER_REQUEST = 100
+
+    def get_matches_by_ids(self, match_ids, chunk_size=MAX_IDS_PER_REQUEST):
+        """
+        Birden çok maçı /matches?filter[id]=a,b,c ile toplu çeker (chunk başına
+        tek istek, max 100 id) — get_match_by_id'nin N isteği yerine ~N/100.
+
+        Returns:
+            dict: {match_id: match_dict | None}
+              - match_dict: PandaScore'un döndürdüğü maç
+              - None: chunk başarıyla geldi ama id yanıtta YOK (silinmiş/bulunamadı)
+              İsteği başarısız olan (429/ağ hatası) chunk'ların id'leri sözlükte
+              hiç yer almaz → çağıran bunları "bilinmiyor" sayıp sonraki run'a bırakır.
+        """
+        ids = list(dict.fromkeys(int(mid) for mid in match_ids if mid is not None))
+        chunk_size = max(1, min(int(chunk_size), self.MAX_IDS_PER_REQUEST))
+        url = f"{self.base_url}/matches"
+        result = {}
+
+        for i in range(0, len(ids), chunk_size):
+            chunk = ids[i:i + chunk_size]
+            params = {
+                'per_page': len(chunk),
+                'filter[id]': ','.join(str(mid) for mid in chunk),
+            }
+            try:
+                data = self._request_json_with_backoff(
+                    url, params, f"PandaScore matches by id ({len(chunk)} ids)"
+                )
+            except requests.exceptions.RequestException as e:
+                logger.error(f"❌ get_matches_by_ids chunk failed ({len(chunk)} ids): {e}")
+                continue
+            if data is None:
+                continue
+
+            found = {m.get('id'): m for m in data if isinstance(m, dict)}
+            for mid in chunk:
+                result[mid] = found.get(mid)
+
+        return result
+
     def get_past_matches(self, game_slug, limit=50, page=1):
         """
         Fetch past (finished) matches from PandaScore API
@@ -170,7 +343,6 @@ class PandaScoreClient:
         url = f"{self.base_url}/{game_slug}/matches/past"
         
         params = {
-    'token': self.api_token,
     'per_page': limit,
     'page': page,
     'sort': '-begin_at',
@@ -201,7 +373,6 @@ class PandaScoreClient:
         """
         url = f"{self.base_url}/{game_slug}/tournaments"
         params = {
-            'token': self.api_token,
             'per_page': per_page,
             'page': page,
             'sort': '-begin_at',
@@ -222,7 +393,6 @@ class PandaScoreClient:
         """Bir turnuvanın FINISHED maçlarını (tam obje: opponents+results) çeker."""
         url = f"{self.base_url}/{game_slug}/matches"
         params = {
-            'token': self.api_token,
             'per_page': per_page,
             'page': page,
             'sort': 'begin_at',
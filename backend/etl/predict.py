@@ -7,32 +7,177 @@ fonksiyonla üretilir → iyi kalibre. Margin-of-victory (skor farkı) K faktör
 büyütür (dominant galibiyet daha çok rating hareketi yaratır).
 
 Backtest (walk-forward, ~11.9k maç): genel ~%61, son 30 gün ~%61, kalibrasyon
-güven arttıkça monoton (olasılık ≥%70 → ~%74-82 doğru). Eski win-rate modeli ~%56
-idi ve turnuva-tier terimi her iki takıma eşit eklendiği için tahmini 50/50'ye
-sönümlüyordu (sıfır ayırt edici sinyal).
+güven arttıkça monoton (olasılık ≥%70 → ~%74-82 doğru). Tekrar üretmek / K ve
+MOV ağırlığını taramak için: `python run.py --backtest` (etl/backtest.py). Eski
+win-rate modeli ~%56 idi ve turnuva-tier terimi her iki takıma eşit eklendiği
+için tahmini 50/50'ye sönümlüyordu (sıfır ayırt edici sinyal).
+
+Ratingler team_elo_ratings'te, replay watermark'ı elo_state'te tutulur
+(sql/create_team_elo_ratings.sql): her run yalnızca yeni biten maçları katlar.
+Watermark yalnızca "oturmuş" prefix'e ilerler — henüz bitmemiş en erken maçın
+öncesine; üst üste binen maçlar (BO3 sürerken sonra başlayan BO1 biter) her
+run'da bellekte katlanır, persist edilmez. Watermark öncesine geç gelen /
+düzeltilen sonuçlar matches trigger'ının yazdığı elo_changes günlüğünden
+artımlı tespit edilir (geçmiş taranmaz).
 """
 import logging
 import math
 from typing import Optional
 
+import psycopg
+
 from database import Database
+from etl.schema_migrations import Migration, ensure_migration
 
 logger = logging.getLogger(__name__)
 
 ELO_BASE = 1500.0
 CONFIDENT_PROB = 0.65  # "güvenli tahmin" eşiği (favori olasılığı) — trust signal
+MOV_WEIGHT = 0.5       # margin-of-victory terimi ağırlığı
+
+# Elo replay'ine giren maçlar. scheduled_at NULL olanların kronolojik yeri
+# belirsiz → walk-forward'a alınmaz (watermark (scheduled_at, id) sıralıdır).
+_FINISHED_WHERE = """
+    status = 'finished' AND winner_id IS NOT NULL
+    AND team_a_id IS NOT NULL AND team_b_id IS NOT NULL
+    AND scheduled_at IS NOT NULL
+"""
+# Henüz sonucu gelmemiş maçlar: bitince watermark öncesine düşebilecekleri için
+# watermark'ı en erkeninin öncesinde tutarlar (bkz. _settled_horizon).
+_UNSETTLED_WHERE = """
+    (status IN ('not_started', 'upcoming', 'running')
+     OR (status = 'finished' AND winner_id IS NULL))
+"""
+# Bundan eski bitmemiş maçlar terk edilmiş sayılır (stale 'running' zaten 6 sa
+# sonra kapatılır) — watermark'ı sonsuza dek tutmasınlar; sonradan biterlerse
+# geç sonuç olarak tam rebuild tetiklerler.
+_SETTLE_WINDOW = "48 hours"
+# team_elo_ratings + elo_state (persist=True) — sql/create_team_elo_ratings.sql ile aynı
+_ELO_MIGRATION = Migration("elo_state", 2, (
+    """
+    CREATE TABLE IF NOT EXISTS public.team_elo_ratings (
+        model_key         text             NOT NULL,
+        team_id           bigint           NOT NULL,
+        rating            double precision NOT NULL,
+        games             integer          NOT NULL DEFAULT 0,
+        last_match_id     bigint,
+        last_scheduled_at timestamptz,
+        updated_at        timestamptz      NOT NULL DEFAULT now(),
+        PRIMARY KEY (model_key, team_id)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS public.elo_state (
+        model_key     text        PRIMARY KEY,
+        watermark_at  timestamptz,
+        watermark_id  bigint,
+        rebuilt_at    timestamptz,
+        updated_at    timestamptz NOT NULL DEFAULT now()
+    )
+    """,
+    # v1'in prefix parmak izi — değişiklik tespiti artık elo_changes'te
+    """
+    ALTER TABLE public.elo_state
+        DROP COLUMN IF EXISTS match_count,
+        DROP COLUMN IF EXISTS hash_sum
+    """,
+))
+# Geç gelen / düzeltilen sonuç tespiti (v2): matches'teki her Elo-ilgili
+# değişiklik (bitmiş satır INSERT/DELETE, sonuç/sıra alanı UPDATE) trigger ile
+# elo_changes'e (yazan transaction'ın xid'i + maç konumu) düşer. Replay aldığı
+# pg_snapshot'ı elo_state.snapshot'a yazar; sonraki run yalnızca o snapshot'ta
+# GÖRÜNMEYEN ve watermark'tan önceki kayıtlara bakar → O(yeni değişiklik).
+# Günlük 7 gün tutulur; daha eski state tam rebuild edilir.
+_ELO_CHANGES_MIGRATION = Migration("elo_changes", 1, (
+    """
+    CREATE TABLE IF NOT EXISTS public.elo_changes (
+        xid           xid8        NOT NULL DEFAULT pg_current_xact_id(),
+        match_id      bigint      NOT NULL,
+        scheduled_at  timestamptz NOT NULL,
+        changed_at    timestamptz NOT NULL DEFAULT now()
+    )
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS idx_elo_changes_xid ON public.elo_changes (xid)
+    """,
+    """
+    ALTER TABLE public.elo_state ADD COLUMN IF NOT EXISTS snapshot pg_snapshot
+    """,
+    """
+    CREATE OR REPLACE FUNCTION public.log_elo_change() RETURNS trigger
+    LANGUAGE plpgsql AS $$
+    BEGIN
+        IF TG_OP <> 'INSERT' AND OLD.scheduled_at IS NOT NULL THEN
+            INSERT INTO public.elo_changes (match_id, scheduled_at) VALUES (OLD.id, OLD.scheduled_at);
+        END IF;
+        IF TG_OP <> 'DELETE' AND NEW.scheduled_at IS NOT NULL
+           AND (TG_OP = 'INSERT' OR NEW.scheduled_at IS DISTINCT FROM OLD.scheduled_at) THEN
+            INSERT INTO public.elo_changes (match_id, scheduled_at) VALUES (NEW.id, NEW.scheduled_at);
+        END IF;
+        RETURN NULL;
+    END
+    $$
+    """,
+    "DROP TRIGGER IF EXISTS trg_elo_change_ins ON public.matches",
+    """
+    CREATE TRIGGER trg_elo_change_ins AFTER INSERT ON public.matches
+    FOR EACH ROW WHEN (NEW.status = 'finished')
+    EXECUTE FUNCTION public.log_elo_change()
+    """,
+    "DROP TRIGGER IF EXISTS trg_elo_change_upd ON public.matches",
+    """
+    CREATE TRIGGER trg_elo_change_upd AFTER UPDATE ON public.matches
+    FOR EACH ROW WHEN (
+        (OLD.status = 'finished' OR NEW.status = 'finished')
+        AND (OLD.status, OLD.winner_id, OLD.team_a_id, OLD.team_b_id,
+             OLD.team_a_score, OLD.team_b_score, OLD.scheduled_at)
+            IS DISTINCT FROM
+            (NEW.status, NEW.winner_id, NEW.team_a_id, NEW.team_b_id,
+             NEW.team_a_score, NEW.team_b_score, NEW.scheduled_at)
+    )
+    EXECUTE FUNCTION public.log_elo_change()
+    """,
+    "DROP TRIGGER IF EXISTS trg_elo_change_del ON public.matches",
+    """
+    CREATE TRIGGER trg_elo_change_del AFTER DELETE ON public.matches
+    FOR EACH ROW WHEN (OLD.status = 'finished')
+    EXECUTE FUNCTION public.log_elo_change()
+    """,
+))
+_CHANGELOG_RETENTION = "7 days"
 
 
 class MatchPredictor:
     """Elo rating tabanlı maç sonucu tahmini."""
 
-    def __init__(self, k_factor: float = 32.0, base: float = ELO_BASE, use_mov: bool = True):
+    def __init__(self, k_factor: float = 32.0, base: float = ELO_BASE, use_mov: bool = True,
+                 persist: bool = True, mov_weight: float = MOV_WEIGHT):
         self.K = k_factor
         self.base = base
         self.use_mov = use_mov
+        self.mov_weight = mov_weight   # K * (1 + ln(margin+1) * mov_weight) — bkz. etl/backtest.py
+        # persist=True: ratingler team_elo_ratings'e, watermark elo_state'e yazılır;
+        # sonraki run'lar yalnızca watermark'tan sonra biten maçları katlar.
+        # State okunamazsa yalnızca o çağrı in-memory replay'e düşer (bkz. _replay).
+        self.persist = persist
         self._ratings: Optional[dict] = None   # team_id -> Elo (lazy, in-memory)
         self._games: dict = {}                 # team_id -> oynanan maç sayısı
 
+    @property
+    def model_key(self) -> str:
+        """Persist edilen state'in anahtarı — parametre değişirse ayrı (yeniden kurulan) state."""
+        mov = self.mov_weight if self.use_mov else 0
+        return f"k={self.K:g}|base={self.base:g}|mov={mov:g}"
+
+    @property
+    def walk_forward_key(self) -> str:
+        """
+        predict_finished_matches'in AYRI state'i: build_elo_ratings (saatlik
+        --predict, live daemon) ana watermark'ı ilerletse de walk-forward
+        tahmini henüz yazılmamış maçlar bu watermark'ın ardında kalır.
+        """
+        return f"{self.model_key}|walk-forward"
+
     # ── Elo çekirdeği ─────────────────────────────────────────────────────────
     @staticmethod
     def _expected(r_a: float, r_b: float) -> float:
@@ -44,45 +189,262 @@ class MatchPredictor:
         if not self.use_mov:
             return self.K
         margin = abs((score_a or 0) - (score_b or 0))
-        return self.K * (1 + math.log(margin + 1) * 0.5) if margin >= 1 else self.K
+        return self.K * (1 + math.log(margin + 1) * self.mov_weight) if margin >= 1 else self.K
 
     @staticmethod
-    def _fetch_finished_ordered(cur) -> list:
+    def _fetch_finished_ordered(cur, after: Optional[tuple] = None) -> list:
+        """
+        Bitmiş maçlar kronolojik: (id, a, b, winner, score_a, score_b, scheduled_at).
+        after=(scheduled_at, id) → yalnızca watermark'tan SONRAKİ maçlar.
+        """
+        where = _FINISHED_WHERE
+        params: tuple = ()
+        if after is not None:
+            where += " AND (scheduled_at, id) > (%s, %s)"
+            params = after
         cur.execute(
-            """
+            f"""
             SELECT id, team_a_id, team_b_id, winner_id,
-                   COALESCE(team_a_score, 0), COALESCE(team_b_score, 0)
+                   COALESCE(team_a_score, 0), COALESCE(team_b_score, 0),
+                   scheduled_at
             FROM matches
-            WHERE status = 'finished' AND winner_id IS NOT NULL
-              AND team_a_id IS NOT NULL AND team_b_id IS NOT NULL
+            WHERE {where}
             ORDER BY scheduled_at ASC, id ASC
-            """
+            """,
+            params,
         )
         return cur.fetchall()
 
-    def build_elo_ratings(self) -> dict:
+    def _fold(self, rows, ratings: dict, games: dict, last: Optional[dict] = None,
+              pre_match: Optional[list] = None) -> None:
+        """
+        Maçları sırayla Elo'ya katlar (in-place). last: team_id → (match_id,
+        scheduled_at); pre_match: (maç ÖNCESİ beklenti, match_id) listesi.
+        """
+        for _id, a, b, w, sa, sb, *rest in rows:
+            ra = ratings.get(a, self.base)
+            rb = ratings.get(b, self.base)
+            ea = self._expected(ra, rb)          # maç ÖNCESİ beklenti
+            if pre_match is not None:
+                pre_match.append((ea, _id))
+            # gerçek sonuçla rating güncelle
+            s_a = 1.0 if w == a else 0.0
+            k = self._k(sa, sb)
+            ratings[a] = ra + k * (s_a - ea)
+            ratings[b] = rb + k * ((1 - s_a) - (1 - ea))
+            games[a] = games.get(a, 0) + 1
+            games[b] = games.get(b, 0) + 1
+            if last is not None:
+                scheduled_at = rest[0] if rest else None
+                last[a] = last[b] = (_id, scheduled_at)
+
+    # ── Persist edilen state (team_elo_ratings + elo_state watermark) ─────────
+    @staticmethod
+    def _ensure_elo_schema(cur) -> None:
+        ensure_migration(_ELO_MIGRATION, cur)
+        ensure_migration(_ELO_CHANGES_MIGRATION, cur)
+
+    @staticmethod
+    def _load_state(cur, key: str) -> Optional[dict]:
+        cur.execute(
+            "SELECT watermark_at, watermark_id FROM elo_state WHERE model_key = %s",
+            (key,),
+        )
+        row = cur.fetchone()
+        if not row:
+            return None
+        return {'watermark_at': row[0], 'watermark_id': row[1]}
+
+    @staticmethod
+    def _settled_horizon(cur):
+        """
+        Henüz bitmemiş (son _SETTLE_WINDOW içindeki) en erken maçın scheduled_at'i.
+        Bundan önce planlanmış bitmiş maçlar oturmuştur: sonradan araya maç
+        giremez → watermark buraya kadar ilerleyebilir. None → sınır yok.
+        """
+        cur.execute(
+            f"""
+            SELECT min(scheduled_at) FROM matches
+            WHERE {_UNSETTLED_WHERE}
+              AND scheduled_at > now() - INTERVAL '{_SETTLE_WINDOW}'
+            """
+        )
+        return cur.fetchone()[0]
+
+    @staticmethod
+    def _prefix_intact(cur, key: str) -> bool:
+        """
+        Watermark öncesi geçmiş replay edildiğinden beri değişti mi (geç gelen/düzeltilen sonuç)?
+
+        Yalnızca son replay'in snapshot'ında görünmeyen elo_changes kayıtlarına
+        bakılır (xid index'i, O(yeni değişiklik)). Snapshot yoksa (eski state)
+        ya da günlüğün saklama süresinden eskiyse → bozuk say (tam rebuild).
+        """
+        cur.execute(
+            f"""
+            SELECT s.snapshot IS NOT NULL
+               AND s.updated_at > now() - INTERVAL '{_CHANGELOG_RETENTION}'
+               AND NOT EXISTS (
+                   SELECT 1 FROM elo_changes c
+                    WHERE c.xid >= pg_snapshot_xmin(s.snapshot)
+                      AND NOT pg_visible_in_snapshot(c.xid, s.snapshot)
+                      AND (c.scheduled_at, c.match_id) <= (s.watermark_at, s.watermark_id)
+               )
+            FROM elo_state s
+            WHERE s.model_key = %s
+            """,
+            (key,),
+        )
+        row = cur.fetchone()
+        return bool(row and row[0])
+
+    @staticmethod
+    def _load_ratings(cur, key: str) -> tuple:
+        cur.execute(
+            "SELECT team_id, rating, games FROM team_elo_ratings WHERE model_key = %s",
+            (key,),
+        )
+        ratings, games = {}, {}
+        for team_id, rating, n in cur.fetchall():
+            ratings[team_id] = rating
+            games[team_id] = n
+        return ratings, games
+
+    def _save_state(self, cur, key: str, snapshot: str, ratings: dict, games: dict,
+                    last: dict, rows: list, prev: Optional[dict] = None) -> None:
+        """
+        prev=None → tam rebuild: key'in tüm ratingleri yeniden yazılır.
+        prev verilirse yalnızca bu run'da maç oynayan takımlar upsert edilir.
+        rows: bu run'da katlanan OTURMUŞ maçlar (watermark sonuncusuna ilerler).
+        snapshot: replay'in okuduğu görüntü — sonraki _prefix_intact buna göre bakar.
+        """
+        if prev is None:
+            cur.execute("DELETE FROM team_elo_ratings WHERE model_key = %s", (key,))
+            teams = ratings.keys()
+        else:
+            teams = last.keys()
+        cur.executemany(
+            """
+            INSERT INTO team_elo_ratings
+                (model_key, team_id, rating, games, last_match_id, last_scheduled_at, updated_at)
+            VALUES (%s, %s, %s, %s, %s, %s, now())
+            ON CONFLICT (model_key, team_id) DO UPDATE SET
+                rating            = EXCLUDED.rating,
+                games             = EXCLUDED.games,
+                last_match_id     = EXCLUDED.last_match_id,
+                last_scheduled_at = EXCLUDED.last_scheduled_at,
+                updated_at        = now()
+            """,
+            [
+                (key, t, ratings[t], games.get(t, 0), *last.get(t, (None, None)))
+                for t in teams
+            ],
+        )
+
+        if rows:
+            watermark_at, watermark_id = rows[-1][6], rows[-1][0]
+        elif prev is not None:
+            watermark_at, watermark_id = prev['watermark_at'], prev['watermark_id']
+        else:
+            watermark_at, watermark_id = None, None
+        cur.execute(
+            """
+            INSERT INTO elo_state
+                (model_key, watermark_at, watermark_id, snapshot, rebuilt_at, updated_at)
+            VALUES (%s, %s, %s, %s::pg_snapshot, CASE WHEN %s THEN now() END, now())
+            ON CONFLICT (model_key) DO UPDATE SET
+                watermark_at = EXCLUDED.watermark_at,
+                watermark_id = EXCLUDED.watermark_id,
+                snapshot     = EXCLUDED.snapshot,
+                rebuilt_at   = COALESCE(EXCLUDED.rebuilt_at, elo_state.rebuilt_at),
+                updated_at   = now()
+            """,
+            (key, watermark_at, watermark_id, snapshot, prev is None),
+        )
+        cur.execute(
+            f"DELETE FROM elo_changes WHERE changed_at < now() - INTERVAL '{_CHANGELOG_RETENTION}'"
+        )
+
+    def _replay(self, cur, full: bool = False, pre_match: Optional[list] = None,
+                key: Optional[str] = None) -> tuple:
         """
-        Tüm bitmiş maçları kronolojik replay ederek GÜNCEL Elo ratinglerini kurar.
-        Upcoming tahminleri için doğru: tüm bitmiş maçlar upcoming'den önce olduğu
-        için lookahead yok. ~12k maç < 1 sn.
+        Persist edilmiş state'ten devam ederek Elo'yu günceller → (ratings, games, rows, mode).
+
+        Incremental: ratingler team_elo_ratings'ten yüklenir, yalnızca watermark'tan
+        (scheduled_at, id) SONRA biten maçlar katlanır. Watermark öncesine geç gelen
+        ya da düzeltilen sonuç varsa (elo_changes, bkz. _prefix_intact), state yoksa
+        ya da full=True ise tüm geçmiş yeniden replay edilir. rows = bu çağrıda
+        katlanan maçlar. key: state anahtarı (varsayılan model_key).
+
+        Yalnızca _settled_horizon öncesi maçlar persist edilir; sonrası (bitmemiş
+        bir maçtan sonra planlanıp bitmiş olanlar) her çağrıda bellekte üstüne
+        katlanır. Böylece geç biten bir BO3 watermark öncesine düşmez → tam
+        rebuild yalnızca gerçek düzeltmelerde olur.
+
+        Aynı key için eşzamanlı replay'ler (live daemon + saatlik --predict, devir
+        sırasında iki daemon) advisory lock ile sıralanır → watermark geri gitmez,
+        aynı maç iki kez katlanmaz.
         """
+        key = key or self.model_key
+        persist = self.persist
+        state = None
+        snapshot = None
+        horizon = None
+        if persist:
+            try:
+                self._ensure_elo_schema(cur)
+                cur.execute("SELECT pg_advisory_xact_lock(hashtext(%s))", (f"elo_state:{key}",))
+                # Snapshot, değişiklik kontrolünden ve maç okumasından ÖNCE alınır:
+                # arada commit edilen değişiklik ya burada görülür ya da sonraki run'da.
+                cur.execute("SELECT pg_current_snapshot()::text")
+                (snapshot,) = cur.fetchone()
+                state = None if full else self._load_state(cur, key)
+                if state is not None and not self._prefix_intact(cur, key):
+                    logger.info("♻️  Watermark öncesinde geç gelen/düzeltilen sonuç var → tam Elo rebuild")
+                    state = None
+                horizon = self._settled_horizon(cur)
+            except psycopg.Error as e:
+                # Tablo oluşturulamıyor (yetki, geçici hata) → bu çağrı için eski
+                # davranış: in-memory tam replay. Sonraki çağrı yeniden dener.
+                logger.warning(f"⚠️  Elo state okunamadı, in-memory replay: {e}")
+                cur.connection.rollback()
+                persist = False
+                state = None
+
         ratings: dict = {}
         games: dict = {}
+        last: dict = {}
+        if state is not None:
+            ratings, games = self._load_ratings(cur, key)
+            after = (state['watermark_at'], state['watermark_id']) if state['watermark_at'] else None
+            rows = self._fetch_finished_ordered(cur, after=after)
+        else:
+            rows = self._fetch_finished_ordered(cur)
+        settled = rows
+        if horizon is not None:
+            settled = [r for r in rows if r[6] < horizon]
+        self._fold(settled, ratings, games, last, pre_match)
+
+        if persist:
+            self._save_state(cur, key, snapshot, ratings, games, last, settled, prev=state)
+        # Oturmamış kuyruk: persist edilen state'e değil, yalnızca bu çağrının sonucuna
+        self._fold(rows[len(settled):], ratings, games, pre_match=pre_match)
+        return ratings, games, rows, ("incremental" if state is not None else "full")
+
+    def build_elo_ratings(self, full: bool = False) -> dict:
+        """
+        GÜNCEL Elo ratinglerini kurar. Upcoming tahminleri için doğru: tüm bitmiş
+        maçlar upcoming'den önce olduğu için lookahead yok. persist=True iken
+        yalnızca son run'dan beri biten maçlar katlanır (bkz. _replay) → süre
+        geçmişin boyuyla değil, yeni maç sayısıyla ölçeklenir.
+        """
         with Database.get_connection() as conn:
             with conn.cursor() as cur:
-                for _id, a, b, w, sa, sb in self._fetch_finished_ordered(cur):
-                    ra = ratings.get(a, self.base)
-                    rb = ratings.get(b, self.base)
-                    ea = self._expected(ra, rb)
-                    s_a = 1.0 if w == a else 0.0
-                    k = self._k(sa, sb)
-                    ratings[a] = ra + k * (s_a - ea)
-                    ratings[b] = rb + k * ((1 - s_a) - (1 - ea))
-                    games[a] = games.get(a, 0) + 1
-                    games[b] = games.get(b, 0) + 1
+                ratings, games, rows, mode = self._replay(cur, full=full)
+                conn.commit()
         self._ratings = ratings
         self._games = games
-        logger.info(f"📊 Elo ratingleri kuruldu: {len(ratings)} takım")
+        logger.info(f"📊 Elo ratingleri kuruldu ({mode}): {len(ratings)} takım, {len(rows)} maç katlandı")
         return ratings
 
     def _ensure_ratings(self) -> None:
@@ -157,32 +519,24 @@ class MatchPredictor:
         logger.info(f"✅ {len(predictions)} yaklaşan maç tahmini güncellendi")
         return predictions
 
-    def predict_finished_matches(self, limit: Optional[int] = None) -> list:
+    def predict_finished_matches(self, limit: Optional[int] = None, full: bool = False) -> list:
         """
         WALK-FORWARD backfill: her bitmiş maça, o maçtan ÖNCEki Elo ratingleriyle
         tahmin yazar → DÜRÜST out-of-sample tahmin (accuracy metriği anlamlı olur).
-        Eski (kötü model) tahminlerin üzerine yazar. limit=None → tüm geçmiş.
+
+        Incremental (varsayılan): kendi watermark'ından (walk_forward_key) sonra
+        biten maçlar katlanır ve onlara tahmin yazılır; öncekiler önceki
+        predict_finished_matches run'larında yazılmıştır (oturmamış kuyruk her
+        run'da yeniden yazılır). Tahminler state ile aynı transaction'da yazılır. full=True (ya da state yok/bozuk) → tüm
+        geçmiş replay edilir ve eski tahminlerin üzerine yazılır. limit → son N maç.
         """
-        ratings: dict = {}
-        games: dict = {}
-        updates = []
+        pre_match: list = []
         with Database.get_connection() as conn:
             with conn.cursor() as cur:
-                rows = self._fetch_finished_ordered(cur)
-                for _id, a, b, w, sa, sb in rows:
-                    ra = ratings.get(a, self.base)
-                    rb = ratings.get(b, self.base)
-                    ea = self._expected(ra, rb)          # maç ÖNCESİ beklenti
-                    prob_a = ea
-                    prob_b = 1.0 - prob_a
-                    updates.append((prob_a, prob_b, abs(prob_a - prob_b), _id))
-                    # gerçek sonuçla rating güncelle
-                    s_a = 1.0 if w == a else 0.0
-                    k = self._k(sa, sb)
-                    ratings[a] = ra + k * (s_a - ea)
-                    ratings[b] = rb + k * ((1 - s_a) - (1 - ea))
-                    games[a] = games.get(a, 0) + 1
-                    games[b] = games.get(b, 0) + 1
+                ratings, games, rows, mode = self._replay(
+                    cur, full=full, pre_match=pre_match, key=self.walk_forward_key,
+                )
+                updates = [(ea, 1.0 - ea, abs(2 * ea - 1.0), _id) for ea, _id in pre_match]
                 if limit:
                     updates = updates[-limit:]
                 cur.executemany(
@@ -191,7 +545,7 @@ class MatchPredictor:
                 )
                 conn.commit()
         self._ratings, self._games = ratings, games
-        logger.info(f"✅ {len(updates)} bitmiş maça walk-forward tahmin yazıldı (out-of-sample)")
+        logger.info(f"✅ {len(updates)} bitmiş maça walk-forward tahmin yazıldı (out-of-sample, {mode})")
         return updates
 
     # ── Başarı ölçümü ─────────────────────────────────────────────────────────
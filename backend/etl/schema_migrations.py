@@ -0,0 +1,144 @@
+"""
+Hafif şema migration kaydı — ad-hoc ensure_schema DDL'i yalnızca gerektiğinde.
+
+PlayerStatsSyncer.ensure_schema() her --live (5 dk'da bir), --stats, --players
+ve flush run'ında ALTER TABLE ... ADD COLUMN IF NOT EXISTS / CREATE INDEX IF
+NOT EXISTS çalıştırıyordu: "IF NOT EXISTS" olsa da her ifade sıcak tabloda
+kilit + katalog turu demek. Diğer job'lar da (Liquipedia metadata, Elo state,
+hybrid stats attempts, LLM önbelleği) kendi DDL'lerini her çağrıda koşuyordu.
+
+Burada her DDL grubu bir Migration (ad, versiyon, ifadeler). public.schema_migrations
+her ad için uygulanan versiyon + checksum'ı tutar:
+
+  • süreç başına TEK SELECT ile tüm kayıtlar okunur, sonra bellekte
+  • kayıt güncelse (aynı versiyon + checksum, ya da daha yeni versiyon) DDL yok
+  • gerideyse: ad başına advisory lock → yeniden kontrol → ifadeler + kayıt
+    upsert aynı transaction'da (paralel süreçler aynı DDL'i iki kez koşmaz)
+
+Kayıt her zaman AYRI bir bağlantıdan (commit edilmiş görüntü) okunur ve belleğe
+yalnızca commit edilmiş durum alınır. Çağıranın cursor'ıyla uygulanan DDL
+belleğe yazılmaz: çağıran rollback ederse (ör. predict._replay hata yolu)
+sonraki çağrı kaydı yeniden okur ve DDL'i tekrar uygular; commit ederse
+sonraki çağrı bunu tek SELECT ile görür ve belleğe alır.
+
+Checksum boşluk-duyarsız sha256'dır; ifade değişip versiyon artırılmazsa da
+yeniden uygulanır (tüm ifadeler idempotent yazılmalı: IF NOT EXISTS / OR REPLACE).
+Elle çalıştırılan sql/*.sql dosyaları (CONCURRENTLY index'ler) bu kaydın dışındadır.
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+import psycopg
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Migration:
+    """Tek DDL grubu: ad başına artan versiyon + idempotent ifadeler."""
+    name: str
+    version: int
+    statements: Tuple[str, ...]
+
+    @property
+    def checksum(self) -> str:
+        normalized = "\n".join(" ".join(stmt.split()) for stmt in self.statements)
+        return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+_recorded: Optional[Dict[str, Tuple[int, str]]] = None   # ad → (versiyon, checksum)
+_lock = threading.Lock()
+
+
+def _is_current(row: Optional[Tuple[int, str]], migration: Migration) -> bool:
+    if row is None:
+        return False
+    version, checksum = row
+    # Daha yeni kod zaten uygulamış → eski sürüm geri almaya çalışmaz
+    return version > migration.version or (version == migration.version and checksum == migration.checksum)
+
+
+def _refresh_recorded() -> Dict[str, Tuple[int, str]]:
+    """
+    Commit edilmiş schema_migrations kayıtlarını kendi bağlantısında okur
+    (tablo yoksa oluşturup commit eder). Çağıranın açık transaction'ındaki
+    henüz commit edilmemiş kayıtlar burada görünmez.
+    """
+    global _recorded
+    from database import Database
+    with Database.get_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute("SAVEPOINT sp_schema_migrations")
+            try:
+                cur.execute("SELECT name, version, checksum FROM public.schema_migrations")
+                rows = cur.fetchall()
+            except psycopg.errors.UndefinedTable:
+                cur.execute("ROLLBACK TO SAVEPOINT sp_schema_migrations")
+                cur.execute("""
+                    CREATE TABLE IF NOT EXISTS public.schema_migrations (
+                        name        text        PRIMARY KEY,
+                        version     integer     NOT NULL,
+                        checksum    text        NOT NULL,
+                        applied_at  timestamptz NOT NULL DEFAULT now()
+                    )
+                """)
+                rows = []
+            cur.execute("RELEASE SAVEPOINT sp_schema_migrations")
+    _recorded = {name: (version, checksum) for name, version, checksum in rows}
+    return _recorded
+
+
+def ensure_migration(migration: Migration, cur=None) -> bool:
+    """
+    Migration gerideyse uygular. True → DDL bu çağrıda koştu, False → güncel.
+
+    Bellekte güncel değilse kayıt ayrı bağlantıdan yeniden okunur (tek SELECT).
+    cur verilirse DDL çağıranın transaction'ında çalışır (hata/rollback
+    çağıranda) ve commit edilip edilmeyeceği bilinmediği için belleğe
+    alınmaz; verilmezse kendi bağlantısında, commit'ten sonra belleğe alınır.
+    Hata psycopg.Error olarak yükselir.
+    """
+    global _recorded
+    with _lock:
+        if _recorded is not None and _is_current(_recorded.get(migration.name), migration):
+            return False
+        try:
+            if _is_current(_refresh_recorded().get(migration.name), migration):
+                return False
+            if cur is not None:
+                return _apply(migration, cur)
+            from database import Database
+            with Database.get_connection() as conn:
+                with conn.cursor() as own_cur:
+                    applied = _apply(migration, own_cur)
+            _recorded[migration.name] = (migration.version, migration.checksum)
+            return applied
+        except psycopg.Error:
+            _recorded = None
+            raise
+
+
+def _apply(migration: Migration, cur) -> bool:
+    cur.execute("SELECT pg_advisory_xact_lock(hashtext(%s))", (f"schema_migrations:{migration.name}",))
+    cur.execute("SELECT version, checksum FROM public.schema_migrations WHERE name = %s", (migration.name,))
+    if _is_current(cur.fetchone(), migration):
+        return False
+
+    for statement in migration.statements:
+        cur.execute(statement)
+    cur.execute(
+        """
+        INSERT INTO public.schema_migrations (name, version, checksum)
+        VALUES (%s, %s, %s)
+        ON CONFLICT (name) DO UPDATE
+           SET version = EXCLUDED.version, checksum = EXCLUDED.checksum, applied_at = now()
+        """,
+        (migration.name, migration.version, migration.checksum),
+    )
+    logger.info("🛠️  Şema migration uygulandı: %s v%d", migration.name, migration.version)
+    return True
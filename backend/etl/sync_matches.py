@@ -1,13 +1,17 @@
 """
 Sync match data to Supabase database
 """
+from config import Config
 from database import Database
 from etl.pandascore_client import PandaScoreClient
 from etl.data_cleaner       import DataCleaner
 from etl.adapters import MultiSourceDataAggregator, RiotAdapter, SteamAdapter
 import psycopg
+import hashlib
 import json
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import timezone, datetime
 import logging
 
@@ -40,6 +44,45 @@ class MatchSyncer:
             RiotAdapter(),
             SteamAdapter(),
         ])
+        # Son _upsert_matches çağrısının sonuçları thread başına tutulur: oyunlar
+        # map_games ile eşzamanlı sync edilirken sayaçlar birbirini ezmez.
+        self._last = threading.local()
+
+    @property
+    def last_rejects(self):
+        """Son _upsert_matches çağrısında yazılamayan maçlar: [{'id', 'error'}]"""
+        return getattr(self._last, 'rejects', [])
+
+    @last_rejects.setter
+    def last_rejects(self, value):
+        self._last.rejects = value
+
+    @property
+    def last_upsert_stats(self):
+        """Son _upsert_matches çağrısının değişiklik sayaçları (bkz. _content_hash)"""
+        return getattr(self._last, 'upsert_stats', {'new': 0, 'changed': 0, 'unchanged': 0})
+
+    @last_upsert_stats.setter
+    def last_upsert_stats(self, value):
+        self._last.upsert_stats = value
+
+    def map_games(self, fn, games, workers=None):
+        """
+        fn(game)'i her oyun için sınırlı bir thread havuzunda çalıştırır;
+        sonuçlar games sırasıyla döner.
+
+        Oyun pipeline'ları (fetch → enrich → clean → upsert) birbirinden
+        bağımsızdır. PandaScore session + limiter'ı ve DB havuzu süreç genelinde
+        paylaşıldığı için kota ve bağlantı sınırı korunur; duvar saati oyunların
+        toplamı yerine en yavaş oyuna iner. Bir oyun hata fırlatırsa diğerleri
+        yine tamamlanır, hata çağırana yükselir.
+        """
+        games = list(games)
+        workers = min(int(workers or Config.SYNC_GAME_WORKERS), len(games))
+        if workers <= 1:
+            return [fn(game) for game in games]
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="game-sync") as pool:
+            return list(pool.map(fn, games))
 
     def sync_running_matches(self, game_slug, limit=50):
         """Fetch /running endpoint and upsert. Orphan resolution caller tarafından
@@ -57,11 +100,17 @@ class MatchSyncer:
             cleaned_count = len(cleaned)
             if cleaned:
                 synced = self._upsert_matches(cleaned)
-                logger.info(f"✅ Live sync: {synced}/{cleaned_count} upserted for {game_slug}")
+                logger.info(
+                    f"✅ Live sync: {synced}/{cleaned_count} upserted for {game_slug} "
+                    f"({self._format_upsert_stats()})"
+                )
         else:
             logger.info(f"   No running matches for {game_slug}")
 
-        return {'fetched': fetched, 'cleaned': cleaned_count, 'synced': synced, 'live_ids': live_ids}
+        result = {'fetched': fetched, 'cleaned': cleaned_count, 'synced': synced, 'live_ids': live_ids}
+        if synced:
+            result.update(self.last_upsert_stats)
+        return result
 
     def resolve_orphans(self, live_ids: set, cap: int = 40) -> int:
         """
@@ -73,11 +122,12 @@ class MatchSyncer:
         tutarsız olabildiği için global karşılaştırma yapılır.
 
         live_ids: tüm oyunların /running'inden gelen ID birleşimi (boş set =
-        tüm running maçları PandaScore'a karşı yeniden doğrula). get_match_by_id
+        tüm running maçları PandaScore'a karşı yeniden doğrula). PandaScore
         gerçek status döndürdüğü için boş set bile güvenlidir (gerçekten canlı
         maçlar 'running' kalır).
 
-        cap: tek çağrıda max API isteği (rate-limit koruması).
+        cap: tek çağrıda işlenecek max orphan maç. Maçlar get_matches_by_ids ile
+        100'lük chunk'lar halinde çekilir (cap=500 → 5 istek).
         """
         try:
             with Database.get_connection() as conn:
@@ -98,15 +148,20 @@ class MatchSyncer:
 
         logger.info(f"🔍 {len(orphaned)} orphan running match — fetching final status (cap={cap})...")
 
-        resolved = []
-        for match_id in orphaned[:cap]:
-            raw = self.client.get_match_by_id(match_id)
-            if raw and isinstance(raw, dict):
-                cleaned = self.cleaner.clean_matches([raw])
-                if cleaned:
-                    resolved.extend(cleaned)
-                    continue
-            self._force_finish_match(match_id)
+        batch = orphaned[:cap]
+        fetched = self.client.get_matches_by_ids(batch)
+        raws = [raw for raw in fetched.values() if raw]
+        resolved = self.cleaner.clean_matches(raws) if raws else []
+        resolved_ids = {m['id'] for m in resolved}
+
+        # Yanıtta olmayan (ya da temizlenemeyen) maçlar force-finish edilir.
+        # İsteği başarısız olan chunk'lar (fetched'da yok) bir sonraki run'a kalır.
+        for match_id in batch:
+            if match_id in fetched and match_id not in resolved_ids:
+                self._force_finish_match(match_id)
+        unknown = sum(1 for match_id in batch if match_id not in fetched)
+        if unknown:
+            logger.warning(f"⚠️  {unknown} orphan match(es) could not be fetched — retrying next run")
 
         count = self._upsert_matches(resolved) if resolved else 0
         logger.info(f"✅ Resolved {count} finished match(es) — status+score updated from PandaScore")
@@ -118,8 +173,8 @@ class MatchSyncer:
         gerçek status'leriyle günceller (bitmiş/canceled/postponed). Turnuva
         sayfalarındaki 'oynanmamış hayalet' maçları temizler.
 
-        get_match_by_id gerçek status döndürür — hâlâ planlıysa not_started kalır
-        (güvenli), bittiyse finished+skor, iptal/ertelendiyse ilgili status.
+        get_matches_by_ids gerçek status döndürür — hâlâ planlıysa not_started
+        kalır (güvenli), bittiyse finished+skor, iptal/ertelendiyse ilgili status.
 
         bulk=True: TÜM stale maçları tek geçişte (her biri bir kez) işler; aksi
         halde en eski `cap` maçı işler (cron için).
@@ -151,18 +206,17 @@ class MatchSyncer:
 
         logger.info(f"🔍 {len(ids)} stale not_started match — fetching real status...")
         count = 0
-        # Her maç TEK kez işlenir; 40'lık batch'lerle upsert (bellek + ilerleme)
-        for i in range(0, len(ids), 40):
-            batch = ids[i:i + 40]
-            resolved = []
-            for match_id in batch:
-                raw = self.client.get_match_by_id(match_id)
-                if raw and isinstance(raw, dict):
-                    cleaned = self.cleaner.clean_matches([raw])
-                    if cleaned:
-                        resolved.extend(cleaned)
+        # Her maç TEK kez işlenir; 500'lük dilimlerle (5 API isteği + tek bulk
+        # upsert) → bellek sınırlı, ilerleme loglanır.
+        for i in range(0, len(ids), 500):
+            batch = ids[i:i + 500]
+            fetched = self.client.get_matches_by_ids(batch)
+            raws = [raw for raw in fetched.values() if raw]
+            resolved = self.cleaner.clean_matches(raws) if raws else []
             if resolved:
                 count += self._upsert_matches(resolved)
+            if len(ids) > 500:
+                logger.info(f"   {min(i + 500, len(ids))}/{len(ids)} stale match işlendi")
         logger.info(f"✅ Resolved {count} stale not_started match(es) from PandaScore")
         return count
 
@@ -173,7 +227,8 @@ class MatchSyncer:
                 with conn.cursor() as cur:
                     cur.execute(
                         """
-                        UPDATE matches SET status = 'finished', updated_at = CURRENT_TIMESTAMP
+                        UPDATE matches SET status = 'finished', content_hash = NULL,
+                                           updated_at = CURRENT_TIMESTAMP
                         WHERE id = %s AND status = 'running'
                         """,
                         (match_id,),
@@ -198,14 +253,14 @@ class MatchSyncer:
         logger.info(f"\n🎮 Syncing {game_slug.upper()} {'past' if past else 'upcoming'} matches...")
         
         # Fetch matches from API
-        logger.info("📥 Fetching from PandaScore API...")
+        logger.info(f"📥 Fetching {game_slug} from PandaScore API...")
         if past:
             raw_matches = self.client.get_past_matches(game_slug, limit, page)
         else:
             raw_matches = self.client.get_upcoming_matches(game_slug, limit, days_ahead=upcoming_days)
         
         if not raw_matches:
-            logger.error("❌ No matches fetched from API")
+            logger.error(f"❌ No {game_slug} matches fetched from API")
             return {'fetched': 0, 'cleaned': 0, 'synced': 0}
 
         # Enrich PandaScore raw rows with optional Riot/Steam foundations.
@@ -215,26 +270,36 @@ class MatchSyncer:
             logger.warning(f"⚠️  Multi-source enrichment skipped due to error: {agg_err}")
         
         # Clean data
-        logger.info("🧹 Cleaning data...")
+        logger.info(f"🧹 Cleaning {game_slug} data...")
         cleaned_matches = self.cleaner.clean_matches(raw_matches)
         
         if not cleaned_matches:
-            logger.error("❌ No valid matches after cleaning")
+            logger.error(f"❌ No valid {game_slug} matches after cleaning")
             return {'fetched': len(raw_matches), 'cleaned': 0, 'synced': 0}
         
         # Sync to database
-        logger.info("💾 Syncing to database...")
+        logger.info(f"💾 Syncing {game_slug} to database...")
         synced_count = self._upsert_matches(cleaned_matches)
         
-        logger.info(f"✅ Synced {synced_count} matches to database")
+        logger.info(f"✅ Synced {synced_count} {game_slug} matches to database ({self._format_upsert_stats()})")
         
         return {
             'fetched': len(raw_matches),
             'cleaned': len(cleaned_matches),
-            'synced': synced_count
+            'synced': synced_count,
+            'rejected': list(self.last_rejects),
+            **self.last_upsert_stats,
         }
+
+    def _format_upsert_stats(self):
+        st = self.last_upsert_stats
+        return f"new={st['new']} | changed={st['changed']} | unchanged={st['unchanged']}"
     
-    def _upsert_matches(self, matches, lean: bool = False):
+    # Bulk upsert'te tek INSERT ... VALUES'a giren max maç (16 parametre/satır →
+    # 500 satır = 8000 parametre; Postgres 65535 sınırının çok altında).
+    BULK_CHUNK_SIZE = 500
+
+    def _upsert_matches(self, matches, lean: bool = False, bulk: bool = True):
         """
         Upsert matches to database.
 
@@ -242,158 +307,408 @@ class MatchSyncer:
         - scheduled_at artık timezone-aware UTC olarak kaydediliyor
         - status + winner_id her zaman güncelleniyor (stale data fix)
         - score sütunları güncelleniyor
-        - raw_data her upsert'te yenileniyor (canlı veri için)
-        - updated_at her zaman CURRENT_TIMESTAMP
+        - raw_data içerik değiştiğinde yenileniyor (canlı veri için)
+        - updated_at yazılan her satırda CURRENT_TIMESTAMP
+
+        Değişiklik tespiti: her satır için content_hash (temiz maç + raw payload)
+        hesaplanır; DB'deki hash aynıysa ON CONFLICT ... WHERE satırı HİÇ
+        yazmaz (WAL/bloat/realtime event yok). Sayaçlar self.last_upsert_stats
+        ({'new', 'changed', 'unchanged'}) içinde raporlanır; dönüş değeri hâlâ
+        başarıyla işlenen (yazılan + değişmediği için atlanan) maç sayısıdır.
 
         lean=True (geçmiş backfill): ağır raw_data JSON blob'u SAKLANMAZ (boş '{}')
         → maç başına ~1.5KB (5KB yerine). Storage tasarrufu; eski maçlar sonuç-only.
+
+        bulk=True (varsayılan): maçlar BULK_CHUNK_SIZE'lık batch'ler halinde
+        set-based yazılır — games/teams/tournaments/matches için batch başına
+        birkaç multi-row INSERT (maç başına 6-9 round-trip yerine). Batch'in
+        set-based yazımı DB hatası verirse o batch satır-satır (SAVEPOINT'li)
+        yola düşer; hatalı satırlar self.last_rejects'e ({'id', 'error'})
+        raporlanır, sağlam satırlar yine yazılır.
         """
         synced_count = 0
+        rejects = []
+        counts = {'new': 0, 'changed': 0, 'unchanged': 0}
 
         with Database.get_connection() as conn:
             with conn.cursor() as cur:
-                for i, match in enumerate(matches):
-                    savepoint_name = f"sp_match_{i}"
-                    cur.execute(f'SAVEPOINT "{savepoint_name}"')
-                    try:
-                        game_id = self._get_or_create_game(cur, match['game_slug'])
-
-                        team_a_id = self._get_or_create_team(
-                            cur,
-                            match['team_a_id'],
-                            match['team_a_name'],
-                            match.get('team_a_acronym'),
-                            match.get('team_a_logo'),
-                        )
-                        team_b_id = self._get_or_create_team(
-                            cur,
-                            match['team_b_id'],
-                            match['team_b_name'],
-                            match.get('team_b_acronym'),
-                            match.get('team_b_logo'),
-                        )
-
-                        tournament_id = None
-                        if match.get('tournament_id') and match.get('tournament_name'):
-                            tournament_id = self._get_or_create_tournament(
-                                cur,
-                                match['tournament_id'],
-                                match['tournament_name'],
-                                game_id,
-                                begin_at = match.get('tournament_begin_at'),
-                                end_at   = match.get('tournament_end_at'),
-                                tier     = match.get('tournament_tier'),
-                                region   = match.get('tournament_region'),
-                                league_name = match.get('league_name'),
-                                event_name  = match.get('event_name'),
+                for start in range(0, len(matches), self.BULK_CHUNK_SIZE):
+                    chunk = matches[start:start + self.BULK_CHUNK_SIZE]
+                    if bulk:
+                        cur.execute('SAVEPOINT "sp_bulk"')
+                        try:
+                            synced_count += self._bulk_upsert_chunk(cur, chunk, lean, rejects, counts)
+                            cur.execute('RELEASE SAVEPOINT "sp_bulk"')
+                            continue
+                        except psycopg.Error as e:
+                            logger.warning(
+                                f"⚠️  Bulk upsert failed for batch of {len(chunk)} "
+                                f"— falling back to per-row: {e}"
                             )
+                            cur.execute('ROLLBACK TO SAVEPOINT "sp_bulk"')
+                            cur.execute('RELEASE SAVEPOINT "sp_bulk"')
+                            # Prep aşamasında reddedilenler satır-satır yolda tekrar raporlanır
+                            chunk_ids = {m.get('id') for m in chunk if isinstance(m, dict)}
+                            rejects[:] = [r for r in rejects if r['id'] not in chunk_ids]
+                    synced_count += self._upsert_rows(cur, conn, chunk, lean, rejects, counts)
 
-                        # ── Timezone-aware scheduled_at ──────────────
-                        # PandaScore UTC ISO string gelir: "2025-03-15T14:00:00Z"
-                        # psycopg3 datetime nesnesi kabul eder; Z suffix'ini
-                        # +00:00'a dönüştürüyoruz.
-                        raw_scheduled = match.get('scheduled_at', '')
-                        if raw_scheduled:
-                            # Z → +00:00 normalize
-                            normalized = raw_scheduled.replace('Z', '+00:00')
-                            try:
-                                scheduled_dt = datetime.fromisoformat(normalized)
-                                # tzinfo yoksa UTC varsay
-                                if scheduled_dt.tzinfo is None:
-                                    scheduled_dt = scheduled_dt.replace(
-                                        tzinfo=timezone.utc
-                                    )
-                            except ValueError:
-                                scheduled_dt = None
-                                logger.warning(f"⚠️  Bad scheduled_at for match {match['id']}: {raw_scheduled}")
-                        else:
-                            scheduled_dt = None
-
-                        # ── Upsert — tüm mutable alanlar güncelleniyor ──
-                        raw = match.get('raw_data') or {}
-                        number_of_games = raw.get('number_of_games')
-                        if lean:
-                            stream_url = None
-                            stored_raw = '{}'
-                        else:
-                            stream_url = _extract_stream_url(raw.get('streams_list') or [])
-                            stored_raw = json.dumps(raw)
-                        cur.execute(
-                            """
-                            INSERT INTO matches (
-                                id,
-                                game_id,
-                                team_a_id,
-                                team_b_id,
-                                tournament_id,
-                                scheduled_at,
-                                status,
-                                serie_id,
-                                winner_id,
-                                team_a_score,
-                                team_b_score,
-                                round_info,
-                                number_of_games,
-                                stream_url,
-                                raw_data,
-                                updated_at
-                            )
-                            VALUES (
-                                %s, %s, %s, %s, %s,
-                                %s, %s, %s, %s, %s,
-                                %s, %s, %s, %s, %s,
-                                CURRENT_TIMESTAMP
-                            )
-                            ON CONFLICT (id) DO UPDATE SET
-                                status          = EXCLUDED.status,
-                                winner_id       = EXCLUDED.winner_id,
-                                team_a_score    = EXCLUDED.team_a_score,
-                                team_b_score    = EXCLUDED.team_b_score,
-                                scheduled_at    = EXCLUDED.scheduled_at,
-                                tournament_id   = COALESCE(EXCLUDED.tournament_id,
-                                                           matches.tournament_id),
-                                round_info      = COALESCE(EXCLUDED.round_info,
-                                                           matches.round_info),
-                                number_of_games = COALESCE(EXCLUDED.number_of_games,
-                                                           matches.number_of_games),
-                                stream_url      = COALESCE(EXCLUDED.stream_url,
-                                                           matches.stream_url),
-                                raw_data        = EXCLUDED.raw_data,
-                                updated_at      = CURRENT_TIMESTAMP
-                            """,
-                            (
-                                match['id'],
-                                game_id,
-                                team_a_id,
-                                team_b_id,
-                                tournament_id,
-                                scheduled_dt,
-                                match['status'],
-                                match.get('serie_id'),
-                                match.get('winner_id'),
-                                match.get('team_a_score'),
-                                match.get('team_b_score'),
-                                match.get('round_info'),
-                                number_of_games,
-                                stream_url,
-                                stored_raw,
-                            ),
-                        )
-                        cur.execute(f'RELEASE SAVEPOINT "{savepoint_name}"')
-                        synced_count += 1
+                conn.commit()
 
-                    except Exception as e:
-                        logger.warning(f"⚠️  Error syncing match {match.get('id')}: {e}")
-                        # Sadece hatalı satırı geri al, başarılı satırları koru.
-                        try:
-                            cur.execute(f'ROLLBACK TO SAVEPOINT "{savepoint_name}"')
-                            cur.execute(f'RELEASE SAVEPOINT "{savepoint_name}"')
-                        except psycopg.Error:
-                            # Savepoint geri alınamazsa transaction'ı temizle.
-                            conn.rollback()
-                        continue
+        self.last_rejects = rejects
+        self.last_upsert_stats = counts
+        if rejects:
+            sample = ', '.join(str(r['id']) for r in rejects[:10])
+            logger.warning(f"⚠️  {len(rejects)} match(es) rejected during upsert: {sample}")
+        return synced_count
 
-                conn.commit()
+    def _prepare_match_row(self, match, lean: bool = False) -> dict:
+        """Temizlenmiş maçı DB satır değerlerine çevirir (bulk ve satır-satır yol ortak)."""
+        # ── Timezone-aware scheduled_at ──────────────
+        # PandaScore UTC ISO string gelir: "2025-03-15T14:00:00Z"
+        # psycopg3 datetime nesnesi kabul eder; Z suffix'ini
+        # +00:00'a dönüştürüyoruz.
+        raw_scheduled = match.get('scheduled_at', '')
+        if raw_scheduled:
+            # Z → +00:00 normalize
+            normalized = raw_scheduled.replace('Z', '+00:00')
+            try:
+                scheduled_dt = datetime.fromisoformat(normalized)
+                # tzinfo yoksa UTC varsay
+                if scheduled_dt.tzinfo is None:
+                    scheduled_dt = scheduled_dt.replace(
+                        tzinfo=timezone.utc
+                    )
+            except ValueError:
+                scheduled_dt = None
+                logger.warning(f"⚠️  Bad scheduled_at for match {match['id']}: {raw_scheduled}")
+        else:
+            scheduled_dt = None
+
+        raw = match.get('raw_data') or {}
+        if lean:
+            stream_url = None
+            stored_raw = '{}'
+        else:
+            stream_url = _extract_stream_url(raw.get('streams_list') or [])
+            stored_raw = json.dumps(raw)
+
+        tournament = None
+        if match.get('tournament_id') and match.get('tournament_name'):
+            tournament = {
+                'id':          match['tournament_id'],
+                'name':        match['tournament_name'],
+                'begin_at':    match.get('tournament_begin_at'),
+                'end_at':      match.get('tournament_end_at'),
+                'tier':        match.get('tournament_tier'),
+                'region':      match.get('tournament_region'),
+                'league_name': match.get('league_name'),
+                'event_name':  match.get('event_name'),
+            }
+
+        return {
+            'id': match['id'],
+            'game_slug': self._canonical_game_slug(match['game_slug']),
+            'team_a': (match['team_a_id'], match['team_a_name'],
+                       match.get('team_a_acronym'), match.get('team_a_logo')),
+            'team_b': (match['team_b_id'], match['team_b_name'],
+                       match.get('team_b_acronym'), match.get('team_b_logo')),
+            'tournament': tournament,
+            'scheduled_at': scheduled_dt,
+            'status': match['status'],
+            'serie_id': match.get('serie_id'),
+            'winner_id': match.get('winner_id'),
+            'team_a_score': match.get('team_a_score'),
+            'team_b_score': match.get('team_b_score'),
+            'round_info': match.get('round_info'),
+            'number_of_games': raw.get('number_of_games'),
+            'stream_url': stream_url,
+            'raw_data': stored_raw,
+            'content_hash': self._content_hash(match, lean),
+        }
+
+    @staticmethod
+    def _content_hash(match, lean: bool = False) -> str:
+        """
+        Temiz maç satırı + raw payload'ın kararlı (key-sıralı) SHA-256 özeti.
+        lean de hash'e girer: lean yazılmış bir maç sonra tam raw_data ile
+        gelirse aynı içerik sayılmamalı.
+        """
+        payload = json.dumps(match, sort_keys=True, default=str, separators=(',', ':'))
+        return hashlib.sha256(f"{int(bool(lean))}:{payload}".encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def _coalesce_into(prev: dict, new: dict, keys) -> dict:
+        """Aynı batch'te tekrar eden satırları ON CONFLICT COALESCE semantiğiyle birleştir."""
+        merged = dict(new)
+        for key in keys:
+            if merged.get(key) is None:
+                merged[key] = prev.get(key)
+        return merged
+
+    def _bulk_upsert_chunk(self, cur, chunk, lean, rejects, counts) -> int:
+        """
+        Bir batch maçı set-based yazar: games (INSERT + SELECT), teams,
+        tournaments ve matches için birer multi-row INSERT ... ON CONFLICT.
+        Hazırlık (Python) aşamasında bozuk çıkan satırlar rejects'e eklenip atlanır.
+        """
+        rows = []
+        for match in chunk:
+            try:
+                rows.append(self._prepare_match_row(match, lean))
+            except (KeyError, TypeError, AttributeError, ValueError) as e:
+                mid = match.get('id') if isinstance(match, dict) else None
+                rejects.append({'id': mid, 'error': f"{type(e).__name__}: {e}"})
+        if not rows:
+            return 0
+
+        # ── games: eksik slug'ları ekle, id'leri tek SELECT ile çöz ──
+        slugs = sorted({r['game_slug'] for r in rows if r['game_slug']})
+        game_ids = {}
+        if slugs:
+            cur.execute(
+                "INSERT INTO games (slug, name) "
+                + self._values_sql(len(slugs), 2)
+                + " ON CONFLICT (slug) DO NOTHING",
+                [v for slug in slugs for v in (slug, self._game_display_name(slug))],
+            )
+            cur.execute("SELECT id, slug FROM games WHERE slug = ANY(%s)", (slugs,))
+            game_ids = {slug: gid for gid, slug in cur.fetchall()}
+
+        # ── teams: yalnızca olmayanlar eklenir (mevcut takım bilgisi korunur) ──
+        teams = {}
+        for r in rows:
+            for team in (r['team_a'], r['team_b']):
+                teams.setdefault(team[0], team)
+        cur.execute(
+            "INSERT INTO teams (id, name, acronym, logo_url) "
+            + self._values_sql(len(teams), 4)
+            + " ON CONFLICT (id) DO NOTHING",
+            [v for team in teams.values() for v in team],
+        )
+
+        # ── tournaments: batch içi tekrarlar COALESCE semantiğiyle katlanır ──
+        tournaments = {}
+        for r in rows:
+            t = r['tournament']
+            if not t:
+                continue
+            t = dict(t, game_id=game_ids.get(r['game_slug']))
+            prev = tournaments.get(t['id'])
+            tournaments[t['id']] = self._coalesce_into(prev, t, t.keys()) if prev else t
+        if tournaments:
+            cols = ('id', 'name', 'game_id', 'begin_at', 'end_at', 'tier',
+                    'region', 'league_name', 'event_name')
+            cur.execute(
+                f"INSERT INTO tournaments ({', '.join(cols)}) "
+                + self._values_sql(len(tournaments), len(cols))
+                + """
+                ON CONFLICT (id) DO UPDATE SET
+                    name        = COALESCE(EXCLUDED.name, tournaments.name),
+                    game_id     = COALESCE(EXCLUDED.game_id, tournaments.game_id),
+                    begin_at    = COALESCE(EXCLUDED.begin_at, tournaments.begin_at),
+                    end_at      = COALESCE(EXCLUDED.end_at,   tournaments.end_at),
+                    tier        = COALESCE(EXCLUDED.tier,     tournaments.tier),
+                    region      = COALESCE(EXCLUDED.region,   tournaments.region),
+                    league_name = COALESCE(EXCLUDED.league_name, tournaments.league_name),
+                    event_name  = COALESCE(EXCLUDED.event_name,  tournaments.event_name)
+                """,
+                [t[c] for t in tournaments.values() for c in cols],
+            )
+
+        # ── matches: ON CONFLICT aynı satırı iki kez güncelleyemez → id başına tek satır ──
+        by_id = {}
+        for r in rows:
+            prev = by_id.get(r['id'])
+            by_id[r['id']] = self._coalesce_into(
+                prev, r, ('tournament', 'round_info', 'number_of_games', 'stream_url')
+            ) if prev else r
+        params = []
+        for r in by_id.values():
+            params.extend((
+                r['id'],
+                game_ids.get(r['game_slug']),
+                r['team_a'][0],
+                r['team_b'][0],
+                r['tournament']['id'] if r['tournament'] else None,
+                r['scheduled_at'],
+                r['status'],
+                r['serie_id'],
+                r['winner_id'],
+                r['team_a_score'],
+                r['team_b_score'],
+                r['round_info'],
+                r['number_of_games'],
+                r['stream_url'],
+                r['raw_data'],
+                r['content_hash'],
+            ))
+        cur.execute(
+            """
+            INSERT INTO matches (
+                id, game_id, team_a_id, team_b_id, tournament_id,
+                scheduled_at, status, serie_id, winner_id, team_a_score,
+                team_b_score, round_info, number_of_games, stream_url, raw_data,
+                content_hash, updated_at
+            )
+            """
+            + self._values_sql(len(by_id), 16, suffix="CURRENT_TIMESTAMP")
+            + """
+            ON CONFLICT (id) DO UPDATE SET
+                status          = EXCLUDED.status,
+                winner_id       = EXCLUDED.winner_id,
+                team_a_score    = EXCLUDED.team_a_score,
+                team_b_score    = EXCLUDED.team_b_score,
+                scheduled_at    = EXCLUDED.scheduled_at,
+                tournament_id   = COALESCE(EXCLUDED.tournament_id,
+                                           matches.tournament_id),
+                round_info      = COALESCE(EXCLUDED.round_info,
+                                           matches.round_info),
+                number_of_games = COALESCE(EXCLUDED.number_of_games,
+                                           matches.number_of_games),
+                stream_url      = COALESCE(EXCLUDED.stream_url,
+                                           matches.stream_url),
+                raw_data        = EXCLUDED.raw_data,
+                content_hash    = EXCLUDED.content_hash,
+                updated_at      = CURRENT_TIMESTAMP
+            WHERE matches.content_hash IS DISTINCT FROM EXCLUDED.content_hash
+            RETURNING (xmax = 0) AS inserted
+            """,
+            params,
+        )
+        # Değişmeyen satırlar WHERE'e takılır ve RETURNING'de görünmez;
+        # xmax = 0 → satır bu statement'ta INSERT edildi.
+        written = [row[0] for row in cur.fetchall()]
+        counts['new'] += sum(1 for inserted in written if inserted)
+        counts['changed'] += sum(1 for inserted in written if not inserted)
+        counts['unchanged'] += len(by_id) - len(written)
+        return len(rows)
+
+    @staticmethod
+    def _values_sql(n_rows: int, n_cols: int, suffix: str = None) -> str:
+        """'VALUES (%s, ...), (%s, ...)' — multi-row INSERT için placeholder listesi."""
+        cells = ['%s'] * n_cols
+        if suffix:
+            cells.append(suffix)
+        row = '(' + ', '.join(cells) + ')'
+        return 'VALUES ' + ', '.join([row] * n_rows)
+
+    def _upsert_rows(self, cur, conn, matches, lean, rejects, counts) -> int:
+        """Satır-satır upsert: her maç kendi SAVEPOINT'inde (hatalı satır izole edilir)."""
+        synced_count = 0
+        for i, match in enumerate(matches):
+            savepoint_name = f"sp_match_{i}"
+            cur.execute(f'SAVEPOINT "{savepoint_name}"')
+            try:
+                row = self._prepare_match_row(match, lean)
+                game_id = self._get_or_create_game(cur, row['game_slug'])
+
+                team_a_id = self._get_or_create_team(cur, *row['team_a'])
+                team_b_id = self._get_or_create_team(cur, *row['team_b'])
+
+                tournament_id = None
+                t = row['tournament']
+                if t:
+                    tournament_id = self._get_or_create_tournament(
+                        cur,
+                        t['id'],
+                        t['name'],
+                        game_id,
+                        begin_at = t['begin_at'],
+                        end_at   = t['end_at'],
+                        tier     = t['tier'],
+                        region   = t['region'],
+                        league_name = t['league_name'],
+                        event_name  = t['event_name'],
+                    )
+
+                # ── Upsert — tüm mutable alanlar güncelleniyor ──
+                cur.execute(
+                    """
+                    INSERT INTO matches (
+                        id,
+                        game_id,
+                        team_a_id,
+                        team_b_id,
+                        tournament_id,
+                        scheduled_at,
+                        status,
+                        serie_id,
+                        winner_id,
+                        team_a_score,
+                        team_b_score,
+                        round_info,
+                        number_of_games,
+                        stream_url,
+                        raw_data,
+                        content_hash,
+                        updated_at
+                    )
+                    VALUES (
+                        %s, %s, %s, %s, %s,
+                        %s, %s, %s, %s, %s,
+                        %s, %s, %s, %s, %s,
+                        %s, CURRENT_TIMESTAMP
+                    )
+                    ON CONFLICT (id) DO UPDATE SET
+                        status          = EXCLUDED.status,
+                        winner_id       = EXCLUDED.winner_id,
+                        team_a_score    = EXCLUDED.team_a_score,
+                        team_b_score    = EXCLUDED.team_b_score,
+                        scheduled_at    = EXCLUDED.scheduled_at,
+                        tournament_id   = COALESCE(EXCLUDED.tournament_id,
+                                                   matches.tournament_id),
+                        round_info      = COALESCE(EXCLUDED.round_info,
+                                                   matches.round_info),
+                        number_of_games = COALESCE(EXCLUDED.number_of_games,
+                                                   matches.number_of_games),
+                        stream_url      = COALESCE(EXCLUDED.stream_url,
+                                                   matches.stream_url),
+                        raw_data        = EXCLUDED.raw_data,
+                        content_hash    = EXCLUDED.content_hash,
+                        updated_at      = CURRENT_TIMESTAMP
+                    WHERE matches.content_hash IS DISTINCT FROM EXCLUDED.content_hash
+                    RETURNING (xmax = 0) AS inserted
+                    """,
+                    (
+                        row['id'],
+                        game_id,
+                        team_a_id,
+                        team_b_id,
+                        tournament_id,
+                        row['scheduled_at'],
+                        row['status'],
+                        row['serie_id'],
+                        row['winner_id'],
+                        row['team_a_score'],
+                        row['team_b_score'],
+                        row['round_info'],
+                        row['number_of_games'],
+                        row['stream_url'],
+                        row['raw_data'],
+                        row['content_hash'],
+                    ),
+                )
+                written = cur.fetchone()
+                cur.execute(f'RELEASE SAVEPOINT "{savepoint_name}"')
+                synced_count += 1
+                if written is None:
+                    counts['unchanged'] += 1
+                elif written[0]:
+                    counts['new'] += 1
+                else:
+                    counts['changed'] += 1
+
+            except Exception as e:
+                logger.warning(f"⚠️  Error syncing match {match.get('id')}: {e}")
+                rejects.append({'id': match.get('id'), 'error': f"{type(e).__name__}: {e}"})
+                # Sadece hatalı satırı geri al, başarılı satırları koru.
+                try:
+                    cur.execute(f'ROLLBACK TO SAVEPOINT "{savepoint_name}"')
+                    cur.execute(f'RELEASE SAVEPOINT "{savepoint_name}"')
+                except psycopg.Error:
+                    # Savepoint geri alınamazsa transaction'ı temizle.
+                    conn.rollback()
+                continue
 
         return synced_count
 
@@ -411,14 +726,15 @@ class MatchSyncer:
 
     # ── Geçmiş backfill: büyük turnuvalar (tier A/S) ──────────────────────────
     def backfill_big_tournaments(self, games, since_iso, until_iso=None,
-                                 tiers='s,a', per_page=100, pace=0.3) -> dict:
+                                 tiers='s,a', per_page=100) -> dict:
         """
         Tier A/S turnuvaların FINISHED maçlarını geçmişe dönük çeker ve LEAN upsert
         eder (ağır JSON saklanmaz). Verimli akış: önce turnuvaları listele, sonra
         her turnuvanın tam maçlarını (opponents+results) çek.
 
         games: ['lol','csgo','valorant']; since_iso/until_iso: ISO tarih penceresi.
-        Idempotent (ON CONFLICT). Rate-limit: 429'da client backoff + pace saniye.
+        Idempotent (ON CONFLICT). Rate-limit: PandaScoreClient'ın paylaşılan
+        limiter'ı (429'da global cooldown, kalan kotaya göre adaptif hız).
         """
         total = {"tournaments": 0, "matches_fetched": 0, "synced": 0}
         for game in games:
@@ -439,7 +755,6 @@ class MatchSyncer:
                 if len(tours) < per_page:
                     break
                 page += 1
-                time.sleep(pace)
             logger.info(f"🏆 {game}: {len(tour_ids)} adet tier '{tiers}' turnuva bulundu")
             total["tournaments"] += len(tour_ids)
 
@@ -457,7 +772,6 @@ class MatchSyncer:
                         if len(ms) < per_page:
                             break
                         mpage += 1
-                        time.sleep(pace)
                     total["matches_fetched"] += len(batch)
                     cleaned = [c for c in (DataCleaner.clean_match_data(m) for m in batch) if c]
                     if cleaned:
@@ -466,7 +780,6 @@ class MatchSyncer:
                     logger.warning(f"⚠️  {game} turnuva {tid} atlandı: {exc}")
                 if idx % 25 == 0 or idx == len(tour_ids):
                     logger.info(f"   {game}: {idx}/{len(tour_ids)} turnuva işlendi — toplam {total['synced']} maç")
-                time.sleep(pace)
 
         logger.info(
             f"✅ Backfill tamam — {total['tournaments']} turnuva, "
@@ -483,21 +796,27 @@ class MatchSyncer:
         'dota-2': 'dota2',
     }
 
-    def _get_or_create_game(self, cur, game_slug):
-        """Get or create game in database"""
+    GAME_NAMES = {
+        'valorant': 'Valorant',
+        'csgo': 'Counter-Strike 2',
+        'lol': 'League of Legends'
+    }
+
+    def _canonical_game_slug(self, game_slug):
+        """Kanonik slug'a normalize et (mükerrer games kaydını önler)"""
         if not game_slug:
             return None
+        game_slug = game_slug.strip().lower()
+        return self.GAME_SLUG_ALIASES.get(game_slug, game_slug)
 
-        # Kanonik slug'a normalize et (mükerrer games kaydını önler)
-        game_slug = self.GAME_SLUG_ALIASES.get(
-            game_slug.strip().lower(), game_slug.strip().lower()
-        )
+    def _game_display_name(self, game_slug):
+        return self.GAME_NAMES.get(game_slug, game_slug.title())
 
-        game_names = {
-            'valorant': 'Valorant',
-            'csgo': 'Counter-Strike 2',
-            'lol': 'League of Legends'
-        }
+    def _get_or_create_game(self, cur, game_slug):
+        """Get or create game in database"""
+        game_slug = self._canonical_game_slug(game_slug)
+        if not game_slug:
+            return None
 
         cur.execute("SELECT id FROM games WHERE slug = %s", (game_slug,))
         result = cur.fetchone()
@@ -505,7 +824,7 @@ class MatchSyncer:
         if result:
             return result[0]
         
-        game_name = game_names.get(game_slug, game_slug.title())
+        game_name = self._game_display_name(game_slug)
         cur.execute(
             "INSERT INTO games (slug, name) VALUES (%s, %s) ON CONFLICT (slug) DO NOTHING RETURNING id",
             (game_slug, game_name)
@@ -578,8 +897,9 @@ class MatchSyncer:
                     cur.execute(
                         """
                         UPDATE matches
-                        SET    status     = 'finished',
-                               updated_at = CURRENT_TIMESTAMP
+                        SET    status       = 'finished',
+                               content_hash = NULL,
+                               updated_at   = CURRENT_TIMESTAMP
                         WHERE  status     = 'running'
                           AND  scheduled_at < NOW() - (%s * INTERVAL '1 hour')
                         RETURNING id
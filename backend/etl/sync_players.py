@@ -10,17 +10,21 @@ Her iki işlem de incremental'dır:
   - Oyuncusu zaten yüklü takımlar atlanır
   - match_stats kaydı zaten olan maçlar atlanır
 """
+import os
 import uuid
 import json
-import time
 import requests
-import re
 import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import psycopg
 
 from database import Database
 
 logger = logging.getLogger(__name__)
+from etl.entity_resolver import get_resolver
 from etl.pandascore_client import PandaScoreClient
+from etl.schema_migrations import Migration, ensure_migration
 
 
 # ── Yardımcı ──────────────────────────────────────────────────────────────────
@@ -37,12 +41,288 @@ def _to_float(value):
         return None
 
 
-def _normalize_nickname(name):
-    raw = str(name or '').strip().lower()
-    if not raw:
-        return ''
-    return re.sub(r'[^a-z0-9]+', '', raw)
+# Kadro sync: eşzamanlı /teams/{id} isteği sayısı (toplam hız yine client
+# limiter'ının PANDASCORE_RATE_PER_SEC bütçesinde) ve tek yazıcının grup boyutu.
+ROSTER_FETCH_WORKERS = int(os.getenv('ROSTER_FETCH_WORKERS', 6))
+ROSTER_WRITE_BATCH = int(os.getenv('ROSTER_WRITE_BATCH', 25))
+
+
+# ── match_stats / player_match_stats upsert'leri (Python ve SQL yolu ortak) ───
+_MATCH_STATS_ON_CONFLICT = """
+    ON CONFLICT (match_id, team_id)
+      WHERE match_id IS NOT NULL AND team_id IS NOT NULL
+    DO UPDATE SET stats = EXCLUDED.stats
+"""
+
+_PLAYER_STATS_ON_CONFLICT = """
+    ON CONFLICT (player_id, match_id)
+    DO UPDATE SET
+        team_id       = EXCLUDED.team_id,
+        kills         = EXCLUDED.kills,
+        deaths        = EXCLUDED.deaths,
+        assists       = EXCLUDED.assists,
+        headshots     = EXCLUDED.headshots,
+        hs_percentage = EXCLUDED.hs_percentage,
+        is_win        = EXCLUDED.is_win,
+        stats         = EXCLUDED.stats,
+        played_at     = COALESCE(EXCLUDED.played_at, player_match_stats.played_at),
+        updated_at    = now()
+"""
+
+_MATCH_STATS_INSERT = """
+    INSERT INTO match_stats (match_id, team_id, stats)
+    VALUES (%s, %s, %s)
+""" + _MATCH_STATS_ON_CONFLICT
+
+_PLAYER_STATS_INSERT = """
+    INSERT INTO player_match_stats (
+        player_id, match_id, team_id, kills, deaths, assists, headshots,
+        hs_percentage, is_win, stats, played_at, updated_at
+    )
+    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, now())
+""" + _PLAYER_STATS_ON_CONFLICT
+
+
+# ── Server-side extraction (SQL) yardımcıları ─────────────────────────────────
+# sync_match_stats'in Python yürüyüşünü (raw_data → match_stats /
+# player_match_stats) Postgres içinde yeniden üretir. Parça-üreticiler Python'daki
+# `a or b`, _to_float ve int() semantiğini jsonb üzerinde taklit eder; böylece
+# iki yol aynı satırları yazar.
+
+def _sql_arr(expr):
+    """jsonb dizi değilse boş dizi (jsonb_array_elements hata vermesin)."""
+    return f"(CASE WHEN jsonb_typeof({expr}) = 'array' THEN {expr} ELSE '[]'::jsonb END)"
+
+
+def _sql_truthy(expr):
+    """Python truthiness: None/0/False/''/[]/{} → false."""
+    return (
+        f"({expr} IS NOT NULL AND {expr} NOT IN "
+        "('null'::jsonb, '0'::jsonb, 'false'::jsonb, '\"\"'::jsonb, '[]'::jsonb, '{}'::jsonb))"
+    )
+
+
+def _sql_or(*exprs):
+    """`a or b or c` (jsonb) — ilk truthy değer, yoksa sonuncusu."""
+    whens = " ".join(f"WHEN {_sql_truthy(e)} THEN {e}" for e in exprs[:-1])
+    return f"(CASE {whens} ELSE {exprs[-1]} END)"
+
+
+def _sql_float(expr):
+    """_to_float(jsonb) → numeric; parse edilemeyen değer NULL (hata değil)."""
+    text = f"btrim({expr} #>> '{{}}')"
+    return (
+        f"(CASE jsonb_typeof({expr}) "
+        f"WHEN 'number' THEN ({expr} #>> '{{}}')::numeric "
+        f"WHEN 'boolean' THEN ({expr} = 'true'::jsonb)::int::numeric "
+        f"WHEN 'string' THEN CASE WHEN {text} ~* '^[+-]?([0-9]+[.]?[0-9]*|[.][0-9]+)(e[+-]?[0-9]+)?$' "
+        f"THEN {text}::numeric END END)"
+    )
+
+
+def _sql_int(expr):
+    """int(jsonb) → bigint; int() gibi float'ı keser, geçersiz değer NULL."""
+    text = f"btrim({expr} #>> '{{}}')"
+    return (
+        f"(CASE jsonb_typeof({expr}) "
+        f"WHEN 'number' THEN trunc(({expr} #>> '{{}}')::numeric)::bigint "
+        f"WHEN 'boolean' THEN ({expr} = 'true'::jsonb)::int::bigint "
+        f"WHEN 'string' THEN CASE WHEN {text} ~ '^[+-]?[0-9]{{1,18}}$' THEN {text}::bigint END END)"
+    )
+
+
+def _sql_norm_name(text_expr):
+    """etl.entity_resolver.normalize_name'in SQL karşılığı."""
+    return f"regexp_replace(lower(btrim(COALESCE({text_expr}, ''))), '[^a-z0-9]+', '', 'g')"
+
+
+_SQL_CHUNK_MATCHES = """
+    m AS (
+        SELECT id, team_a_id, team_b_id, winner_id, scheduled_at, raw_data
+        FROM matches
+        WHERE id = ANY(%(ids)s)
+          AND jsonb_typeof(raw_data) = 'object'
+          AND (team_a_id IS NOT NULL OR team_b_id IS NOT NULL)
+    )
+"""
+
+_SQL_GAME_PLAYER = f"""jsonb_build_object(
+                    'player_id',   p #> '{{player,id}}',
+                    'player_name', {_sql_or("(p #> '{player,name}')", "(p #> '{player,nickname}')")},
+                    'team_id',     te #> '{{team,id}}',
+                    'kills',       p -> 'kills',
+                    'deaths',      p -> 'deaths',
+                    'assists',     p -> 'assists',
+                    'headshots',   p -> 'headshots',
+                    'team_score',  te -> 'score'
+                )"""
+
+_SQL_MATCH_STATS_INSERT = f"""
+    WITH {_SQL_CHUNK_MATCHES},
+    gd AS (
+        SELECT m.id AS match_id,
+               COALESCE(
+                   jsonb_agg(jsonb_build_object(
+                       'position',       g -> 'position',
+                       'map_name',       g #> '{{map,name}}',
+                       'winner_id',      g #> '{{winner,id}}',
+                       'length_seconds', g -> 'length',
+                       'status',         g -> 'status',
+                       'team_scores', COALESCE((
+                           SELECT jsonb_object_agg(te #>> '{{team,id}}', te -> 'score')
+                           FROM jsonb_array_elements({_sql_arr("(g -> 'teams')")}) te
+                           WHERE COALESCE(te #> '{{team,id}}', 'null'::jsonb) <> 'null'::jsonb
+                       ), '{{}}'::jsonb),
+                       'players', COALESCE((
+                           SELECT jsonb_agg({_SQL_GAME_PLAYER} ORDER BY t_ord, p_ord)
+                           FROM jsonb_array_elements({_sql_arr("(g -> 'teams')")})
+                                    WITH ORDINALITY AS t(te, t_ord),
+                                jsonb_array_elements({_sql_arr("(te -> 'players')")})
+                                    WITH ORDINALITY AS pl(p, p_ord)
+                       ), '[]'::jsonb)
+                   ) ORDER BY g_ord) FILTER (WHERE g IS NOT NULL),
+                   '[]'::jsonb
+               ) AS games_detail
+        FROM m
+        LEFT JOIN LATERAL jsonb_array_elements({_sql_arr("(m.raw_data -> 'games')")})
+            WITH ORDINALITY AS gs(g, g_ord) ON true
+        GROUP BY m.id
+    )
+    INSERT INTO match_stats (match_id, team_id, stats)
+    SELECT DISTINCT ON (m.id, t.tid)
+           m.id,
+           t.tid,
+           jsonb_build_object(
+               'score', (
+                   SELECT r -> 'score'
+                   FROM jsonb_array_elements({_sql_arr("(m.raw_data -> 'results')")})
+                        WITH ORDINALITY AS rs(r, r_ord)
+                   WHERE jsonb_typeof(r -> 'team_id') = 'number'
+                     AND (r ->> 'team_id')::numeric = t.tid
+                   ORDER BY r_ord DESC
+                   LIMIT 1
+               ),
+               'games_detail', gd.games_detail
+           )
+    FROM m
+    JOIN gd ON gd.match_id = m.id
+    CROSS JOIN LATERAL (VALUES (m.team_a_id), (m.team_b_id)) AS t(tid)
+    WHERE t.tid IS NOT NULL
+    ORDER BY m.id, t.tid
+    {_MATCH_STATS_ON_CONFLICT}
+"""
+
+def _sql_player_stats_insert(nickname_norm):
+    """
+    player_match_stats INSERT'i. nickname_norm: players satırının normalize adı —
+    index'li generated kolon (sql/entity_name_norm.sql) ya da yoksa ifade.
+    İsim haritası yalnızca parçadaki adlar için kurulur (tüm tablo değil).
+    """
+    return f"""
+    WITH {_SQL_CHUNK_MATCHES},
+    items AS (
+        -- source_enrichment.<kaynak>.{{match_history, match_detail.player_metrics, player_metrics}}
+        SELECT m.id AS match_id, m.winner_id, m.scheduled_at,
+               s.key AS source, 1 AS grp, s.s_ord, l.sub, e.i_ord, e.item
+        FROM m
+        CROSS JOIN LATERAL jsonb_each(
+            CASE WHEN jsonb_typeof(m.raw_data -> 'source_enrichment') = 'object'
+                 THEN m.raw_data -> 'source_enrichment' ELSE '{{}}'::jsonb END
+        ) WITH ORDINALITY AS s(key, payload, s_ord)
+        CROSS JOIN LATERAL (VALUES
+            (1, s.payload -> 'match_history'),
+            (2, s.payload #> '{{match_detail,player_metrics}}'),
+            (3, s.payload -> 'player_metrics')
+        ) AS l(sub, arr)
+        CROSS JOIN LATERAL jsonb_array_elements({_sql_arr("l.arr")}) WITH ORDINALITY AS e(item, i_ord)
+        WHERE jsonb_typeof(s.payload) = 'object'
+        UNION ALL
+        SELECT m.id, m.winner_id, m.scheduled_at,
+               'pandascore', 2, 0, 0, e.i_ord, e.item
+        FROM m
+        CROSS JOIN LATERAL jsonb_array_elements({_sql_arr("(m.raw_data -> 'pandascore_player_summaries')")})
+            WITH ORDINALITY AS e(item, i_ord)
+    ),
+    norm AS (
+        SELECT i.match_id, i.winner_id, i.scheduled_at, i.source,
+               i.grp, i.s_ord, i.sub, i.i_ord,
+               {_sql_int("n.psid")} AS psid,
+               {_sql_norm_name("n.pname #>> '{}'")} AS pname,
+               {_sql_int("n.team")} AS team_id,
+               {_sql_float("n.kills")} AS kills,
+               {_sql_float("n.deaths")} AS deaths,
+               {_sql_float("n.assists")} AS assists,
+               {_sql_float("n.headshots")} AS headshots,
+               {_sql_float("n.hs_pct")} AS hs_pct,
+               {_sql_float("(i.item -> 'kda')")} AS kda,
+               {_sql_float("n.win_rate")} AS win_rate,
+               i.item -> 'samples' AS samples
+        FROM items i
+        CROSS JOIN LATERAL (
+            SELECT CASE WHEN jsonb_typeof(i.item -> 'player') = 'object'
+                        THEN i.item -> 'player' ELSE '{{}}'::jsonb END AS po
+        ) po
+        CROSS JOIN LATERAL (
+            SELECT
+                {_sql_or("(i.item -> 'player_id')", "(i.item -> 'id')", "(i.item -> 'pandascore_id')", "(po.po -> 'id')")} AS psid,
+                {_sql_or("(i.item -> 'player_name')", "(i.item -> 'name')", "(i.item -> 'nickname')", "(po.po -> 'name')", "(po.po -> 'nickname')")} AS pname,
+                CASE WHEN jsonb_typeof(i.item -> 'team') = 'object'
+                     THEN {_sql_or("(i.item -> 'team_id')", "(i.item #> '{team,id}')")}
+                     ELSE i.item -> 'team_id' END AS team,
+                {_sql_or("(i.item -> 'kills')", "(i.item -> 'total_kills')", "(i.item -> 'frags')")} AS kills,
+                {_sql_or("(i.item -> 'deaths')", "(i.item -> 'total_deaths')")} AS deaths,
+                {_sql_or("(i.item -> 'assists')", "(i.item -> 'total_assists')")} AS assists,
+                {_sql_or("(i.item -> 'headshots')", "(i.item -> 'headshot_kills')", "(i.item -> 'hs_kills')")} AS headshots,
+                -- `hs_pct or hs_percentage` (Python yolu) → falsy ise NULL, kills'ten hesaplanır
+                {_sql_or("(i.item -> 'hs_pct')", "(i.item -> 'hs_percentage')", "(i.item -> 'headshot_percentage')", "NULL::jsonb")} AS hs_pct,
+                {_sql_or("(i.item -> 'win_rate')", "(i.item -> 'wr')")} AS win_rate
+        ) n
+        WHERE jsonb_typeof(i.item) = 'object'
+    ),
+    by_name AS (
+        SELECT DISTINCT ON (norm) norm, id
+        FROM (SELECT p.id, {nickname_norm} AS norm FROM players p) x
+        WHERE norm <> ''
+          AND norm IN (SELECT nr.pname FROM norm nr WHERE nr.pname <> '')
+        ORDER BY norm, id
+    ),
+    resolved AS (
+        -- aynı (oyuncu, maç) birden çok kaynakta → Python yolundaki gibi SON satır kazanır
+        SELECT DISTINCT ON (COALESCE(pp.id, bn.id), nr.match_id)
+               COALESCE(pp.id, bn.id) AS player_id,
+               nr.*
+        FROM norm nr
+        LEFT JOIN players pp ON pp.pandascore_id = nr.psid
+        LEFT JOIN by_name bn ON bn.norm = nr.pname AND nr.pname <> ''
+        WHERE COALESCE(pp.id, bn.id) IS NOT NULL
+        ORDER BY COALESCE(pp.id, bn.id), nr.match_id,
+                 nr.grp DESC, nr.s_ord DESC, nr.sub DESC, nr.i_ord DESC
+    )
+    INSERT INTO player_match_stats (
+        player_id, match_id, team_id, kills, deaths, assists, headshots,
+        hs_percentage, is_win, stats, played_at, updated_at
+    )
+    SELECT player_id, match_id, team_id, kills, deaths, assists, headshots,
+           COALESCE(hs_pct, CASE WHEN kills > 0 AND headshots IS NOT NULL
+                                 THEN headshots / kills * 100 END),
+           CASE WHEN winner_id IS NOT NULL AND team_id IS NOT NULL
+                THEN winner_id = team_id END,
+           jsonb_build_object(
+               'source',   COALESCE(NULLIF(source, ''), 'raw_data'),
+               'kda',      kda,
+               'win_rate', win_rate,
+               'samples',  samples
+           ),
+           scheduled_at,
+           now()
+    FROM resolved
+    {_PLAYER_STATS_ON_CONFLICT}
+"""
+
 
+_SQL_PLAYER_STATS_INSERT = _sql_player_stats_insert("p.nickname_norm")
+# sql/entity_name_norm.sql çalıştırılmamış şema: aynı kural ifadeyle (index yok)
+_SQL_PLAYER_STATS_INSERT_NO_NORM = _sql_player_stats_insert(_sql_norm_name("p.nickname"))
 
 # ── Ana Ligler ─────────────────────────────────────────────────────────────────
 
@@ -87,87 +367,93 @@ GAME_SLUGS = {
 }
 
 
+# ensure_schema DDL'i — schema_migrations kaydıyla yalnızca versiyon gerideyse koşar.
+# İfade değişirse versiyonu artırın (ifadeler idempotent kalmalı).
+_PLAYER_STATS_MIGRATION = Migration("player_stats", 1, (
+    # players: pandascore_id (int) + team_pandascore_id (bigint)
+    """
+    ALTER TABLE public.players
+      ADD COLUMN IF NOT EXISTS pandascore_id      bigint,
+      ADD COLUMN IF NOT EXISTS team_pandascore_id bigint
+    """,
+    # pandascore_id üzerinde unique index (partial: null'ları hariç tut)
+    """
+    CREATE UNIQUE INDEX IF NOT EXISTS uq_players_pandascore_id
+    ON public.players(pandascore_id)
+    WHERE pandascore_id IS NOT NULL
+    """,
+    # match_stats: (match_id, team_id) çifti unique olmalı
+    """
+    CREATE UNIQUE INDEX IF NOT EXISTS uq_match_stats_match_team
+    ON public.match_stats(match_id, team_id)
+    WHERE match_id IS NOT NULL AND team_id IS NOT NULL
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS public.player_match_stats (
+        id            bigserial PRIMARY KEY,
+        player_id     uuid NOT NULL,
+        match_id      bigint NOT NULL,
+        team_id       bigint,
+        kills         numeric,
+        deaths        numeric,
+        assists       numeric,
+        headshots     numeric,
+        hs_percentage numeric,
+        is_win        boolean,
+        stats         jsonb DEFAULT '{}'::jsonb,
+        played_at     timestamptz,
+        created_at    timestamptz DEFAULT now(),
+        updated_at    timestamptz DEFAULT now()
+    )
+    """,
+    # Eski şemayla oluşmuş tablolar için eksik kolonları ekle
+    # (CREATE TABLE IF NOT EXISTS mevcut tabloya kolon EKLEMEZ).
+    """
+    ALTER TABLE public.player_match_stats
+      ADD COLUMN IF NOT EXISTS team_id       bigint,
+      ADD COLUMN IF NOT EXISTS kills         numeric,
+      ADD COLUMN IF NOT EXISTS deaths        numeric,
+      ADD COLUMN IF NOT EXISTS assists       numeric,
+      ADD COLUMN IF NOT EXISTS headshots     numeric,
+      ADD COLUMN IF NOT EXISTS hs_percentage numeric,
+      ADD COLUMN IF NOT EXISTS is_win        boolean,
+      ADD COLUMN IF NOT EXISTS stats         jsonb DEFAULT '{}'::jsonb,
+      ADD COLUMN IF NOT EXISTS played_at     timestamptz,
+      ADD COLUMN IF NOT EXISTS created_at    timestamptz DEFAULT now(),
+      ADD COLUMN IF NOT EXISTS updated_at    timestamptz DEFAULT now()
+    """,
+    """
+    CREATE UNIQUE INDEX IF NOT EXISTS uq_player_match_stats_player_match
+    ON public.player_match_stats(player_id, match_id)
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS idx_player_match_stats_player_id
+    ON public.player_match_stats(player_id)
+    """,
+    # teams: roster senkronizasyon takibi için updated_at
+    """
+    ALTER TABLE public.teams
+      ADD COLUMN IF NOT EXISTS updated_at timestamptz DEFAULT now()
+    """,
+))
+
+
 class PlayerStatsSyncer:
 
     def __init__(self):
         self.client = PandaScoreClient()
+        self._has_nickname_norm = None   # players.nickname_norm var mı (lazy)
 
     # ── Şema Hazırlığı ─────────────────────────────────────────────────────────
 
     def ensure_schema(self):
         """
         players ve match_stats tablolarına gerekli ekstra kolonları ve
-        unique index'leri ekler (IF NOT EXISTS → idempotent).
+        unique index'leri ekler (_PLAYER_STATS_MIGRATION). Kayıtlı versiyon
+        güncelse DDL çalışmaz — süreç başına tek SELECT.
         """
-        with Database.get_connection() as conn:
-            conn.autocommit = True
-            with conn.cursor() as cur:
-                # players: pandascore_id (int) + team_pandascore_id (bigint)
-                cur.execute("""
-                    ALTER TABLE public.players
-                      ADD COLUMN IF NOT EXISTS pandascore_id      bigint,
-                      ADD COLUMN IF NOT EXISTS team_pandascore_id bigint
-                """)
-                # pandascore_id üzerinde unique index (partial: null'ları hariç tut)
-                cur.execute("""
-                    CREATE UNIQUE INDEX IF NOT EXISTS uq_players_pandascore_id
-                    ON public.players(pandascore_id)
-                    WHERE pandascore_id IS NOT NULL
-                """)
-                # match_stats: (match_id, team_id) çifti unique olmalı
-                cur.execute("""
-                    CREATE UNIQUE INDEX IF NOT EXISTS uq_match_stats_match_team
-                    ON public.match_stats(match_id, team_id)
-                    WHERE match_id IS NOT NULL AND team_id IS NOT NULL
-                """)
-                cur.execute("""
-                    CREATE TABLE IF NOT EXISTS public.player_match_stats (
-                        id            bigserial PRIMARY KEY,
-                        player_id     uuid NOT NULL,
-                        match_id      bigint NOT NULL,
-                        team_id       bigint,
-                        kills         numeric,
-                        deaths        numeric,
-                        assists       numeric,
-                        headshots     numeric,
-                        hs_percentage numeric,
-                        is_win        boolean,
-                        stats         jsonb DEFAULT '{}'::jsonb,
-                        played_at     timestamptz,
-                        created_at    timestamptz DEFAULT now(),
-                        updated_at    timestamptz DEFAULT now()
-                    )
-                """)
-                # Eski şemayla oluşmuş tablolar için eksik kolonları ekle
-                # (CREATE TABLE IF NOT EXISTS mevcut tabloya kolon EKLEMEZ).
-                cur.execute("""
-                    ALTER TABLE public.player_match_stats
-                      ADD COLUMN IF NOT EXISTS team_id       bigint,
-                      ADD COLUMN IF NOT EXISTS kills         numeric,
-                      ADD COLUMN IF NOT EXISTS deaths        numeric,
-                      ADD COLUMN IF NOT EXISTS assists       numeric,
-                      ADD COLUMN IF NOT EXISTS headshots     numeric,
-                      ADD COLUMN IF NOT EXISTS hs_percentage numeric,
-                      ADD COLUMN IF NOT EXISTS is_win        boolean,
-                      ADD COLUMN IF NOT EXISTS stats         jsonb DEFAULT '{}'::jsonb,
-                      ADD COLUMN IF NOT EXISTS played_at     timestamptz,
-                      ADD COLUMN IF NOT EXISTS created_at    timestamptz DEFAULT now(),
-                      ADD COLUMN IF NOT EXISTS updated_at    timestamptz DEFAULT now()
-                """)
-                cur.execute("""
-                    CREATE UNIQUE INDEX IF NOT EXISTS uq_player_match_stats_player_match
-                    ON public.player_match_stats(player_id, match_id)
-                """)
-                cur.execute("""
-                    CREATE INDEX IF NOT EXISTS idx_player_match_stats_player_id
-                    ON public.player_match_stats(player_id)
-                """)
-                # teams: roster senkronizasyon takibi için updated_at
-                cur.execute("""
-                    ALTER TABLE public.teams
-                      ADD COLUMN IF NOT EXISTS updated_at timestamptz DEFAULT now()
-                """)
-        logger.info("✅ Şema hazır")
+        if ensure_migration(_PLAYER_STATS_MIGRATION):
+            logger.info("✅ Şema hazır")
 
     # ── Oyuncular ──────────────────────────────────────────────────────────────
 
@@ -206,12 +492,7 @@ class PlayerStatsSyncer:
 
         for team_id, team_name in teams:
             try:
-                url  = f"{self.client.base_url}/teams/{team_id}"
-                resp = requests.get(
-                    url,
-                    params={'token': self.client.api_token},
-                    timeout=15
-                )
+                resp = self.client.request(f"/teams/{team_id}", timeout=15)
 
                 if resp.status_code == 404:
                     empty_teams += 1
@@ -274,7 +555,6 @@ class PlayerStatsSyncer:
 
                 total_players += len(api_players)
                 logger.info(f"  ✅ {team_name}: {len(api_players)} oyuncu")
-                time.sleep(0.15)  # Rate-limit koruması
 
             except Exception as e:
                 logger.warning(f"  ⚠️  {team_name}: {e}")
@@ -286,65 +566,32 @@ class PlayerStatsSyncer:
 
     # ── Maç İstatistikleri ────────────────────────────────────────────────────
 
-    def sync_match_stats(self, limit=500, batch_size=100):
+    def sync_match_stats(self, limit=500, batch_size=100, server_side=True):
         """
         raw_data JSONB'den takım bazlı maç istatistiklerini çıkarır.
         Ekstra API çağrısı yoktur — tüm veri zaten DB'de.
         Incremental: match_stats kaydı zaten olan maçları atlar.
 
-        Optimizasyon: tek DB bağlantısı + executemany batch insert
-        (döngü başına ayrı connection yerine → 50-100x daha hızlı)
+        server_side=True (varsayılan): games[].teams[].players[] yürüyüşü ve
+        oyuncu eşleştirmesi Postgres içinde yapılır (jsonb_array_elements →
+        INSERT ... SELECT, players join'i). raw_data ağdan hiç geçmez; Python'a
+        yalnızca maç id'leri ve satır sayıları döner. Bir parça SQL'de hata
+        verirse (beklenmedik payload şekli) SAVEPOINT'e dönülür ve o parça eski
+        Python yoluyla (maç başına hata izolasyonu) işlenir.
 
         Args:
-            limit:      Bir seferde işlenecek max maç sayısı
-            batch_size: Kaç satırda bir commit yapılacağı
+            limit:       Bir seferde işlenecek max maç sayısı
+            batch_size:  Kaç maçta bir yazılıp commit yapılacağı
+            server_side: False → raw_data çekilip Python'da parse edilir
 
         Returns:
             int: İşlenen maç sayısı
         """
-        INSERT_SQL = """
-            INSERT INTO match_stats (match_id, team_id, stats)
-            VALUES (%s, %s, %s)
-            ON CONFLICT (match_id, team_id)
-              WHERE match_id IS NOT NULL AND team_id IS NOT NULL
-            DO UPDATE SET stats = EXCLUDED.stats
-        """
-
-        INSERT_PLAYER_STATS_SQL = """
-            INSERT INTO player_match_stats (
-                player_id,
-                match_id,
-                team_id,
-                kills,
-                deaths,
-                assists,
-                headshots,
-                hs_percentage,
-                is_win,
-                stats,
-                played_at,
-                updated_at
-            )
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, now())
-            ON CONFLICT (player_id, match_id)
-            DO UPDATE SET
-                team_id       = EXCLUDED.team_id,
-                kills         = EXCLUDED.kills,
-                deaths        = EXCLUDED.deaths,
-                assists       = EXCLUDED.assists,
-                headshots     = EXCLUDED.headshots,
-                hs_percentage = EXCLUDED.hs_percentage,
-                is_win        = EXCLUDED.is_win,
-                stats         = EXCLUDED.stats,
-                played_at     = COALESCE(EXCLUDED.played_at, player_match_stats.played_at),
-                updated_at    = now()
-        """
-
         with Database.get_connection() as conn:
             with conn.cursor() as cur:
-                # 1) İşlenecek maçları çek — finished + running (canlı maçları da dahil et)
+                # 1) İşlenecek maçları seç — finished + running (canlı maçları da dahil et)
                 cur.execute("""
-                    SELECT m.id, m.team_a_id, m.team_b_id, m.winner_id, m.scheduled_at, m.raw_data
+                    SELECT m.id
                     FROM matches m
                     WHERE m.status IN ('finished', 'running')
                       AND m.raw_data IS NOT NULL
@@ -358,179 +605,251 @@ class PlayerStatsSyncer:
                     ORDER BY m.status DESC, m.id DESC
                     LIMIT %s
                 """, (limit,))
-                matches = cur.fetchall()
+                match_ids = [row[0] for row in cur.fetchall()]
 
-                if not matches:
+                if not match_ids:
                     logger.info("✅ Tüm maç istatistikleri zaten yüklü.")
                     return 0
 
-                logger.info(f"📊 {len(matches)} maç için istatistik işleniyor...")
+                mode = "server-side" if server_side else "python"
+                logger.info(f"📊 {len(match_ids)} maç için istatistik işleniyor ({mode})...")
                 processed = 0
                 skipped   = 0
-                batch     = []   # (match_id, team_id, stats_json)
-                player_batch = []
-
-                cur.execute("SELECT id, pandascore_id, nickname FROM players")
-                player_rows = cur.fetchall()
-                players_by_psid = {}
-                players_by_name = {}
-                for p_id, pandascore_id, nickname in player_rows:
-                    if pandascore_id is not None:
-                        players_by_psid[int(pandascore_id)] = p_id
-                    normalized_name = _normalize_nickname(nickname)
-                    if normalized_name and normalized_name not in players_by_name:
-                        players_by_name[normalized_name] = p_id
-
-                # 2) Python'da parse et, batch biriktir
-                for match_id, team_a_id, team_b_id, winner_id, scheduled_at, raw_data in matches:
-                    try:
-                        results = raw_data.get('results', [])
-                        games   = raw_data.get('games',   [])
-
-                        if not (team_a_id or team_b_id):
-                            skipped += 1
+                team_rows = 0
+                player_rows = 0
+                players = None   # Python yolu için lazy oyuncu indeksi
+
+                for i in range(0, len(match_ids), batch_size):
+                    chunk = match_ids[i:i + batch_size]
+                    if server_side:
+                        try:
+                            cur.execute("SAVEPOINT sp_stats")
+                            counts = self._extract_match_stats_sql(cur, chunk)
+                            cur.execute("RELEASE SAVEPOINT sp_stats")
+                            conn.commit()
+                            processed   += counts['processed']
+                            skipped     += counts['skipped']
+                            team_rows   += counts['team_rows']
+                            player_rows += counts['player_rows']
                             continue
+                        except psycopg.Error as e:
+                            cur.execute("ROLLBACK TO SAVEPOINT sp_stats")
+                            logger.warning(
+                                f"  ⚠️  SQL extraction başarısız ({len(chunk)} maç) → Python yolu: {e}"
+                            )
+
+                    if players is None:
+                        players = self._load_player_index(cur)
+                    counts = self._extract_match_stats_python(cur, chunk, players)
+                    conn.commit()
+                    processed   += counts['processed']
+                    skipped     += counts['skipped']
+                    team_rows   += counts['team_rows']
+                    player_rows += counts['player_rows']
+
+        logger.info(
+            f"\n📊 Sonuç: {processed} maç işlendi | {skipped} atlandı | "
+            f"{team_rows} takım satırı | {player_rows} oyuncu satırı"
+        )
+        return processed
 
-                        score_map = {
-                            r['team_id']: r['score']
-                            for r in (results or [])
-                            if r.get('team_id') is not None
-                        }
-
-                        games_detail = []
-                        for g in (games or []):
-                            # Harita başına oyuncu KDA'ları
-                            game_players = []
-                            for team_entry in (g.get('teams') or []):
-                                t_obj = team_entry.get('team') or {}
-                                t_id  = t_obj.get('id')
-                                t_score = team_entry.get('score')
-                                for p_entry in (team_entry.get('players') or []):
-                                    p_obj = p_entry.get('player') or {}
-                                    game_players.append({
-                                        'player_id':   p_obj.get('id'),
-                                        'player_name': p_obj.get('name') or p_obj.get('nickname'),
-                                        'team_id':     t_id,
-                                        'kills':       p_entry.get('kills'),
-                                        'deaths':      p_entry.get('deaths'),
-                                        'assists':     p_entry.get('assists'),
-                                        'headshots':   p_entry.get('headshots'),
-                                        'team_score':  t_score,
-                                    })
-
-                            # Harita başına takım skorları {team_id: score}
-                            game_team_scores = {
-                                (te.get('team') or {}).get('id'): te.get('score')
-                                for te in (g.get('teams') or [])
-                                if (te.get('team') or {}).get('id') is not None
-                            }
-
-                            games_detail.append({
-                                'position':       g.get('position'),
-                                'map_name':       (g.get('map') or {}).get('name'),
-                                'winner_id':      (g.get('winner') or {}).get('id'),
-                                'length_seconds': g.get('length'),
-                                'status':         g.get('status'),
-                                'team_scores':    game_team_scores,
-                                'players':        game_players,
+    def _extract_match_stats_sql(self, cur, match_ids):
+        """Tek parça için server-side extraction — yalnızca sayaçlar döner."""
+        cur.execute(
+            """
+            SELECT COUNT(*) FILTER (WHERE team_a_id IS NOT NULL OR team_b_id IS NOT NULL),
+                   COUNT(*) FILTER (WHERE team_a_id IS NULL AND team_b_id IS NULL)
+            FROM matches
+            WHERE id = ANY(%s) AND jsonb_typeof(raw_data) = 'object'
+            """,
+            (match_ids,),
+        )
+        processed, skipped = cur.fetchone()
+        cur.execute(_SQL_MATCH_STATS_INSERT, {'ids': match_ids})
+        team_rows = cur.rowcount
+        if self._has_nickname_norm is None:
+            cur.execute(
+                "SELECT EXISTS (SELECT 1 FROM information_schema.columns "
+                "WHERE table_schema = 'public' AND table_name = 'players' "
+                "AND column_name = 'nickname_norm')"
+            )
+            self._has_nickname_norm = bool(cur.fetchone()[0])
+        sql = _SQL_PLAYER_STATS_INSERT if self._has_nickname_norm else _SQL_PLAYER_STATS_INSERT_NO_NORM
+        cur.execute(sql, {'ids': match_ids})
+        player_rows = cur.rowcount
+        return {
+            'processed': int(processed or 0), 'skipped': int(skipped or 0),
+            'team_rows': max(team_rows, 0), 'player_rows': max(player_rows, 0),
+        }
+
+    @staticmethod
+    def _load_player_index(cur):
+        """
+        Python yolu için (pandascore_id → uuid indeksi, isim çözümleyici).
+        İsim eşlemesi süreç genelindeki EntityResolver'dan gelir (yalnızca
+        nickname → SQL yolundaki by_name ile aynı kural).
+        """
+        cur.execute("SELECT id, pandascore_id FROM players WHERE pandascore_id IS NOT NULL")
+        players_by_psid = {int(pandascore_id): p_id for p_id, pandascore_id in cur.fetchall()}
+        resolver = get_resolver('player')
+        resolver.refresh(cur)
+        return players_by_psid, resolver
+
+    def _extract_match_stats_python(self, cur, match_ids, players):
+        """
+        Eski yol: raw_data çekilir, games[].teams[].players[] Python'da yürünür.
+        Maç başına try/except → bozuk tek payload parçanın geri kalanını düşürmez.
+        """
+        players_by_psid, resolver = players
+        cur.execute("""
+            SELECT m.id, m.team_a_id, m.team_b_id, m.winner_id, m.scheduled_at, m.raw_data
+            FROM matches m
+            WHERE m.id = ANY(%s)
+            ORDER BY m.status DESC, m.id DESC
+        """, (match_ids,))
+        matches = cur.fetchall()
+
+        processed = 0
+        skipped   = 0
+        batch     = []   # (match_id, team_id, stats_json)
+        player_batch = []
+
+        for match_id, team_a_id, team_b_id, winner_id, scheduled_at, raw_data in matches:
+            try:
+                results = raw_data.get('results', [])
+                games   = raw_data.get('games',   [])
+
+                if not (team_a_id or team_b_id):
+                    skipped += 1
+                    continue
+
+                score_map = {
+                    r['team_id']: r['score']
+                    for r in (results or [])
+                    if r.get('team_id') is not None
+                }
+
+                games_detail = []
+                for g in (games or []):
+                    # Harita başına oyuncu KDA'ları
+                    game_players = []
+                    for team_entry in (g.get('teams') or []):
+                        t_obj = team_entry.get('team') or {}
+                        t_id  = t_obj.get('id')
+                        t_score = team_entry.get('score')
+                        for p_entry in (team_entry.get('players') or []):
+                            p_obj = p_entry.get('player') or {}
+                            game_players.append({
+                                'player_id':   p_obj.get('id'),
+                                'player_name': p_obj.get('name') or p_obj.get('nickname'),
+                                'team_id':     t_id,
+                                'kills':       p_entry.get('kills'),
+                                'deaths':      p_entry.get('deaths'),
+                                'assists':     p_entry.get('assists'),
+                                'headshots':   p_entry.get('headshots'),
+                                'team_score':  t_score,
                             })
 
-                        for tid in [team_a_id, team_b_id]:
-                            if not tid:
-                                continue
-                            batch.append((
-                                match_id,
-                                tid,
-                                json.dumps({
-                                    'score':        score_map.get(tid),
-                                    'games_detail': games_detail,
-                                })
-                            ))
+                    # Harita başına takım skorları {team_id: score}
+                    game_team_scores = {
+                        (te.get('team') or {}).get('id'): te.get('score')
+                        for te in (g.get('teams') or [])
+                        if (te.get('team') or {}).get('id') is not None
+                    }
+
+                    games_detail.append({
+                        'position':       g.get('position'),
+                        'map_name':       (g.get('map') or {}).get('name'),
+                        'winner_id':      (g.get('winner') or {}).get('id'),
+                        'length_seconds': g.get('length'),
+                        'status':         g.get('status'),
+                        'team_scores':    game_team_scores,
+                        'players':        game_players,
+                    })
+
+                for tid in [team_a_id, team_b_id]:
+                    if not tid:
+                        continue
+                    batch.append((
+                        match_id,
+                        tid,
+                        json.dumps({
+                            'score':        score_map.get(tid),
+                            'games_detail': games_detail,
+                        })
+                    ))
 
-                        player_rows_for_match = self._extract_player_stat_rows(raw_data)
-                        for stat_row in player_rows_for_match:
+                player_rows_for_match = self._extract_player_stat_rows(raw_data)
+                for stat_row in player_rows_for_match:
+                    player_uuid = None
+                    player_psid = stat_row.get('player_id')
+                    if player_psid is not None:
+                        try:
+                            player_uuid = players_by_psid.get(int(player_psid))
+                        except (TypeError, ValueError):
                             player_uuid = None
-                            player_psid = stat_row.get('player_id')
-                            if player_psid is not None:
-                                try:
-                                    player_uuid = players_by_psid.get(int(player_psid))
-                                except (TypeError, ValueError):
-                                    player_uuid = None
-
-                            if not player_uuid:
-                                normalized_name = _normalize_nickname(stat_row.get('player_name'))
-                                if normalized_name:
-                                    player_uuid = players_by_name.get(normalized_name)
-
-                            if not player_uuid:
-                                continue
-
-                            kills = _to_float(stat_row.get('kills'))
-                            deaths = _to_float(stat_row.get('deaths'))
-                            assists = _to_float(stat_row.get('assists'))
-                            headshots = _to_float(stat_row.get('headshots'))
-                            hs_pct = _to_float(stat_row.get('hs_pct') or stat_row.get('hs_percentage'))
-
-                            if hs_pct is None and kills and headshots is not None and kills > 0:
-                                hs_pct = (headshots / kills) * 100
-
-                            row_team_id = stat_row.get('team_id')
-                            if row_team_id is not None:
-                                try:
-                                    row_team_id = int(row_team_id)
-                                except (TypeError, ValueError):
-                                    row_team_id = None
-
-                            is_win = None
-                            if winner_id is not None and row_team_id is not None:
-                                is_win = int(winner_id) == int(row_team_id)
-
-                            payload_stats = {
-                                'source': stat_row.get('source') or 'raw_data',
-                                'kda': _to_float(stat_row.get('kda')),
-                                'win_rate': _to_float(stat_row.get('win_rate')),
-                                'samples': stat_row.get('samples'),
-                            }
-
-                            player_batch.append((
-                                player_uuid,
-                                match_id,
-                                row_team_id,
-                                kills,
-                                deaths,
-                                assists,
-                                headshots,
-                                hs_pct,
-                                is_win,
-                                json.dumps(payload_stats),
-                                scheduled_at,
-                            ))
-
-                        processed += 1
 
-                        # 3) batch_size dolunca flush et
-                        if len(batch) >= batch_size:
-                            cur.executemany(INSERT_SQL, batch)
-                            if player_batch:
-                                cur.executemany(INSERT_PLAYER_STATS_SQL, player_batch)
-                            conn.commit()
-                            batch.clear()
-                            player_batch.clear()
+                    if not player_uuid:
+                        player_uuid = resolver.resolve(stat_row.get('player_name'), alias=False)
 
-                    except Exception as e:
-                        logger.warning(f"  ⚠️  match {match_id}: {e}")
+                    if not player_uuid:
                         continue
 
-                # 4) Kalan satırları yaz
-                if batch:
-                    cur.executemany(INSERT_SQL, batch)
-                if player_batch:
-                    cur.executemany(INSERT_PLAYER_STATS_SQL, player_batch)
-                if batch or player_batch:
-                    conn.commit()
+                    kills = _to_float(stat_row.get('kills'))
+                    deaths = _to_float(stat_row.get('deaths'))
+                    assists = _to_float(stat_row.get('assists'))
+                    headshots = _to_float(stat_row.get('headshots'))
+                    hs_pct = _to_float(stat_row.get('hs_pct') or stat_row.get('hs_percentage'))
+
+                    if hs_pct is None and kills and headshots is not None and kills > 0:
+                        hs_pct = (headshots / kills) * 100
+
+                    row_team_id = stat_row.get('team_id')
+                    if row_team_id is not None:
+                        try:
+                            row_team_id = int(row_team_id)
+                        except (TypeError, ValueError):
+                            row_team_id = None
+
+                    is_win = None
+                    if winner_id is not None and row_team_id is not None:
+                        is_win = int(winner_id) == int(row_team_id)
+
+                    payload_stats = {
+                        'source': stat_row.get('source') or 'raw_data',
+                        'kda': _to_float(stat_row.get('kda')),
+                        'win_rate': _to_float(stat_row.get('win_rate')),
+                        'samples': stat_row.get('samples'),
+                    }
+
+                    player_batch.append((
+                        player_uuid,
+                        match_id,
+                        row_team_id,
+                        kills,
+                        deaths,
+                        assists,
+                        headshots,
+                        hs_pct,
+                        is_win,
+                        json.dumps(payload_stats),
+                        scheduled_at,
+                    ))
 
-        logger.info(f"\n📊 Sonuç: {processed} maç işlendi | {skipped} atlandı")
-        return processed
+                processed += 1
+
+            except Exception as e:
+                logger.warning(f"  ⚠️  match {match_id}: {e}")
+                continue
+
+        if batch:
+            cur.executemany(_MATCH_STATS_INSERT, batch)
+        if player_batch:
+            cur.executemany(_PLAYER_STATS_INSERT, player_batch)
+        return {
+            'processed': processed, 'skipped': skipped,
+            'team_rows': len(batch), 'player_rows': len(player_batch),
+        }
 
     def _extract_player_stat_rows(self, raw_data):
         """Raw match payload içindeki player-level metrik satırlarını normalize eder."""
@@ -596,7 +915,8 @@ class PlayerStatsSyncer:
 
         Args:
             days:       Kaç günlük geçmişe bakılacağı
-            batch_size: Kaç takım sonra kısa bekleme yapılacağı (rate-limit)
+            batch_size: Geriye dönük uyumluluk için; pacing artık PandaScoreClient
+                        limiter'ında (X-Rate-Limit-Remaining'e göre adaptif)
             force:      True ise zaten yüklü kadroları da yenile
 
         Returns:
@@ -645,26 +965,16 @@ class PlayerStatsSyncer:
         teams_skipped = 0
         errors = 0
 
-        with Database.get_connection() as conn:
-            for idx, (team_id, team_name) in enumerate(teams, 1):
-                result = self._fetch_and_upsert_team_players(team_id, team_name, conn)
-
-                if result is None:
-                    errors += 1
-                elif result['upserted'] > 0:
-                    players_upserted += result['upserted']
-                    players_flushed  += result['flushed']
-                    teams_processed  += 1
-                    flush_note = f", {result['flushed']} serbest" if result['flushed'] > 0 else ""
-                    logger.info(f"  [{idx}/{len(teams)}] ✅ {team_name}: "
-                          f"{result['upserted']} oyuncu{flush_note}")
-
-                # Rate-limit koruması: her batch_size takımda bir kısa bekleme
-                if idx % batch_size == 0:
-                    logger.info(f"  ⏸  {batch_size} takım işlendi, 2s bekleniyor...")
-                    time.sleep(2)
-                else:
-                    time.sleep(0.15)
+        for idx, (team_id, team_name, result) in enumerate(self._sync_rosters(teams), 1):
+            if result is None:
+                errors += 1
+            elif result['upserted'] > 0:
+                players_upserted += result['upserted']
+                players_flushed  += result['flushed']
+                teams_processed  += 1
+                flush_note = f", {result['flushed']} serbest" if result['flushed'] > 0 else ""
+                logger.info(f"  [{idx}/{len(teams)}] ✅ {team_name}: "
+                      f"{result['upserted']} oyuncu{flush_note}")
 
         logger.info(f"\n📊 Kadro sync sonucu:")
         logger.info(f"   Takım işlendi  : {teams_processed}")
@@ -680,117 +990,178 @@ class PlayerStatsSyncer:
             'errors': errors,
         }
 
-    # ── Ortak Yardımcı: Tek Takım İçin Oyuncu Çek+Upsert ──────────────────────
+    # ── Ortak Yardımcı: Eşzamanlı Kadro Çekimi + Tek DB Yazıcı ────────────────
 
-    def _fetch_and_upsert_team_players(self, team_id, team_name, conn):
+    def _fetch_team_roster(self, team_id, team_name):
         """
-        PandaScore /teams/{team_id} endpoint'ini çağırır, oyuncuları players
-        tablosuna upsert eder.
+        PandaScore /teams/{team_id} → oyuncu listesi. Yalnızca HTTP (DB'ye
+        dokunmaz) → worker thread'lerinde güvenle çalışır.
 
-        Exponential backoff: 429 → 10s, 20s, 40s (max 3 deneme)
-        image_url dahil tüm alanlar güncellenir.
-
-        Args:
-            team_id  : PandaScore takım ID'si (int)
-            team_name: Log için takım adı (str)
-            conn     : Aktif DB bağlantısı
+        Rate-limit / 429 / 5xx / ağ hatası retry'ı PandaScoreClient.request'in
+        paylaşılan limiter'ında (global istek/sn bütçesi + cooldown) yapılır;
+        kaç thread olursa olsun toplam hız bu bütçeyi aşmaz.
 
         Returns:
-            int | None  →  kaydedilen oyuncu sayısı; hata/boş ise None
+            list | None  →  API oyuncuları (boş kadro = []); 404/hata ise None
         """
-        url = f"{self.client.base_url}/teams/{team_id}"
-        max_retries = 3
-
-        for attempt in range(max_retries):
-            try:
-                resp = requests.get(
-                    url,
-                    params={'token': self.client.api_token},
-                    timeout=20,
-                )
-            except requests.exceptions.RequestException as exc:
-                logger.warning(f"    ⚠️  {team_name} (attempt {attempt+1}): {exc}")
-                time.sleep(5 * (attempt + 1))
-                continue
-
-            if resp.status_code == 404:
-                return None        # Takım artık mevcut değil
-
-            if resp.status_code == 429:
-                wait = 10 * (2 ** attempt)   # 10s → 20s → 40s
-                logger.info(f"    ⏳ Rate-limit — {wait}s bekleniyor "
-                      f"(attempt {attempt+1}/{max_retries})...")
-                time.sleep(wait)
-                continue           # Tekrar dene
-
-            if resp.status_code == 503:        # PandaScore bazen geçici kapanır
-                wait = 15 * (attempt + 1)
-                logger.warning(f"    ⚠️  503 Service Unavailable — {wait}s bekleniyor...")
-                time.sleep(wait)
-                continue
-
-            if resp.status_code != 200:
-                logger.warning(f"    ⚠️  {team_name}: API {resp.status_code}")
-                return None
-
-            # ── Başarılı yanıt ──────────────────────────────────────────────
-            api_players = resp.json().get('players', [])
-            if not api_players:
-                return {'upserted': 0, 'flushed': 0}   # Boş kadro (bant dışı takım vb.)
-
-            api_ps_ids = [p['id'] for p in api_players]
-
-            with conn.cursor() as cur:
-                for p in api_players:
-                    parts     = [p.get('first_name', ''), p.get('last_name', '')]
-                    real_name = ' '.join(x for x in parts if x).strip() or None
+        try:
+            resp = self.client.request(f"/teams/{team_id}", timeout=20, max_attempts=4)
+        except requests.exceptions.RequestException as exc:
+            logger.error(f"    ❌ {team_name}: {exc}")
+            return None
 
-                    cur.execute("""
-                        INSERT INTO players
-                          (id, nickname, real_name, role, image_url,
-                           pandascore_id, team_pandascore_id)
-                        VALUES (%s, %s, %s, %s, %s, %s, %s)
-                        ON CONFLICT (pandascore_id)
-                          WHERE pandascore_id IS NOT NULL
-                        DO UPDATE SET
-                          nickname           = EXCLUDED.nickname,
-                          real_name          = EXCLUDED.real_name,
-                          role               = EXCLUDED.role,
-                          image_url          = EXCLUDED.image_url,
-                          team_pandascore_id = EXCLUDED.team_pandascore_id
-                    """, (
-                        _player_uuid(p['id']),
-                        p.get('name') or 'Unknown',
-                        real_name,
-                        p.get('role'),
-                        p.get('image_url'),   # ← mutlaka çekiliyor
-                        p['id'],
-                        team_id,
-                    ))
-
-                # ── Roster Flush ──────────────────────────────────────────────
-                # Bu takımda kayıtlı ama güncel API kadrosunda olmayan oyuncuların
-                # team_pandascore_id'sini NULL'a çek (serbest oyuncu).
-                # psycopg3'te list → bigint[] array olarak geçirilir; != ALL(...) kullanılır.
-                cur.execute("""
-                    UPDATE players
-                    SET team_pandascore_id = NULL
-                    WHERE team_pandascore_id = %s
-                      AND pandascore_id IS NOT NULL
-                      AND pandascore_id != ALL(%s::bigint[])
-                """, (team_id, api_ps_ids))
-                flushed = cur.rowcount
+        if resp.status_code == 404:
+            return None        # Takım artık mevcut değil
 
-            conn.commit()
+        if resp.status_code != 200:
+            logger.warning(f"    ⚠️  {team_name}: API {resp.status_code}")
+            return None
 
-            if flushed > 0:
-                logger.info(f"    🔄 {team_name}: {flushed} eski oyuncu serbest bırakıldı (kadro dışı)")
+        players = resp.json().get('players') or []
+        return [p for p in players if isinstance(p, dict) and p.get('id') is not None]
 
-            return {'upserted': len(api_players), 'flushed': flushed}
+    def _sync_rosters(self, teams):
+        """
+        [(team_id, team_name)] için kadroları çeker ve yazar; her takım için
+        (team_id, team_name, result) üretir. result: {'upserted', 'flushed'} |
+        None (404/hata).
+
+        Fetch'ler en fazla ROSTER_FETCH_WORKERS eşzamanlı istekle thread
+        pool'da; hız bütçesi client limiter'ında. Yazım bu thread'deki TEK
+        bağlantıdan, tamamlanan takımlar ROSTER_WRITE_BATCH'lik gruplar halinde
+        (grup başına bir transaction) yapılır. Sıra tamamlanma sırasıdır.
+        """
+        teams = list(teams)
+        if not teams:
+            return
+        workers = max(1, min(ROSTER_FETCH_WORKERS, len(teams)))
+        with Database.get_connection() as conn, \
+                ThreadPoolExecutor(max_workers=workers, thread_name_prefix='roster') as pool:
+            futures = {
+                pool.submit(self._fetch_team_roster, team_id, team_name): (team_id, team_name)
+                for team_id, team_name in teams
+            }
+            pending = []
+            for future in as_completed(futures):
+                team_id, team_name = futures[future]
+                try:
+                    players = future.result()
+                except Exception as exc:   # bozuk JSON vb. — tek takımı düşür
+                    logger.error(f"    ❌ {team_name}: {exc}")
+                    players = None
+                pending.append((team_id, team_name, players))
+                if len(pending) >= ROSTER_WRITE_BATCH:
+                    yield from self._write_roster_batch(conn, pending)
+                    pending = []
+            if pending:
+                yield from self._write_roster_batch(conn, pending)
+
+    def _write_roster_batch(self, conn, batch):
+        """
+        Çekilmiş kadroları tek transaction'da yazar. Toplu yazım hata verirse
+        takım takım tekrar denenir (bozuk tek takım grubu düşürmesin).
+        """
+        results = {
+            team_id: (None if players is None else {'upserted': 0, 'flushed': 0})
+            for team_id, _, players in batch
+        }
+        rosters = [(team_id, players) for team_id, _, players in batch if players]
+        if rosters:
+            try:
+                with conn.cursor() as cur:
+                    flushed = self._upsert_rosters(cur, rosters)
+                conn.commit()
+            except psycopg.Error as exc:
+                conn.rollback()
+                logger.warning(f"  ⚠️  Toplu kadro yazımı başarısız ({len(rosters)} takım) → takım takım: {exc}")
+                flushed = {}
+                for team_id, players in list(rosters):
+                    try:
+                        with conn.cursor() as cur:
+                            flushed.update(self._upsert_rosters(cur, [(team_id, players)]))
+                        conn.commit()
+                    except psycopg.Error as team_exc:
+                        conn.rollback()
+                        logger.error(f"    ❌ team {team_id}: {team_exc}")
+                        results[team_id] = None
+                        rosters.remove((team_id, players))
+            for team_id, players in rosters:
+                results[team_id] = {'upserted': len(players), 'flushed': flushed.get(team_id, 0)}
+
+        out = []
+        for team_id, team_name, _ in batch:
+            result = results[team_id]
+            if result and result['flushed'] > 0:
+                logger.info(f"    🔄 {team_name}: {result['flushed']} eski oyuncu serbest bırakıldı (kadro dışı)")
+            out.append((team_id, team_name, result))
+        return out
+
+    @staticmethod
+    def _upsert_rosters(cur, rosters):
+        """
+        [(team_id, api_players)] → players upsert (tek INSERT ... SELECT unnest)
+        + roster flush (tek UPDATE). image_url dahil tüm alanlar güncellenir.
 
-        # Tüm denemeler başarısız
-        logger.error(f"    ❌ {team_name}: {max_retries} denemede başarılı olunamadı")
-        return None
+        Returns:
+            dict: team_id → serbest bırakılan oyuncu sayısı
+        """
+        # Aynı oyuncu birden çok kadroda → sıralı yazımdaki gibi SON takım kazanır
+        # (ON CONFLICT aynı satırı iki kez güncelleyemez).
+        rows = {}
+        for team_id, players in rosters:
+            for p in players:
+                parts     = [p.get('first_name', ''), p.get('last_name', '')]
+                real_name = ' '.join(x for x in parts if x).strip() or None
+                rows[p['id']] = (
+                    _player_uuid(p['id']),
+                    p.get('name') or 'Unknown',
+                    real_name,
+                    p.get('role'),
+                    p.get('image_url'),   # ← mutlaka çekiliyor
+                    p['id'],
+                    team_id,
+                )
+        columns = list(zip(*rows.values()))
+        cur.execute("""
+            INSERT INTO players
+              (id, nickname, real_name, role, image_url,
+               pandascore_id, team_pandascore_id)
+            SELECT * FROM unnest(
+                %s::uuid[], %s::text[], %s::text[], %s::text[], %s::text[],
+                %s::bigint[], %s::bigint[]
+            )
+            ON CONFLICT (pandascore_id)
+              WHERE pandascore_id IS NOT NULL
+            DO UPDATE SET
+              nickname           = EXCLUDED.nickname,
+              real_name          = EXCLUDED.real_name,
+              role               = EXCLUDED.role,
+              image_url          = EXCLUDED.image_url,
+              team_pandascore_id = EXCLUDED.team_pandascore_id
+        """, [list(col) for col in columns])
+
+        # ── Roster Flush ──────────────────────────────────────────────────
+        # Bu takımlarda kayıtlı ama güncel API kadrosunda olmayan oyuncuların
+        # team_pandascore_id'sini NULL'a çek (serbest oyuncu).
+        roster_team_ids = [team_id for team_id, players in rosters for _ in players]
+        roster_player_ids = [p['id'] for _, players in rosters for p in players]
+        cur.execute("""
+            UPDATE players p
+            SET team_pandascore_id = NULL
+            FROM unnest(%s::bigint[]) AS t(team_id)
+            WHERE p.team_pandascore_id = t.team_id
+              AND p.pandascore_id IS NOT NULL
+              AND NOT EXISTS (
+                  SELECT 1
+                  FROM unnest(%s::bigint[], %s::bigint[]) AS r(team_id, pandascore_id)
+                  WHERE r.team_id = t.team_id AND r.pandascore_id = p.pandascore_id
+              )
+            RETURNING t.team_id
+        """, ([team_id for team_id, _ in rosters], roster_team_ids, roster_player_ids))
+        flushed = {}
+        for (team_id,) in cur.fetchall():
+            flushed[team_id] = flushed.get(team_id, 0) + 1
+        return flushed
 
     # ── 1) Eksik Kadroları Tara (teams → players JOIN) ─────────────────────────
 
@@ -830,22 +1201,15 @@ class PlayerStatsSyncer:
         upserted  = 0
         errors    = 0
 
-        with Database.get_connection() as conn:
-            for idx, (team_id, team_name) in enumerate(teams, 1):
-                result = self._fetch_and_upsert_team_players(team_id, team_name, conn)
-
-                if result is None:
-                    errors += 1
-                elif result['upserted'] > 0:
-                    upserted  += result['upserted']
-                    processed += 1
-                    logger.info(f"  [{idx}/{len(teams)}] ✅ {team_name}: {result['upserted']} oyuncu")
-                else:
-                    logger.info(f"  [{idx}/{len(teams)}] ➖ {team_name}: boş kadro")
-
-                # Batch arası kısa bekleme (rate-limit koruması)
-                delay = 0.2 if (idx % batch_size != 0) else 2.0
-                time.sleep(delay)
+        for idx, (team_id, team_name, result) in enumerate(self._sync_rosters(teams), 1):
+            if result is None:
+                errors += 1
+            elif result['upserted'] > 0:
+                upserted  += result['upserted']
+                processed += 1
+                logger.info(f"  [{idx}/{len(teams)}] ✅ {team_name}: {result['upserted']} oyuncu")
+            else:
+                logger.info(f"  [{idx}/{len(teams)}] ➖ {team_name}: boş kadro")
 
         logger.info(f"\n📊 Eksik kadro sync:")
         logger.info(f"   İşlenen takım  : {processed}")
@@ -893,15 +1257,10 @@ class PlayerStatsSyncer:
             for lid in league_ids:
                 page = 1
                 while True:
-                    url = f"{self.client.base_url}/{GAME_SLUGS[slug]}/leagues/{lid}/teams"
                     try:
-                        resp = requests.get(
-                            url,
-                            params={
-                                'token':    self.client.api_token,
-                                'per_page': 50,
-                                'page':     page,
-                            },
+                        resp = self.client.request(
+                            f"/{GAME_SLUGS[slug]}/leagues/{lid}/teams",
+                            params={'per_page': 50, 'page': page},
                             timeout=20,
                         )
                     except requests.exceptions.RequestException as exc:
@@ -910,10 +1269,6 @@ class PlayerStatsSyncer:
 
                     if resp.status_code == 404:
                         break   # Bu lig artık yok
-                    if resp.status_code == 429:
-                        logger.info("  ⏳ Rate-limit — 15s bekleniyor...")
-                        time.sleep(15)
-                        continue
                     if resp.status_code != 200:
                         logger.warning(f"  ⚠️  lig {lid}: API {resp.status_code}")
                         break
@@ -931,7 +1286,6 @@ class PlayerStatsSyncer:
                     if len(data) < 50:
                         break   # Son sayfa
                     page += 1
-                    time.sleep(0.3)
 
         teams_found = len(all_teams)
         logger.info(f"\n✅ {leagues_scanned} lig tarandı → {teams_found} benzersiz takım bulundu")
@@ -958,21 +1312,15 @@ class PlayerStatsSyncer:
                   f"{len(all_teams)} takım işlenecek")
 
         logger.info(f"\n👤 {len(all_teams)} takım için kadro çekiliyor...")
-        with Database.get_connection() as conn:
-            for idx, (team_id, team_name) in enumerate(all_teams.items(), 1):
-                result = self._fetch_and_upsert_team_players(team_id, team_name, conn)
-
-                if result is None:
-                    errors += 1
-                elif result['upserted'] > 0:
-                    players_upserted += result['upserted']
-                    flush_note = f", {result['flushed']} serbest" if result['flushed'] > 0 else ""
-                    logger.info(f"  [{idx}/{len(all_teams)}] ✅ {team_name}: {result['upserted']} oyuncu{flush_note}")
-                else:
-                    logger.info(f"  [{idx}/{len(all_teams)}] ➖ {team_name}: boş kadro")
-
-                delay = 0.25 if (idx % 50 != 0) else 3.0
-                time.sleep(delay)
+        for idx, (team_id, team_name, result) in enumerate(self._sync_rosters(all_teams.items()), 1):
+            if result is None:
+                errors += 1
+            elif result['upserted'] > 0:
+                players_upserted += result['upserted']
+                flush_note = f", {result['flushed']} serbest" if result['flushed'] > 0 else ""
+                logger.info(f"  [{idx}/{len(all_teams)}] ✅ {team_name}: {result['upserted']} oyuncu{flush_note}")
+            else:
+                logger.info(f"  [{idx}/{len(all_teams)}] ➖ {team_name}: boş kadro")
 
         logger.info(f"\n📊 Lig bazlı kadro sync:")
         logger.info(f"   Lig tarandı    : {leagues_scanned}")
@@ -1033,22 +1381,16 @@ class PlayerStatsSyncer:
         players_flushed  = 0
         errors           = 0
 
-        with Database.get_connection() as conn:
-            for idx, (team_id, team_name) in enumerate(teams, 1):
-                result = self._fetch_and_upsert_team_players(team_id, team_name, conn)
-
-                if result is None:
-                    errors += 1
-                else:
-                    teams_checked    += 1
-                    players_upserted += result['upserted']
-                    players_flushed  += result['flushed']
-                    if result['flushed'] > 0:
-                        logger.info(f"  [{idx}/{len(teams)}] 🔄 {team_name}: "
-                              f"{result['upserted']} aktif, {result['flushed']} serbest bırakıldı")
-
-                delay = 0.15 if (idx % 50 != 0) else 2.0
-                time.sleep(delay)
+        for idx, (team_id, team_name, result) in enumerate(self._sync_rosters(teams), 1):
+            if result is None:
+                errors += 1
+            else:
+                teams_checked    += 1
+                players_upserted += result['upserted']
+                players_flushed  += result['flushed']
+                if result['flushed'] > 0:
+                    logger.info(f"  [{idx}/{len(teams)}] 🔄 {team_name}: "
+                          f"{result['upserted']} aktif, {result['flushed']} serbest bırakıldı")
 
         logger.info(f"\n📊 Roster Flush sonucu:")
         logger.info(f"   Takım kontrol  : {teams_checked}")
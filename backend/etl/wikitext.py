@@ -0,0 +1,179 @@
+"""
+Tek geçişli wikitext şablon tokenizer'ı.
+
+Eski yardımcılar (_extract_templates / _extract_named_templates /
+_split_params_brace_aware) metni Python'da karakter karakter dolaşıyordu
+(her konumda text[i:i+2] dilimi). Yüzlerce KB'lık turnuva / aylık transfer
+sayfalarında bu hem yavaş hem de aynı bloklar için tekrar tekrar yapılıyordu.
+
+Burada sınırlar derlenmiş regex `finditer` ile taranır (C seviyesinde):
+  • parse(text) → TemplateTree: {{ / }} token'larından bir kez şablon ağacı
+  • tree.top_level()            → en dış şablonlar
+  • tree.named("Match", within) → adı prefix ile başlayan şablonlar (iç içe dahil)
+  • tree.params(node)           → depth-0 '|' ile ayrılmış parametreler
+  • split_params(block)         → string blok için aynı ayrıştırma
+
+Çıktı eski fonksiyonlarla birebir aynıdır (bench_wikitext.py doğrular). Tek
+fark kaynağı tek sayılı '{' dizileridir ("{{{Match"): eski `str.find` bu
+durumda token hizasının dışında eşleşebildiği için named() o metinlerde eski
+algoritmanın regex'li karşılığına düşer.
+"""
+from __future__ import annotations
+
+import re
+from typing import Dict, List, Optional
+
+_BRACE_RE = re.compile(r"\{\{|\}\}")
+_TOKEN_RE = re.compile(r"\{\{|\}\}|\[\[|\]\]|\|")
+# Uzunluğu tek ve ≥3 olan '{' dizisi → str.find hizası token hizasından sapabilir
+_ODD_OPEN_RUN_RE = re.compile(r"(?<!\{)\{(?:\{\{)+(?!\{)")
+
+
+class Template:
+    """Metindeki bir şablonun [start, end) aralığı (end=None → kapanmamış)."""
+
+    __slots__ = ("start", "end", "children")
+
+    def __init__(self, start: int, end: Optional[int] = None) -> None:
+        self.start = start
+        self.end = end
+        self.children: List["Template"] = []
+
+
+class TemplateTree:
+    """Bir wikitext'in şablon ağacı — parse() ile bir kez kurulur."""
+
+    def __init__(self, text: str) -> None:
+        self.text = text or ""
+        self.roots: List[Template] = []
+        self._aligned = _ODD_OPEN_RUN_RE.search(self.text) is None
+
+        stack: List[Template] = []
+        for m in _BRACE_RE.finditer(self.text):
+            if m.group() == "{{":
+                node = Template(m.start())
+                (stack[-1].children if stack else self.roots).append(node)
+                stack.append(node)
+            elif stack:
+                stack.pop().end = m.end()
+            # depth 0'daki başıboş '}}' yok sayılır
+
+    def text_of(self, node: Template) -> str:
+        return self.text[node.start:node.end]
+
+    def top_level(self) -> List[Template]:
+        """En dış şablonlar; ilk kapanmamış şablonda durur."""
+        out: List[Template] = []
+        for node in self.roots:
+            if node.end is None:
+                break
+            out.append(node)
+        return out
+
+    def named(self, name_prefix: str, within: Optional[Template] = None) -> List[Template]:
+        """
+        Adı name_prefix ile başlayan (ardından harf gelmeyen) şablonlar, sayfa
+        sırasıyla. Eşleşen şablonun içine inilmez; kapanmamış eşleşmede durur.
+        within verilirse yalnızca o şablonun (kendisi dahil) alt ağacı taranır.
+        """
+        text = self.text
+        needle = "{{" + name_prefix
+        bound = within.end if within is not None else len(text)
+        if not self._aligned:
+            return self._named_scan(needle, within.start if within is not None else 0, bound)
+
+        out: List[Template] = []
+        stack = [within] if within is not None else list(reversed(self.roots))
+        while stack:
+            node = stack.pop()
+            if text.startswith(needle, node.start, bound):
+                after = node.start + len(needle)
+                if not (after < bound and text[after].isalpha()):
+                    if node.end is None:
+                        break
+                    out.append(node)
+                    continue
+            stack.extend(reversed(node.children))
+        return out
+
+    def _named_scan(self, needle: str, lo: int, hi: int) -> List[Template]:
+        """Hizasız metinler için eski find + depth taraması (regex token'larıyla)."""
+        text = self.text
+        out: List[Template] = []
+        i = lo
+        while True:
+            start = text.find(needle, i, hi)
+            if start == -1:
+                break
+            after = start + len(needle)
+            if after < hi and text[after].isalpha():
+                i = start + 2
+                continue
+            depth = 0
+            end = None
+            for m in _BRACE_RE.finditer(text, start, hi):
+                depth += 1 if m.group() == "{{" else -1
+                if depth == 0:
+                    end = m.end()
+                    break
+            if end is None:
+                break
+            out.append(Template(start, end))
+            i = end
+        return out
+
+    def params(self, node: Template) -> Dict[str, str]:
+        """Şablonun parametreleri (adı atlanır; isimsizler _1, _2, ...)."""
+        return _split_span(self.text, node.start + 2, node.end - 2)
+
+
+def parse(text: str) -> TemplateTree:
+    return TemplateTree(text)
+
+
+def split_params(block: str) -> Dict[str, str]:
+    """
+    Bir şablon bloğunun parametrelerini, nested {{...}} ve [[...]] içindeki
+    '|' karakterlerini yok sayarak ayrıştırır (depth-0 split).
+    """
+    block = block or ""
+    if block.startswith("{{") and block.endswith("}}"):
+        return _split_span(block, 2, len(block) - 2)
+    return _split_span(block, 0, len(block))
+
+
+def _split_span(text: str, lo: int, hi: int) -> Dict[str, str]:
+    parts: List[str] = []
+    curly = square = 0
+    seg = lo
+    for m in _TOKEN_RE.finditer(text, lo, max(lo, hi)):
+        tok = m.group()
+        if tok == "|":
+            if curly == 0 and square == 0:
+                parts.append(text[seg:m.start()])
+                seg = m.end()
+        elif tok == "{{":
+            curly += 1
+        elif tok == "}}":
+            curly -= 1
+        elif tok == "[[":
+            square += 1
+        else:
+            square -= 1
+    if seg < hi:
+        parts.append(text[seg:hi])
+
+    # İlk parça template adıdır → atla
+    params: Dict[str, str] = {}
+    positional = 1
+    for part in parts[1:]:
+        chunk = part.strip()
+        if not chunk:
+            continue
+        if "=" in chunk:
+            key, value = chunk.split("=", 1)
+            params[key.strip()] = value.strip()
+        else:
+            params[f"_{positional}"] = chunk
+            positional += 1
+    return params
@@ -14,7 +14,6 @@ Kullanım:
 """
 import argparse
 import logging
-import time
 import uuid
 import os
 import requests
@@ -24,6 +23,8 @@ from supabase import create_client
 
 load_dotenv()
 
+from etl.pandascore_client import PandaScoreClient
+
 logging.basicConfig(
     level=logging.INFO,
     format='[%(asctime)s] %(message)s',
@@ -34,7 +35,16 @@ log = logging.getLogger(__name__)
 SUPABASE_URL       = os.getenv('SUPABASE_URL')
 SUPABASE_KEY       = os.getenv('SUPABASE_SERVICE_KEY')
 PANDASCORE_TOKEN   = os.getenv('PANDASCORE_TOKEN')
-PANDASCORE_BASE    = 'https://api.pandascore.co'
+
+_pandascore = None
+
+
+def _client() -> PandaScoreClient:
+    # Paylaşılan keep-alive Session + rate limiter (bkz. PandaScoreClient.request)
+    global _pandascore
+    if _pandascore is None:
+        _pandascore = PandaScoreClient()
+    return _pandascore
 
 
 def _player_uuid(pandascore_id: int) -> str:
@@ -63,29 +73,19 @@ def fetch_active_teams(sb, days: int) -> list[dict]:
 
 
 def fetch_pandascore_roster(team_id: int) -> list[dict] | None:
-    url = f"{PANDASCORE_BASE}/teams/{team_id}"
-    for attempt in range(3):
-        try:
-            resp = requests.get(url, params={'token': PANDASCORE_TOKEN}, timeout=20)
-        except requests.RequestException as e:
-            log.warning(f"    ağ hatası (deneme {attempt+1}): {e}")
-            time.sleep(5 * (attempt + 1))
-            continue
-
-        if resp.status_code == 404:
-            return None
-        if resp.status_code == 429:
-            wait = 10 * (2 ** attempt)
-            log.info(f"    rate-limit — {wait}s bekleniyor...")
-            time.sleep(wait)
-            continue
-        if resp.status_code != 200:
-            log.warning(f"    PandaScore {resp.status_code}")
-            return None
+    try:
+        resp = _client().request(f"/teams/{team_id}", timeout=20, max_attempts=4)
+    except requests.RequestException as e:
+        log.warning(f"    ağ hatası: {e}")
+        return None
 
-        return resp.json().get('players', [])
+    if resp.status_code == 404:
+        return None
+    if resp.status_code != 200:
+        log.warning(f"    PandaScore {resp.status_code}")
+        return None
 
-    return None
+    return resp.json().get('players', [])
 
 
 def process_team(sb, team_id: int, team_name: str) -> dict:
@@ -177,8 +177,6 @@ def main():
             log.warning(f"[{idx}/{len(teams)}] ❌ {team_name}: {e}")
             total_errors += 1
 
-        time.sleep(0.15)
-
     log.info(f"""
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
  Roster Fix Tamamlandı
@@ -1,20 +1,17 @@
 """
 Main entry point for Esports Data Platform ETL
 Usage: python run.py [options]
+
+ETL modülleri modül seviyesinde DEĞİL, yalnızca seçilen job'un dalında import
+edilir: --live (en sık çağrı) numpy/pydantic/Liquipedia/LLM zincirini hiç
+yüklemez. Başlangıç süresi: python bench_startup.py
 """
 import argparse
 import logging
 import os
 from datetime import datetime, timezone
+from config import Config
 from utils.logger import setup_logging
-from etl.sync_matches import MatchSyncer
-from etl.predict import MatchPredictor
-from etl.sync_players import PlayerStatsSyncer
-from etl.adapters import (
-    LiquipediaAdapter, GeminiAdapter, HybridStatsBackfiller,
-    LiquipediaV3TransferAdapter, LiquipediaWikitextTransferAdapter,
-)
-from etl.news_generator import NewsGenerator
 
 logger = logging.getLogger(__name__)
 
@@ -199,6 +196,44 @@ def main():
         help='--accuracy-check için kaç günlük geçmişe bakılsın (0 = tüm zamanlar, varsayılan: 30)',
     )
 
+    parser.add_argument(
+        '--backtest',
+        action='store_true',
+        help='Walk-forward Elo backtest: K × MOV grid\'i için accuracy/log-loss/Brier/kalibrasyon (DB\'ye yazmaz)',
+    )
+    parser.add_argument(
+        '--backtest-k',
+        nargs='+',
+        type=float,
+        default=[16, 24, 32, 40, 48],
+        help='--backtest K faktörleri (varsayılan: 16 24 32 40 48)',
+    )
+    parser.add_argument(
+        '--backtest-mov',
+        nargs='+',
+        type=float,
+        default=[0, 0.25, 0.5, 0.75, 1.0],
+        help='--backtest margin-of-victory ağırlıkları (0 = MOV kapalı, varsayılan: 0 0.25 0.5 0.75 1)',
+    )
+    parser.add_argument(
+        '--backtest-min-games',
+        type=int,
+        default=0,
+        help='--backtest: sadece iki takımın da en az N maç oynadığı maçları değerlendir (varsayılan: 0)',
+    )
+    parser.add_argument(
+        '--backtest-days',
+        type=int,
+        default=0,
+        help='--backtest: sadece son N günü değerlendir, replay tüm geçmiş (0 = tümü, varsayılan: 0)',
+    )
+    parser.add_argument(
+        '--backtest-workers',
+        type=int,
+        default=0,
+        help='--backtest process sayısı (0 = CPU sayısı, varsayılan: 0)',
+    )
+
     parser.add_argument(
         '--generate-news',
         action='store_true',
@@ -266,43 +301,22 @@ def main():
     )
 
     args = parser.parse_args()
+    Config.validate()
 
     logger.info("=" * 60)
     logger.info("🚀 ESPORTS DATA PLATFORM - ETL")
     logger.info(f"⏰ {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     logger.info("=" * 60)
 
-    syncer = MatchSyncer()
-    total_stats = {'fetched': 0, 'cleaned': 0, 'synced': 0}
+    total_stats = {'fetched': 0, 'cleaned': 0, 'synced': 0,
+                   'new': 0, 'changed': 0, 'unchanged': 0}
 
     # ── Live-only sync (--live flag) ──────────────────────────────────────────
+    # Sürekli çalışan sürüm: sync_worker.py --live (aynı LiveSyncer, sıcak süreç)
     if args.live:
-        games = ['valorant', 'csgo', 'lol'] if args.all_games else [args.game]
-        total_live = {'fetched': 0, 'cleaned': 0, 'synced': 0}
-        all_live_ids = set()
-        for game in games:
-            r = syncer.sync_running_matches(game, limit=args.limit)
-            all_live_ids |= r.get('live_ids', set())
-            for k in total_live:
-                total_live[k] += r.get(k, 0)
-        logger.info(f"📡 Live sync done — synced {total_live['synced']} running matches")
-
-        # Orphan resolution: tüm oyunların live_id birleşimiyle TEK seferde
-        # (oyun-slug'ından bağımsız → 'cs-go'/'league-of-legends' slug bug'ı yok).
-        # --fix-orphans verilirse cap'i yükselt (backlog temizliği için).
-        resolved = syncer.resolve_orphans(all_live_ids, cap=40 if args.fix_orphans else 15)
-        logger.info(f"🔍 Orphan resolution: {resolved} maç finished'a güncellendi")
-
-        # Stale not_started temizliği (planlı zamanı geçmiş hayalet maçlar) — cron
-        # zamanla temizler; --fix-orphans ile daha büyük batch
-        stale = syncer.resolve_stale_upcoming(hours_ago=6, cap=40 if args.fix_orphans else 20)
-        logger.info(f"🔍 Stale upcoming resolution: {stale} maç güncellendi")
-
-        # Canlı maç istatistiklerini de güncelle (harita/KDA/tur skoru)
-        ps = PlayerStatsSyncer()
-        ps.ensure_schema()
-        stats_count = ps.sync_match_stats(limit=50)
-        logger.info(f"📊 Live stats refreshed — {stats_count} matches processed")
+        from etl.live_sync import LiveSyncer, ALL_GAMES
+        games = ALL_GAMES if args.all_games else [args.game]
+        LiveSyncer(games, limit=args.limit, fix_orphans=args.fix_orphans).run_cycle()
         return
 
     has_non_enrichment_work = any([
@@ -328,28 +342,37 @@ def main():
         args.generate_previews,
         args.generate_tournament_recaps,
         args.liquipedia_enrich,
+        args.backtest,
     ])
     should_sync_matches = has_non_enrichment_work or not enrichment_only
 
+    # MatchSyncer (PandaScore client + adaptörler) yalnızca onu kullanan job'larda kurulur
+    syncer = None
+    if (should_sync_matches or args.fix_stale or args.fix_orphans
+            or args.clean_stale_matches or args.backfill_history):
+        from etl.sync_matches import MatchSyncer
+        syncer = MatchSyncer()
+
     if should_sync_matches:
         if args.all_games:
             games = ['valorant', 'csgo', 'lol']
         else:
             games = [args.game]
 
-        for game in games:
-            # limit'i artır: 50 → 200, past modda daha fazla sayfa tara
-            stats = syncer.sync_game_matches(
+        # Oyunlar eşzamanlı (Config.SYNC_GAME_WORKERS); sonuçlar aynı özete toplanır
+        per_game = syncer.map_games(
+            lambda game: syncer.sync_game_matches(
                 game,
                 limit=args.limit,
                 past=args.past,
                 page=args.page if args.past else 1,
                 upcoming_days=args.upcoming_days,
-            )
-
-            total_stats['fetched'] += stats.get('fetched', 0)
-            total_stats['cleaned'] += stats.get('cleaned', 0)
-            total_stats['synced'] += stats.get('synced', 0)
+            ),
+            games,
+        )
+        for stats in per_game:
+            for k in total_stats:
+                total_stats[k] += stats.get(k, 0)
 
         logger.info("\n" + "=" * 60)
         logger.info("📊 TOTAL SYNC RESULTS")
@@ -357,6 +380,10 @@ def main():
         logger.info(f"   Fetched: {total_stats['fetched']} matches")
         logger.info(f"   Cleaned: {total_stats['cleaned']} matches")
         logger.info(f"   Synced:  {total_stats['synced']} matches")
+        logger.info(
+            f"   Changes: new={total_stats['new']} | changed={total_stats['changed']} | "
+            f"unchanged={total_stats['unchanged']} (unchanged rows not rewritten)"
+        )
         logger.info("=" * 60)
     else:
         logger.info("\nℹ️ Skipping PandaScore match sync (Liquipedia-only run).")
@@ -367,6 +394,7 @@ def main():
         logger.info("🧠 AI MATCH PREDICTIONS")
         logger.info("=" * 60)
 
+        from etl.predict import MatchPredictor
         predictor = MatchPredictor()
 
         # Past mode ise finished maçlara tahmin yap
@@ -383,6 +411,7 @@ def main():
         logger.info("\n" + "=" * 60)
         logger.info("📊 MATCH STATS SYNC")
         logger.info("=" * 60)
+        from etl.sync_players import PlayerStatsSyncer
         ps = PlayerStatsSyncer()
         ps.ensure_schema()
         # limit'i 200 → 2000 yap: daha fazla geçmiş maç işle
@@ -397,6 +426,7 @@ def main():
         logger.info(f"👤 ACTIVE ROSTER SYNC (son {args.roster_days} gün, "
               f"force={args.roster_force})")
         logger.info("=" * 60)
+        from etl.sync_players import PlayerStatsSyncer
         ps = PlayerStatsSyncer()
         result = ps.sync_all_active_rosters(
             days=args.roster_days,
@@ -411,6 +441,7 @@ def main():
         logger.info("\n" + "=" * 60)
         logger.info("🔍 MISSING ROSTER SYNC (teams tablosundaki tüm eksikler)")
         logger.info("=" * 60)
+        from etl.sync_players import PlayerStatsSyncer
         ps = PlayerStatsSyncer()
         result = ps.sync_missing_rosters()
         logger.info(f"✅ {result['players_upserted']} oyuncu | "
@@ -424,6 +455,7 @@ def main():
         games_label = ', '.join(args.league_games or ['valorant', 'csgo', 'lol'])
         logger.info(f"🏆 LEAGUE ROSTER SYNC ({games_label}, force={args.roster_force})")
         logger.info("=" * 60)
+        from etl.sync_players import PlayerStatsSyncer
         ps = PlayerStatsSyncer()
         result = ps.sync_league_rosters(
             game_slugs=args.league_games,
@@ -440,6 +472,7 @@ def main():
         logger.info("\n" + "=" * 60)
         logger.info(f"🧹 ROSTER INTEGRITY FLUSH (son {args.roster_days} gün)")
         logger.info("=" * 60)
+        from etl.sync_players import PlayerStatsSyncer
         ps = PlayerStatsSyncer()
         result = ps.flush_all_stale_rosters(days=args.roster_days)
         logger.info(f"✅ {result['players_flushed']} oyuncu serbest bırakıldı | "
@@ -456,6 +489,7 @@ def main():
         logger.info("\n" + "=" * 60)
         logger.info("🧩 HYBRID STATS BACKFILL (PandaScore NULL → Liquipedia)")
         logger.info("=" * 60)
+        from etl.adapters import HybridStatsBackfiller
         backfiller = HybridStatsBackfiller()
         result = backfiller.backfill(limit=args.hybrid_limit)
         logger.info(
@@ -467,7 +501,7 @@ def main():
     if args.fix_orphans:
         logger.info("\n🔍 Manual orphan resolution (tüm running maçlar PandaScore'a karşı doğrulanıyor)...")
         # live_ids=set() → tüm running maçlar doğrulanır. Yüksek cap ile tek
-        # geçişte backlog temizlenir (get_match_by_id gerçek status döndürür).
+        # geçişte backlog temizlenir (get_matches_by_ids gerçek status döndürür).
         total = syncer.resolve_orphans(set(), cap=500)
         logger.info(f"✅ Orphan resolution tamamlandı — {total} maç güncellendi")
 
@@ -488,6 +522,7 @@ def main():
         logger.info("\n" + "=" * 60)
         logger.info("🎯 AI PREDICTION ACCURACY CHECK")
         logger.info("=" * 60)
+        from etl.predict import MatchPredictor
         predictor = MatchPredictor()
         result = predictor.calculate_prediction_accuracy(days=args.accuracy_days)
         logger.info(
@@ -495,10 +530,27 @@ def main():
             f"doğru → %{result['accuracy_pct']}"
         )
 
+    if args.backtest:
+        logger.info("\n" + "=" * 60)
+        logger.info("🧪 ELO BACKTEST (walk-forward, out-of-sample)")
+        logger.info("=" * 60)
+        from etl.backtest import run_backtest, log_report as log_backtest_report
+        results = run_backtest(
+            k_factors=args.backtest_k,
+            mov_weights=args.backtest_mov,
+            workers=args.backtest_workers,
+            min_games=args.backtest_min_games,
+            days=args.backtest_days,
+        )
+        log_backtest_report(results)
+        logger.info("=" * 60)
+
     if args.generate_news:
         logger.info("\n" + "=" * 60)
         logger.info("📰 LLM NEWS GENERATION (Gemini)")
         logger.info("=" * 60)
+        from etl.adapters import GeminiAdapter
+        from etl.news_generator import NewsGenerator
         try:
             llm = GeminiAdapter()
             generator = NewsGenerator(llm)
@@ -517,6 +569,7 @@ def main():
         logger.info("\n" + "=" * 60)
         logger.info("🔁 TRANSFER SYNC (Liquipedia wikitext → roster_changes)")
         logger.info("=" * 60)
+        from etl.adapters import LiquipediaV3TransferAdapter, LiquipediaWikitextTransferAdapter
         grand = {'found': 0, 'inserted': 0, 'skipped': 0, 'failed': 0}
         has_key = bool(os.getenv('LIQUIPEDIA_API_KEY'))
         for tgame in ['valorant', 'cs2', 'lol']:
@@ -542,6 +595,8 @@ def main():
         logger.info("\n" + "=" * 60)
         logger.info("🔁 LLM TRANSFER NEWS GENERATION (Gemini)")
         logger.info("=" * 60)
+        from etl.adapters import GeminiAdapter
+        from etl.news_generator import NewsGenerator
         try:
             llm = GeminiAdapter()
             generator = NewsGenerator(llm)
@@ -558,6 +613,8 @@ def main():
         logger.info("\n" + "=" * 60)
         logger.info("🏆 LLM TOURNAMENT RECAP GENERATION (Gemini)")
         logger.info("=" * 60)
+        from etl.adapters import GeminiAdapter
+        from etl.news_generator import NewsGenerator
         try:
             llm = GeminiAdapter()
             generator = NewsGenerator(llm)
@@ -574,6 +631,8 @@ def main():
         logger.info("\n" + "=" * 60)
         logger.info("🔮 LLM MATCH PREVIEW GENERATION (Gemini)")
         logger.info("=" * 60)
+        from etl.adapters import GeminiAdapter
+        from etl.news_generator import NewsGenerator
         try:
             llm = GeminiAdapter()
             generator = NewsGenerator(llm)
@@ -592,6 +651,7 @@ def main():
         logger.info("\n" + "=" * 60)
         logger.info("🌐 LIQUIPEDIA DATA ENRICHMENT")
         logger.info("=" * 60)
+        from etl.adapters import LiquipediaAdapter
         adapter = LiquipediaAdapter()
         result = adapter.run(
             limit=args.liquipedia_limit,
@@ -0,0 +1,18 @@
+-- Migration: matches.content_hash — change-detection skip for re-sync
+-- Run in Supabase SQL Editor (idempotent — safe to re-run)
+--
+-- MatchSyncer her satır için temiz maç + raw payload'ın SHA-256 özetini yazar.
+-- Aynı hash ile gelen maç ON CONFLICT ... WHERE content_hash IS DISTINCT FROM
+-- ile HİÇ yazılmaz → raw_data (~5KB) yeniden yazımı, WAL churn, bloat ve
+-- gereksiz realtime event'leri (bkz. enable_realtime_matches.sql) kesilir.
+-- NULL hash = "bir sonraki sync'te mutlaka yaz" (force-finish bunu kullanır).
+
+-- 1. Add column
+ALTER TABLE public.matches
+  ADD COLUMN IF NOT EXISTS content_hash text;
+
+-- 2. Verify
+SELECT
+  COUNT(*)                                        AS total,
+  COUNT(*) FILTER (WHERE content_hash IS NOT NULL) AS hashed
+FROM public.matches;
@@ -0,0 +1,20 @@
+-- ┌─────────────────────────────────────────────────────────────────────────┐
+-- │ Normalize isim index'leri (transfer ingest isim çözümleme)              │
+-- │ Run once in Supabase SQL Editor (idempotent — safe to re-run).         │
+-- │ CONCURRENTLY must run outside explicit transaction blocks.              │
+-- └─────────────────────────────────────────────────────────────────────────┘
+--
+-- BaseTransferAdapter._resolve_ids_batch tüm oyuncu / takım adlarını tek
+-- sorguda unnest + LOWER(...) = LOWER(...) ile çözer. Eski olay başına
+-- `teams.name ILIKE %s` btree index kullanamıyordu (trigram index yalnızca
+-- '%x%' aramalarına yarar); bu ifade index'leri eşitlik eşlemesini index
+-- taramasına çevirir. players için nickname OR real_name → BitmapOr.
+
+create index concurrently if not exists idx_players_nickname_lower
+on public.players (lower(nickname));
+
+create index concurrently if not exists idx_players_real_name_lower
+on public.players (lower(real_name));
+
+create index concurrently if not exists idx_teams_name_lower
+on public.teams (lower(name));
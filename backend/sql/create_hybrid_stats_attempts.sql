@@ -0,0 +1,27 @@
+-- ┌─────────────────────────────────────────────────────────────────────────┐
+-- │ hybrid_stats_attempts migration (negatif sonuç önbelleği + backoff)     │
+-- │ Run once in Supabase SQL Editor (idempotent — safe to re-run).         │
+-- └─────────────────────────────────────────────────────────────────────────┘
+--
+-- HybridStatsBackfiller her gün en üst tier'daki eksik maçları seçer; hiçbir
+-- kaynağın dolduramadığı maçlar işaretlenmediği için aynı S/A maçları her gün
+-- yeniden denenip --hybrid-limit bütçesini yiyordu. Maç başına deneme kaydı:
+--   attempts         toplam deneme sayısı
+--   last_attempt_at  son deneme
+--   next_attempt_at  bu zamana kadar aday sorgusuna GİRMEZ
+--   outcomes         son denemenin kaynak bazlı sonucu
+--                    {"liquipedia_v3": "empty", "liquipedia_wikitext": "error", ...}
+-- Aralık: kaynaklar "boş" dediyse HYBRID_RETRY_BASE_HOURS × 2^(attempts-1)
+-- (HYBRID_RETRY_MAX_DAYS ile sınırlı); yalnızca hata varsa sabit taban aralık.
+-- Tablo backfiller tarafından da CREATE IF NOT EXISTS ile oluşturulur.
+
+CREATE TABLE IF NOT EXISTS public.hybrid_stats_attempts (
+    match_id         bigint      PRIMARY KEY,
+    attempts         integer     NOT NULL DEFAULT 0,
+    last_attempt_at  timestamptz NOT NULL DEFAULT now(),
+    next_attempt_at  timestamptz NOT NULL DEFAULT now(),
+    outcomes         jsonb       NOT NULL DEFAULT '{}'::jsonb
+);
+
+CREATE INDEX IF NOT EXISTS idx_hybrid_stats_attempts_next
+    ON public.hybrid_stats_attempts (next_attempt_at);
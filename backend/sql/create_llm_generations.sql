@@ -0,0 +1,32 @@
+-- ┌─────────────────────────────────────────────────────────────────────────┐
+-- │ llm_generations migration (LLM üretim sonuç önbelleği)                  │
+-- │ Run once in Supabase SQL Editor (idempotent — safe to re-run).         │
+-- └─────────────────────────────────────────────────────────────────────────┘
+--
+-- NewsGenerator Gemini yanıtını aldıktan sonra kayıt (_save_*) düşerse veya
+-- süreç çökerse, sonraki run aynı fact sheet için yeniden üretim ödüyordu.
+-- Her ham yanıt burada saklanır; anahtar sha256(adapter/model/temperature,
+-- system prompt, user prompt (fact sheet), response schema):
+--   raw_response   LLM'in döndürdüğü metin (ayrıştırılmadan)
+--   parse_ok       _parse_llm_json başarılı mı — yalnızca true olanlar
+--                  yeniden servis edilir; false → yeniden üretilir (üzerine yazılır)
+--   kind / subject_id  log/inceleme için: 'match' | 'preview' | 'transfer' |
+--                  'tournament' ve ilgili id
+--   hits / last_hit_at  önbellekten kaç kez servis edildi
+-- Tablo etl/llm_cache.py tarafından da CREATE IF NOT EXISTS ile oluşturulur.
+-- Budama (isteğe bağlı): delete from llm_generations where created_at < now() - interval '90 days';
+
+CREATE TABLE IF NOT EXISTS public.llm_generations (
+    cache_key     text        PRIMARY KEY,
+    kind          text        NOT NULL,
+    subject_id    text,
+    identity      jsonb       NOT NULL DEFAULT '{}'::jsonb,
+    raw_response  text        NOT NULL,
+    parse_ok      boolean     NOT NULL,
+    created_at    timestamptz NOT NULL DEFAULT now(),
+    hits          integer     NOT NULL DEFAULT 0,
+    last_hit_at   timestamptz
+);
+
+CREATE INDEX IF NOT EXISTS idx_llm_generations_created_at
+    ON public.llm_generations (created_at);
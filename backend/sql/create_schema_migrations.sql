@@ -0,0 +1,27 @@
+-- ┌─────────────────────────────────────────────────────────────────────────┐
+-- │ schema_migrations migration (ETL şema versiyon kaydı)                   │
+-- │ Run once in Supabase SQL Editor (idempotent — safe to re-run).         │
+-- └─────────────────────────────────────────────────────────────────────────┘
+--
+-- ETL job'larının ad-hoc DDL'i (PlayerStatsSyncer.ensure_schema, Liquipedia
+-- extra_metadata, Elo state, hybrid_stats_attempts, match_needs_enrichment(),
+-- llm_generations) her run'da ALTER/CREATE IF NOT EXISTS koşuyordu. Artık her
+-- grup etl/schema_migrations.py'de bir Migration (ad, versiyon, ifadeler):
+-- süreç başına bu tablodan tek SELECT, DDL yalnızca kayıtlı versiyon gerideyse
+-- ya da checksum (boşluk-duyarsız sha256) değiştiyse çalışır.
+--
+-- Bir migration'ı zorla yeniden uygulamak için satırını silin:
+--   delete from public.schema_migrations where name = 'player_stats';
+-- Tablo etl/schema_migrations.py tarafından da CREATE IF NOT EXISTS ile oluşturulur.
+
+CREATE TABLE IF NOT EXISTS public.schema_migrations (
+    name        text        PRIMARY KEY,
+    version     integer     NOT NULL,
+    checksum    text        NOT NULL,
+    applied_at  timestamptz NOT NULL DEFAULT now()
+);
+
+-- Verify
+SELECT name, version, left(checksum, 12) AS checksum, applied_at
+FROM public.schema_migrations
+ORDER BY name;
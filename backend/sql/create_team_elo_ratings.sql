@@ -0,0 +1,98 @@
+-- ┌─────────────────────────────────────────────────────────────────────────┐
+-- │ team_elo_ratings + elo_state migration (incremental Elo)                │
+-- │ Run once in Supabase SQL Editor (idempotent — safe to re-run).         │
+-- └─────────────────────────────────────────────────────────────────────────┘
+--
+-- MatchPredictor her --predict run'ında tüm bitmiş maçları replay etmek yerine
+-- ratingleri burada tutar ve yalnızca watermark'tan (scheduled_at, id) sonra
+-- biten maçları katlar. Watermark yalnızca oturmuş prefix'e (henüz bitmemiş en
+-- erken maçın öncesine) ilerler. Watermark öncesine geç gelen ya da düzeltilen sonuç
+-- matches trigger'ı ile elo_changes'e yazılır; son replay'in snapshot'ında
+-- görünmeyen böyle bir kayıt → tam rebuild (geçmiş taranmaz).
+-- model_key = "k=32|base=1500|mov=0.5" (parametre başına ayrı state);
+-- "...|walk-forward" predict_finished_matches'in kendi watermark'ıdır.
+-- Tablolar predictor tarafından da schema_migrations üzerinden oluşturulur.
+
+-- 1. Per-team ratings ─────────────────────────────────────────────────────────
+CREATE TABLE IF NOT EXISTS public.team_elo_ratings (
+    model_key         text             NOT NULL,
+    team_id           bigint           NOT NULL,
+    rating            double precision NOT NULL,
+    games             integer          NOT NULL DEFAULT 0,
+    last_match_id     bigint,
+    last_scheduled_at timestamptz,
+    updated_at        timestamptz      NOT NULL DEFAULT now(),
+    PRIMARY KEY (model_key, team_id)
+);
+
+-- 2. Replay watermark ─────────────────────────────────────────────────────────
+CREATE TABLE IF NOT EXISTS public.elo_state (
+    model_key     text        PRIMARY KEY,
+    watermark_at  timestamptz,              -- son katlanan oturmuş maçın scheduled_at'i
+    watermark_id  bigint,                   -- tie-break (ORDER BY scheduled_at, id)
+    rebuilt_at    timestamptz,
+    updated_at    timestamptz NOT NULL DEFAULT now()
+);
+ALTER TABLE public.elo_state ADD COLUMN IF NOT EXISTS snapshot pg_snapshot;  -- replay'in okuduğu görüntü
+ALTER TABLE public.elo_state DROP COLUMN IF EXISTS match_count, DROP COLUMN IF EXISTS hash_sum;
+
+-- 3. Watermark range scans ────────────────────────────────────────────────────
+CREATE INDEX IF NOT EXISTS idx_matches_finished_chrono
+    ON public.matches (scheduled_at, id)
+    WHERE status = 'finished' AND winner_id IS NOT NULL;
+
+-- Oturmuş prefix sınırı: bitmemiş en erken maç (MatchPredictor._settled_horizon)
+CREATE INDEX IF NOT EXISTS idx_matches_unsettled_chrono
+    ON public.matches (scheduled_at)
+    WHERE status IN ('not_started', 'upcoming', 'running')
+       OR (status = 'finished' AND winner_id IS NULL);
+
+-- 4. Late / corrected result changelog ──────────────────────────────────────
+CREATE TABLE IF NOT EXISTS public.elo_changes (
+    xid           xid8        NOT NULL DEFAULT pg_current_xact_id(),
+    match_id      bigint      NOT NULL,
+    scheduled_at  timestamptz NOT NULL,
+    changed_at    timestamptz NOT NULL DEFAULT now()
+);
+CREATE INDEX IF NOT EXISTS idx_elo_changes_xid ON public.elo_changes (xid);
+
+CREATE OR REPLACE FUNCTION public.log_elo_change() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP <> 'INSERT' AND OLD.scheduled_at IS NOT NULL THEN
+        INSERT INTO public.elo_changes (match_id, scheduled_at) VALUES (OLD.id, OLD.scheduled_at);
+    END IF;
+    IF TG_OP <> 'DELETE' AND NEW.scheduled_at IS NOT NULL
+       AND (TG_OP = 'INSERT' OR NEW.scheduled_at IS DISTINCT FROM OLD.scheduled_at) THEN
+        INSERT INTO public.elo_changes (match_id, scheduled_at) VALUES (NEW.id, NEW.scheduled_at);
+    END IF;
+    RETURN NULL;
+END
+$$;
+
+DROP TRIGGER IF EXISTS trg_elo_change_ins ON public.matches;
+CREATE TRIGGER trg_elo_change_ins AFTER INSERT ON public.matches
+FOR EACH ROW WHEN (NEW.status = 'finished')
+EXECUTE FUNCTION public.log_elo_change();
+
+DROP TRIGGER IF EXISTS trg_elo_change_upd ON public.matches;
+CREATE TRIGGER trg_elo_change_upd AFTER UPDATE ON public.matches
+FOR EACH ROW WHEN (
+    (OLD.status = 'finished' OR NEW.status = 'finished')
+    AND (OLD.status, OLD.winner_id, OLD.team_a_id, OLD.team_b_id,
+         OLD.team_a_score, OLD.team_b_score, OLD.scheduled_at)
+        IS DISTINCT FROM
+        (NEW.status, NEW.winner_id, NEW.team_a_id, NEW.team_b_id,
+         NEW.team_a_score, NEW.team_b_score, NEW.scheduled_at)
+)
+EXECUTE FUNCTION public.log_elo_change();
+
+DROP TRIGGER IF EXISTS trg_elo_change_del ON public.matches;
+CREATE TRIGGER trg_elo_change_del AFTER DELETE ON public.matches
+FOR EACH ROW WHEN (OLD.status = 'finished')
+EXECUTE FUNCTION public.log_elo_change();
+
+-- 5. Verify
+SELECT s.model_key, s.watermark_at, s.rebuilt_at,
+       (SELECT COUNT(*) FROM public.team_elo_ratings r WHERE r.model_key = s.model_key) AS teams
+FROM public.elo_state s;
@@ -0,0 +1,91 @@
+-- ┌─────────────────────────────────────────────────────────────────────────┐
+-- │ Normalize isim kolonları + isim değişim takibi (EntityResolver)         │
+-- │ Run once in Supabase SQL Editor (idempotent — safe to re-run).         │
+-- │ CONCURRENTLY must run outside explicit transaction blocks.              │
+-- └─────────────────────────────────────────────────────────────────────────┘
+--
+-- etl/entity_resolver.py tüm job'lar için tek isim → id eşlemesi tutar.
+-- Normalize kural: lower + yalnızca a-z0-9 (normalize_name). Aynı ifade burada
+-- STORED generated kolon olarak → DB tarafı eşlemeleri index'li eşitlik olur,
+-- çözümleyici de yüklemede bu kolonları okur.
+--
+-- Artımlı yenileme updated_at ile yapılır. players'ta kolon yoktu; teams'te
+-- roster sırası için var ama ad değişiminde güncellenmiyordu → tetikleyici
+-- yalnızca ad kolonları değişince updated_at'i ilerletir (açık SET'leri ezmez).
+--
+-- Önceki add_name_lookup_indexes.sql lower() index'lerinin yerini alır.
+
+-- 1. Generated normalize kolonlar ─────────────────────────────────────────────
+alter table public.players
+  add column if not exists nickname_norm text
+    generated always as (regexp_replace(lower(coalesce(nickname, '')), '[^a-z0-9]+', '', 'g')) stored,
+  add column if not exists real_name_norm text
+    generated always as (regexp_replace(lower(coalesce(real_name, '')), '[^a-z0-9]+', '', 'g')) stored,
+  add column if not exists updated_at timestamptz not null default now();
+
+alter table public.teams
+  add column if not exists name_norm text
+    generated always as (regexp_replace(lower(coalesce(name, '')), '[^a-z0-9]+', '', 'g')) stored,
+  add column if not exists acronym_norm text
+    generated always as (regexp_replace(lower(coalesce(acronym, '')), '[^a-z0-9]+', '', 'g')) stored,
+  add column if not exists updated_at timestamptz default now();
+
+-- 2. İsim değişiminde updated_at ──────────────────────────────────────────────
+create or replace function public.touch_players_name_updated_at()
+returns trigger
+language plpgsql
+as $$
+begin
+  if (new.nickname, new.real_name) is distinct from (old.nickname, old.real_name) then
+    new.updated_at := now();
+  end if;
+  return new;
+end;
+$$;
+
+create or replace function public.touch_teams_name_updated_at()
+returns trigger
+language plpgsql
+as $$
+begin
+  if (new.name, new.acronym) is distinct from (old.name, old.acronym) then
+    new.updated_at := now();
+  end if;
+  return new;
+end;
+$$;
+
+drop trigger if exists trg_players_name_updated_at on public.players;
+create trigger trg_players_name_updated_at
+  before update on public.players
+  for each row
+  execute function public.touch_players_name_updated_at();
+
+drop trigger if exists trg_teams_name_updated_at on public.teams;
+create trigger trg_teams_name_updated_at
+  before update on public.teams
+  for each row
+  execute function public.touch_teams_name_updated_at();
+
+-- 3. Index'ler ────────────────────────────────────────────────────────────────
+create index concurrently if not exists idx_players_nickname_norm
+on public.players (nickname_norm) where nickname_norm <> '';
+
+create index concurrently if not exists idx_players_real_name_norm
+on public.players (real_name_norm) where real_name_norm <> '';
+
+create index concurrently if not exists idx_players_updated_at
+on public.players (updated_at);
+
+create index concurrently if not exists idx_teams_name_norm
+on public.teams (name_norm) where name_norm <> '';
+
+create index concurrently if not exists idx_teams_acronym_norm
+on public.teams (acronym_norm) where acronym_norm <> '';
+
+create index concurrently if not exists idx_teams_updated_at
+on public.teams (updated_at);
+
+drop index concurrently if exists public.idx_players_nickname_lower;
+drop index concurrently if exists public.idx_players_real_name_lower;
+drop index concurrently if exists public.idx_teams_name_lower;
@@ -0,0 +1,64 @@
+-- ┌─────────────────────────────────────────────────────────────────────────┐
+-- │ match_needs_enrichment(raw_data) + partial index (hybrid stats aday)    │
+-- │ Run once in Supabase SQL Editor (idempotent — safe to re-run).         │
+-- │ CONCURRENTLY must run outside explicit transaction blocks.              │
+-- └─────────────────────────────────────────────────────────────────────────┘
+--
+-- HybridStatsBackfiller.find_incomplete_matches eskiden limit*4 bitmiş maçı
+-- TAM raw_data ile çekip Python'da (_match_needs_enrichment) filtreliyordu →
+-- megabaytlarca transfer ve çoğu zaman limitten az aday. Aynı kural burada
+-- IMMUTABLE SQL fonksiyonu; partial index yalnızca hâlâ zenginleştirme
+-- bekleyen maçları tutar (doldurulan maç map_source alınca index'ten düşer).
+--
+-- Eksik sayılır: map_source yok VE (games boş VEYA hiçbir game'de geçerli
+-- harita adı ve hiçbir oyuncu kills değeri yok). Fonksiyon yoksa backfiller
+-- eski Python filtresine düşer; fonksiyonu kendisi de oluşturmayı dener.
+
+create or replace function public.match_needs_enrichment(raw jsonb)
+returns boolean
+language sql
+immutable
+parallel safe
+as $$
+  select case
+    when raw is null or jsonb_typeof(raw) <> 'object' then false
+    -- Python truthiness: null/false/0/""/[]/{} → işaretsiz
+    when coalesce(raw->'map_source' not in ('null', 'false', '0', '""', '[]', '{}'), false) then false
+    when jsonb_typeof(raw->'games') is distinct from 'array'
+         or jsonb_array_length(raw->'games') = 0 then true
+    else not exists (
+      select 1
+      from jsonb_array_elements(raw->'games') g
+      cross join lateral (
+        select case when jsonb_typeof(g->'map') = 'object' then g->'map'->'name' else g->'map' end as name
+      ) mp
+      where jsonb_typeof(g) = 'object'
+        and (
+          (mp.name is not null
+           and mp.name not in ('null', 'false', '0', '""', '[]', '{}')
+           -- str.strip() ile aynı küme: Python'un tüm Unicode boşlukları
+           and lower(btrim(mp.name #>> '{}',
+                             E'\t\n\u000b\u000c\r\u001c\u001d\u001e\u001f \u0085\u00a0\u1680\u2000\u2001\u2002\u2003\u2004\u2005\u2006\u2007\u2008\u2009\u200a\u2028\u2029\u202f\u205f\u3000')) not in ('', 'unknown'))
+          or exists (
+            select 1
+            from jsonb_array_elements(case when jsonb_typeof(g->'teams') = 'array' then g->'teams' else '[]' end) t,
+                 jsonb_array_elements(case when jsonb_typeof(t->'players') = 'array' then t->'players' else '[]' end) p
+            where jsonb_typeof(p) = 'object'
+              and p->'kills' is not null
+              and p->'kills' <> 'null'
+          )
+        )
+    )
+  end
+$$;
+
+create index concurrently if not exists idx_matches_needs_enrichment
+on public.matches (scheduled_at desc)
+include (tournament_id, game_id, team_a_id, team_b_id)
+where status = 'finished'
+  and raw_data is not null
+  and public.match_needs_enrichment(raw_data);
+
+-- Fonksiyon gövdesi değiştiyse (ör. boşluk kümesi düzeltmesi) index eski
+-- sonuçları tutar — IMMUTABLE fonksiyon değişimi index'i güncellemez.
+reindex index concurrently idx_matches_needs_enrichment;
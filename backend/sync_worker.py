@@ -5,6 +5,13 @@ Usage examples:
   python sync_worker.py
   python sync_worker.py --once
   python sync_worker.py --interval-hours 6
+  python sync_worker.py --live --fix-orphans --max-runtime-minutes 75
+
+--live runs the live sync loop (same steps as `run.py --live`) in-process as a
+long-running daemon: DB pool, PandaScore HTTP session, schema setup and Elo
+ratings stay warm between cycles. Polling is adaptive — every --live-interval
+seconds while matches are running or about to start, backing off up to
+--idle-interval when nothing is live.
 """
 
 from __future__ import annotations
@@ -12,9 +19,11 @@ from __future__ import annotations
 import argparse
 import logging
 import os
+import signal
 import socket
 import subprocess
 import sys
+import threading
 import time
 from datetime import datetime, timezone
 from pathlib import Path
@@ -51,6 +60,45 @@ def parse_args() -> argparse.Namespace:
         action="store_true",
         help="Print commands without executing",
     )
+    live = parser.add_argument_group("live daemon")
+    live.add_argument(
+        "--live",
+        action="store_true",
+        help="Run the live sync loop in-process as a daemon",
+    )
+    live.add_argument(
+        "--game",
+        choices=["valorant", "csgo", "lol"],
+        default=None,
+        help="Only sync this game (default: all games)",
+    )
+    live.add_argument("--limit", type=int, default=20, help="Max running matches per game (default: 20)")
+    live.add_argument("--fix-orphans", action="store_true", help="Raise orphan/stale resolution caps")
+    live.add_argument(
+        "--live-interval",
+        type=float,
+        default=30.0,
+        help="Seconds between cycles while matches are live (default: 30)",
+    )
+    live.add_argument(
+        "--idle-interval",
+        type=float,
+        default=300.0,
+        help="Max seconds between cycles when nothing is live (default: 300)",
+    )
+    live.add_argument(
+        "--stale-minutes",
+        type=float,
+        default=15.0,
+        help="Minutes between stale not_started sweeps (default: 15)",
+    )
+    live.add_argument(
+        "--max-runtime-minutes",
+        type=float,
+        default=0.0,
+        help="Exit cleanly after this many minutes (0 = run forever)",
+    )
+    live.add_argument("--no-elo", action="store_true", help="Do not fold finished matches into Elo")
     return parser.parse_args()
 
 
@@ -202,10 +250,105 @@ def run_sync_cycle(dry_run: bool = False) -> bool:
     return cycle_ok
 
 
+def next_live_interval(args: argparse.Namespace, result: dict | None, previous: float,
+                       failures: int, seconds_until_start) -> float:
+    """
+    Adaptive polling: live-interval while matches are running, otherwise
+    double up to idle-interval — but never sleep past the next scheduled start.
+    """
+    fast, idle = args.live_interval, max(args.idle_interval, args.live_interval)
+    if failures:
+        return min(idle, fast * (2 ** failures))
+    if result and result.get("live"):
+        return fast
+    interval = min(idle, max(fast, previous * 2))
+    try:
+        until_start = seconds_until_start(interval)
+    except Exception as exc:
+        logging.warning("Next-start lookup failed: %s", exc)
+        until_start = None
+    if until_start is not None:
+        interval = max(fast, min(interval, until_start))
+    return interval
+
+
+def run_live_daemon(args: argparse.Namespace) -> None:
+    # Heavy ETL imports only in daemon mode; the subprocess scheduler stays light.
+    from config import Config
+    from etl.live_sync import ALL_GAMES, LiveSyncer
+    from etl.predict import MatchPredictor
+
+    Config.validate()
+
+    stop = threading.Event()
+
+    def request_stop(signum, _frame) -> None:
+        logging.info("Signal %s received, stopping after the current cycle.", signum)
+        stop.set()
+
+    signal.signal(signal.SIGTERM, request_stop)
+    signal.signal(signal.SIGINT, request_stop)
+
+    run_dns_warmup()
+    predictor = None
+    if not args.no_elo:
+        predictor = MatchPredictor()
+        try:
+            predictor.build_elo_ratings()
+        except Exception as exc:
+            logging.warning("Elo warm-up failed: %s", exc)
+    games = [args.game] if args.game else list(ALL_GAMES)
+    live = LiveSyncer(
+        games,
+        limit=args.limit,
+        fix_orphans=args.fix_orphans,
+        stale_every=args.stale_minutes * 60,
+        predictor=predictor,
+    )
+
+    deadline = time.monotonic() + args.max_runtime_minutes * 60 if args.max_runtime_minutes > 0 else None
+    interval = args.live_interval
+    failures = 0
+    cycles = 0
+    logging.info("=== Live daemon started | games=%s | interval=%.0f-%.0fs ===",
+                 ",".join(games), args.live_interval, args.idle_interval)
+
+    while not stop.is_set():
+        started = time.monotonic()
+        try:
+            result = live.run_cycle()
+            failures = 0
+        except Exception:
+            result = None
+            failures += 1
+            logging.exception("Live cycle failed (%s in a row)", failures)
+        cycles += 1
+        took = time.monotonic() - started
+        interval = next_live_interval(args, result, interval, failures, live.seconds_until_next_start)
+        if result:
+            logging.info(
+                "LIVE_CYCLE | live=%s | synced=%s | resolved=%s | stale=%s | took=%.1fs | next_in=%.0fs",
+                result["live"], result["synced"], result["resolved"], result["stale"], took, interval,
+            )
+
+        # Interval is start-to-start; a slow cycle shortens the following sleep.
+        wake_at = started + interval
+        if deadline is not None and wake_at >= deadline:
+            logging.info("Max runtime reached after %s cycles, exiting.", cycles)
+            break
+        stop.wait(max(0.0, wake_at - time.monotonic()))
+
+    logging.info("=== Live daemon stopped after %s cycles ===", cycles)
+
+
 def main() -> None:
     args = parse_args()
     configure_logging()
 
+    if args.live:
+        run_live_daemon(args)
+        return
+
     interval_seconds = max(1.0, args.interval_hours * 3600)
 
     while True:
@@ -0,0 +1,162 @@
+"""
+Incremental Elo state testleri (etl/predict.py).
+
+Gerçek Postgres ister: TEST_DATABASE_URL tanımlı değilse atlanır. Test
+public.matches ve Elo tablolarını SİLİP yeniden kurar — yalnızca atılabilir
+bir veritabanı verin:
+
+    TEST_DATABASE_URL=postgresql://... python -m pytest -q tests
+"""
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+pytestmark = pytest.mark.skipif(not TEST_DATABASE_URL, reason="TEST_DATABASE_URL tanımlı değil")
+
+T0 = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def db(monkeypatch):
+    import database
+    from config import Config
+    from etl import schema_migrations
+
+    monkeypatch.setattr(Config, "DATABASE_URL", TEST_DATABASE_URL)
+    database.Database.close_pool()
+    schema_migrations._recorded = None
+    with database.Database.get_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                """
+                DROP TABLE IF EXISTS public.matches, public.team_elo_ratings, public.elo_state,
+                                     public.elo_changes, public.schema_migrations CASCADE;
+                CREATE TABLE public.matches (
+                    id                    bigint PRIMARY KEY,
+                    status                text,
+                    team_a_id             bigint,
+                    team_b_id             bigint,
+                    winner_id             bigint,
+                    team_a_score          integer,
+                    team_b_score          integer,
+                    scheduled_at          timestamptz,
+                    prediction_team_a     double precision,
+                    prediction_team_b     double precision,
+                    prediction_confidence double precision
+                );
+                """
+            )
+    yield database.Database
+    database.Database.close_pool()
+    schema_migrations._recorded = None
+
+
+def _insert_finished(db, ids):
+    """Her id için 1 vs 2 bitmiş maç (A kazanır), id sırasıyla saatlik."""
+    with db.get_connection() as conn:
+        with conn.cursor() as cur:
+            cur.executemany(
+                "INSERT INTO matches (id, status, team_a_id, team_b_id, winner_id, "
+                "team_a_score, team_b_score, scheduled_at) "
+                "VALUES (%s, 'finished', 1, 2, 1, 2, 0, %s)",
+                [(i, T0 + timedelta(hours=i)) for i in ids],
+            )
+
+
+def _replay_mode(db, predictor) -> str:
+    with db.get_connection() as conn:
+        with conn.cursor() as cur:
+            return predictor._replay(cur)[3]
+
+
+def _predicted(db, ids):
+    with db.get_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                "SELECT id FROM matches WHERE id = ANY(%s) AND prediction_team_a IS NOT NULL",
+                (list(ids),),
+            )
+            return {r[0] for r in cur.fetchall()}
+
+
+def test_build_then_predict_finished_writes_new_matches(db):
+    from etl.predict import MatchPredictor
+
+    _insert_finished(db, range(1, 6))
+    MatchPredictor().predict_finished_matches()
+    assert _predicted(db, range(1, 6)) == set(range(1, 6))
+
+    # Yeni biten maçlar → önce build (saatlik --predict / live daemon) ana
+    # watermark'ı ilerletir; walk-forward backfill yine de onları yazmalı.
+    _insert_finished(db, range(6, 9))
+    MatchPredictor().build_elo_ratings()
+    updates = MatchPredictor().predict_finished_matches()
+
+    assert [u[3] for u in updates] == [6, 7, 8]
+    assert _predicted(db, range(6, 9)) == {6, 7, 8}
+
+
+def test_late_correction_before_watermark_forces_rebuild(db):
+    from etl.predict import MatchPredictor
+
+    _insert_finished(db, range(1, 6))
+    p = MatchPredictor()
+    p.build_elo_ratings()
+
+    # Değişiklik yok → incremental, hiçbir maç katlanmaz
+    assert _replay_mode(db, p) == "incremental"
+
+    # Watermark öncesindeki sonuç düzeltildi → günlükten tespit, tam rebuild
+    with db.get_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute("UPDATE matches SET winner_id = 2, team_a_score = 0, team_b_score = 2 WHERE id = 2")
+    ratings = MatchPredictor().build_elo_ratings()
+    expected = MatchPredictor(persist=False).build_elo_ratings()
+    assert ratings == pytest.approx(expected)
+    assert _replay_mode(db, p) == "incremental"
+
+
+def test_overlapping_match_finishing_late_stays_incremental(db):
+    from etl.predict import MatchPredictor
+
+    now = datetime.now(timezone.utc)
+    _insert_finished(db, range(1, 6))
+    with db.get_connection() as conn:
+        with conn.cursor() as cur:
+            # BO3 04:30'da başladı, hâlâ sürüyor; 05:00'daki BO1 çoktan bitti
+            cur.execute(
+                "INSERT INTO matches (id, status, team_a_id, team_b_id, scheduled_at) "
+                "VALUES (6, 'running', 3, 4, %s)",
+                (now - timedelta(minutes=90),),
+            )
+            cur.execute(
+                "INSERT INTO matches (id, status, team_a_id, team_b_id, winner_id, "
+                "team_a_score, team_b_score, scheduled_at) "
+                "VALUES (7, 'finished', 1, 3, 3, 0, 1, %s)",
+                (now - timedelta(minutes=60),),
+            )
+    p = MatchPredictor()
+    ratings = p.build_elo_ratings()
+    assert 3 in ratings   # oturmamış BO1 yine de güncel ratinglerde
+    p.predict_finished_matches()
+    assert _predicted(db, [7]) == {7}
+
+    with db.get_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                "UPDATE matches SET status = 'finished', winner_id = 4, "
+                "team_a_score = 1, team_b_score = 2 WHERE id = 6"
+            )
+    assert _replay_mode(db, p) == "incremental"
+    assert _replay_mode(db, MatchPredictor()) == "incremental"
+    ratings = MatchPredictor().build_elo_ratings()
+    expected = MatchPredictor(persist=False).build_elo_ratings()
+    assert ratings == pytest.approx(expected)
+
+    updates = MatchPredictor().predict_finished_matches()
+    assert {u[3] for u in updates} == {6, 7}
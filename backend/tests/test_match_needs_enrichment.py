@@ -0,0 +1,55 @@
+"""
+match_needs_enrichment() SQL fonksiyonu ↔ HybridStatsBackfiller._match_needs_enrichment.
+
+Gerçek Postgres ister: TEST_DATABASE_URL tanımlı değilse atlanır. Fonksiyonu
+public şemasında CREATE OR REPLACE eder — atılabilir bir veritabanı verin.
+"""
+import json
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+pytestmark = pytest.mark.skipif(not TEST_DATABASE_URL, reason="TEST_DATABASE_URL tanımlı değil")
+
+# str.isspace() kümesinin tamamı — SQL btrim'i Python strip() ile aynı kırpmalı
+WHITESPACE = [chr(c) for c in range(sys.maxunicode + 1) if chr(c).isspace()]
+
+
+@pytest.fixture
+def cur():
+    import psycopg
+    from etl.adapters.hybrid_stats_adapter import _NEEDS_ENRICHMENT_FN
+
+    with psycopg.connect(TEST_DATABASE_URL, autocommit=True) as conn:
+        with conn.cursor() as cur:
+            cur.execute(_NEEDS_ENRICHMENT_FN)
+            yield cur
+
+
+def _names():
+    rnd = random.Random(16)
+    names = ['\xa0', '\x0bunknown', ' unknown　', 'UNKNOWN', 'Dust2', '​',
+             '', None, 0, 1, True, False, [], {}, {'x': 1}]
+    names += WHITESPACE
+    names += [
+        ''.join(rnd.choice(WHITESPACE + ['a', 'unknown', '']) for _ in range(rnd.randint(0, 4)))
+        for _ in range(500)
+    ]
+    return names
+
+
+def test_sql_matches_python_for_map_names(cur):
+    from etl.adapters.hybrid_stats_adapter import HybridStatsBackfiller
+
+    mismatches = []
+    for name in _names():
+        for raw in ({'games': [{'map': name}]}, {'games': [{'map': {'name': name}}]}):
+            cur.execute("SELECT public.match_needs_enrichment(%s::jsonb)", (json.dumps(raw),))
+            if cur.fetchone()[0] != HybridStatsBackfiller._match_needs_enrichment(raw):
+                mismatches.append(raw)
+    assert mismatches == []
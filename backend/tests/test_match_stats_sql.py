@@ -0,0 +1,171 @@
+"""
+sync_match_stats server-side (SQL) yolu ↔ Python yolu farkı testi.
+
+Rastgele raw_data şekilleri üzerinde iki yolun match_stats /
+player_match_stats'e aynı satırları yazdığını doğrular — players.nickname_norm
+kolonu (sql/entity_name_norm.sql) varken ve yokken.
+
+Gerçek Postgres ister: TEST_DATABASE_URL tanımlı değilse atlanır. Test
+matches / players / *_stats tablolarını tek transaction içinde silip yeniden
+kurar ve sonunda geri alır; yine de atılabilir bir veritabanı verin.
+"""
+import json
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+pytestmark = pytest.mark.skipif(not TEST_DATABASE_URL, reason="TEST_DATABASE_URL tanımlı değil")
+
+NAMES = ['s1mple', 'ZywOo', 'NiKo', 'device', 'Sh1ro', 'ropz']
+N_MATCHES = 60
+
+_NORM_COLUMN = """,
+    nickname_norm text generated always as
+        (regexp_replace(lower(coalesce(nickname, '')), '[^a-z0-9]+', '', 'g')) stored
+"""
+
+
+@pytest.fixture
+def cur(monkeypatch, request):
+    import psycopg
+    from etl import entity_resolver
+
+    monkeypatch.setattr(entity_resolver, "_shared", {})   # önceki şemanın önbelleği kalmasın
+    norm_column = _NORM_COLUMN if request.param else ""
+    with psycopg.connect(TEST_DATABASE_URL) as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                f"""
+                DROP TABLE IF EXISTS matches, players, match_stats, player_match_stats CASCADE;
+                CREATE TABLE players (
+                    id            uuid PRIMARY KEY DEFAULT gen_random_uuid(),
+                    pandascore_id bigint,
+                    nickname      text,
+                    real_name     text{norm_column}
+                );
+                CREATE TABLE matches (
+                    id bigint PRIMARY KEY, status text, team_a_id bigint, team_b_id bigint,
+                    winner_id bigint, scheduled_at timestamptz, raw_data jsonb
+                );
+                CREATE TABLE match_stats (id serial, match_id bigint, team_id bigint, stats jsonb);
+                CREATE UNIQUE INDEX ON match_stats (match_id, team_id)
+                    WHERE match_id IS NOT NULL AND team_id IS NOT NULL;
+                CREATE TABLE player_match_stats (
+                    player_id uuid, match_id bigint, team_id bigint,
+                    kills numeric, deaths numeric, assists numeric, headshots numeric,
+                    hs_percentage numeric, is_win boolean, stats jsonb,
+                    played_at timestamptz, updated_at timestamptz,
+                    UNIQUE (player_id, match_id)
+                );
+                """
+            )
+            for i, name in enumerate(NAMES):
+                cur.execute(
+                    "INSERT INTO players (pandascore_id, nickname) VALUES (%s, %s)",
+                    (100 + i if i % 2 else None, name),
+                )
+            yield cur
+            conn.rollback()
+
+
+def _value(rnd):
+    return rnd.choice([None, 0, 1, 12, 12.7, "7", " 8 ", "x", "", True, False, [], {}, "1e2", "3.5", -2])
+
+
+def _item(rnd):
+    item = {}
+    for key in ['player_id', 'id', 'pandascore_id', 'player_name', 'name', 'nickname', 'kills',
+                'total_kills', 'frags', 'deaths', 'assists', 'headshots', 'hs_pct',
+                'hs_percentage', 'kda', 'win_rate', 'team_id', 'samples']:
+        if rnd.random() < 0.3:
+            if key in ('player_id', 'id', 'pandascore_id'):
+                item[key] = rnd.choice([100, 101, 103, 105, "101", 999, None, 0, 101.0])
+            elif key in ('player_name', 'name', 'nickname'):
+                item[key] = rnd.choice(NAMES + ['S1MPLE', 's-1mple', 'unknown', '', None])
+            elif key == 'team_id':
+                item[key] = rnd.choice([1, 2, "1", None, 3, 1.0])
+            else:
+                item[key] = _value(rnd)
+    if rnd.random() < 0.2:
+        item['player'] = rnd.choice([{'id': 103}, {'name': 'NiKo'}, "x", None])
+    if rnd.random() < 0.2:
+        item['team'] = rnd.choice([{'id': 2}, {}, None, "t"])
+    return item
+
+
+def _raw(rnd):
+    raw = {}
+    if rnd.random() < 0.7:
+        raw['source_enrichment'] = {
+            source: {
+                rnd.choice(['match_history', 'player_metrics']): [_item(rnd) for _ in range(rnd.randint(0, 3))],
+                'match_detail': {'player_metrics': [_item(rnd) for _ in range(rnd.randint(0, 2))]},
+            }
+            for source in rnd.sample(['riot', 'steam', 'hltv'], rnd.randint(0, 2))
+        }
+    if rnd.random() < 0.5:
+        raw['pandascore_player_summaries'] = [_item(rnd) for _ in range(rnd.randint(0, 3))]
+    raw['results'] = [{'team_id': t, 'score': rnd.randint(0, 2)} for t in (1, 2) if rnd.random() < 0.8]
+    raw['games'] = [
+        {
+            'position': j, 'map': {'name': 'Mirage'} if rnd.random() < 0.5 else None,
+            'winner': {'id': 1}, 'length': 100, 'status': 'finished',
+            'teams': [
+                {'team': {'id': t}, 'score': rnd.randint(0, 13),
+                 'players': [{'player': {'id': 100 + t, 'name': 'x'}, 'kills': rnd.randint(0, 30)}]}
+                for t in (1, 2)
+            ],
+        }
+        for j in range(rnd.randint(0, 2))
+    ]
+    return raw
+
+
+def _dump(cur):
+    cur.execute("SELECT match_id, team_id, stats FROM match_stats ORDER BY 1, 2")
+    match_stats = cur.fetchall()
+    cur.execute(
+        """
+        SELECT p.nickname, s.match_id, s.team_id, s.kills::float8, s.deaths::float8,
+               s.assists::float8, s.headshots::float8, round(s.hs_percentage, 6)::float8,
+               s.is_win, s.stats
+        FROM player_match_stats s JOIN players p ON p.id = s.player_id
+        ORDER BY 1, 2
+        """
+    )
+    player_stats = cur.fetchall()
+    cur.execute("TRUNCATE match_stats, player_match_stats")
+    return json.loads(json.dumps([match_stats, player_stats], default=str))
+
+
+@pytest.mark.parametrize("cur", [True, False], ids=["nickname_norm", "no-norm-column"], indirect=True)
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_sql_path_writes_same_rows_as_python(cur, seed):
+    from etl.sync_players import PlayerStatsSyncer
+
+    rnd = random.Random(seed)
+    for i in range(1, N_MATCHES + 1):
+        a, b = rnd.choice([(1, 2), (1, None), (None, None), (2, 1)])
+        cur.execute(
+            "INSERT INTO matches VALUES (%s, 'finished', %s, %s, %s, now(), %s)",
+            (i, a, b, rnd.choice([1, 2, None]), json.dumps(_raw(rnd))),
+        )
+    ids = list(range(1, N_MATCHES + 1))
+    syncer = PlayerStatsSyncer.__new__(PlayerStatsSyncer)   # PandaScore istemcisi gerekmez
+    syncer._has_nickname_norm = None
+
+    syncer._extract_match_stats_python(cur, ids, syncer._load_player_index(cur))
+    python_rows = _dump(cur)
+    syncer._extract_match_stats_sql(cur, ids)
+    sql_rows = _dump(cur)
+
+    assert syncer._has_nickname_norm is (cur.connection.execute(
+        "SELECT count(*) FROM information_schema.columns "
+        "WHERE table_name = 'players' AND column_name = 'nickname_norm'"
+    ).fetchone()[0] == 1)
+    assert sql_rows == python_rows